@@ -0,0 +1,188 @@
+from collections import Counter
+import numpy as np
+
+
+# ------------------------ Columnas ------------------------
+class Column:
+    """
+    Atributo de agente guardado en un arreglo tipado del AgentStore en lugar del __dict__ de la instancia.
+    El agente solo conserva su tabla (_table) y su fila (_row).
+    """
+    def __init__(self, dtype, default=0):
+        self.dtype = np.dtype(dtype)
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def columns(self):
+        """Nombre, tipo y valor inicial de cada arreglo que ocupa el atributo."""
+        return [(self.name, self.dtype, self.default)]
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        return agent._table.columns[self.name].item(agent._row)
+
+    def __set__(self, agent, value):
+        agent._table.columns[self.name][agent._row] = value
+
+
+class OptionalIntColumn(Column):
+    """Entero que también puede ser None (se guarda como -1)."""
+    def __init__(self, dtype=np.int32):
+        super().__init__(dtype, default=-1)
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        value = agent._table.columns[self.name].item(agent._row)
+        return None if value == -1 else value
+
+    def __set__(self, agent, value):
+        agent._table.columns[self.name][agent._row] = -1 if value is None else value
+
+
+class EnumColumn(Column):
+    """
+    Texto de un conjunto pequeño (estados, decisiones, direcciones) guardado como entero internado.
+    Con `counted`, la tabla lleva cuántas filas tienen cada código (AgentTable.counts) y lo actualiza
+    en cada asignación, así contar agentes por valor no recorre la columna.
+    """
+    def __init__(self, counted=False):
+        super().__init__(np.int16, default=0)
+        self.counted = counted
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        return agent._table.store.values[agent._table.columns[self.name].item(agent._row)]
+
+    def __set__(self, agent, value):
+        table = agent._table
+        code = table.store.intern(value)
+        column = table.columns[self.name]
+        if self.counted:
+            counts = table.counts[self.name]
+            counts[column.item(agent._row)] -= 1
+            counts[code] += 1
+        column[agent._row] = code
+
+
+class PositionColumn(Column):
+    """Celda (x, y) o None, guardada en dos arreglos enteros."""
+    def __init__(self):
+        super().__init__(np.int32, default=-1)
+
+    def columns(self):
+        return [(f"{self.name}_x", self.dtype, -1), (f"{self.name}_y", self.dtype, -1)]
+
+    def __get__(self, agent, owner=None):
+        if agent is None:
+            return self
+        columns = agent._table.columns
+        x = columns[f"{self.name}_x"].item(agent._row)
+        return None if x == -1 else (x, columns[f"{self.name}_y"].item(agent._row))
+
+    def __set__(self, agent, value):
+        columns = agent._table.columns
+        x, y = (-1, -1) if value is None else value
+        columns[f"{self.name}_x"][agent._row] = x
+        columns[f"{self.name}_y"][agent._row] = y
+
+
+# ------------------------ Almacén ------------------------
+class AgentTable:
+    """
+    Arreglos de una clase de agente; crecen al doble cuando se llenan. Las filas liberadas con release()
+    vuelven a sus valores iniciales y se reutilizan antes de crecer.
+    """
+    def __init__(self, store, agent_class, capacity=64):
+        self.store = store
+        self.spec = [
+            column
+            for klass in reversed(agent_class.__mro__)
+            for attribute in vars(klass).values() if isinstance(attribute, Column)
+            for column in attribute.columns()
+        ]
+        # Código -> filas con ese código, para las columnas con counted
+        self.counts = {
+            attribute.name: Counter()
+            for klass in agent_class.__mro__
+            for attribute in vars(klass).values() if getattr(attribute, "counted", False)
+        }
+        self.size = 0
+        self.free = []  # Filas liberadas, disponibles para allocate()
+        self.columns = {name: np.full(capacity, default, dtype=dtype) for name, dtype, default in self.spec}
+
+    def allocate(self):
+        if self.free:
+            row = self.free.pop()
+            for counts in self.counts.values():
+                counts[0] += 1
+            return row
+        if self.size == len(next(iter(self.columns.values()), ())):
+            capacity = max(1, 2 * self.size)
+            for name, dtype, default in self.spec:
+                grown = np.full(capacity, default, dtype=dtype)
+                grown[:self.size] = self.columns[name][:self.size]
+                self.columns[name] = grown
+        self.size += 1
+        for counts in self.counts.values():
+            counts[0] += 1  # Toda fila nueva empieza en None
+        return self.size - 1
+
+    def release(self, row):
+        """Devuelve la fila a sus valores iniciales y la deja libre; deja de contar en `counts`."""
+        for name, counts in self.counts.items():
+            counts[self.columns[name].item(row)] -= 1
+        for name, dtype, default in self.spec:
+            self.columns[name][row] = default
+        self.free.append(row)
+
+    def rows(self):
+        """Filas en uso."""
+        return self.size - len(self.free)
+
+    def count(self, name, value):
+        """Filas cuya columna contada `name` vale `value`."""
+        code = self.store.codes.get(value)
+        return 0 if code is None else self.counts[name][code]
+
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
+
+
+class AgentStore:
+    """
+    Almacén compacto de los agentes de un modelo: una AgentTable por clase y un vocabulario
+    compartido que convierte los textos de estado en enteros pequeños.
+    """
+    def __init__(self):
+        self.tables = {}
+        self.values = [None]  # El código 0 es None
+        self.codes = {None: 0}
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def attach(self, agent):
+        """Asigna al agente su tabla y una fila nueva; se llama antes de fijar sus atributos."""
+        agent_class = type(agent)
+        table = self.tables.get(agent_class)
+        if table is None:
+            table = self.tables[agent_class] = AgentTable(self, agent_class)
+        agent._table = table
+        agent._row = table.allocate()
+
+    def detach(self, agent):
+        """Libera la fila de un agente que salió de la simulación; attach() le da una nueva si vuelve."""
+        agent._table.release(agent._row)
+        agent._table = agent._row = None
+
+    def nbytes(self):
+        return sum(table.nbytes() for table in self.tables.values())
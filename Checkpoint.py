@@ -0,0 +1,111 @@
+import os
+import pickle
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+MAGIC = b"IMCKPT1\n"  # Encabezado de los checkpoints de IntersectionModel
+
+
+# ------------------------ Checkpoints ------------------------
+def snapshot(model):
+    """
+    Serializa el estado completo del modelo (cuadrícula, planificador, agentes, AgentStore, semáforo,
+    negociación y estado del generador aleatorio) con pickle. El perfilador se apaga mientras tanto,
+    porque sus envolturas son funciones locales; se vuelve a encender al terminar.
+    """
+    profiling = model.profiler.enabled
+    if profiling:
+        model.profiler.disable()
+    try:
+        return pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        if profiling:
+            model.profiler.enable()
+
+
+def compress(payload, level=1):
+    return MAGIC + zlib.compress(payload, level)
+
+
+def restore(data, seed=None):
+    """
+    Reconstruye un modelo a partir de un checkpoint. Con `seed`, el generador se vuelve a sembrar para
+    que varias variantes que parten del mismo checkpoint diverjan entre sí.
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("El archivo no es un checkpoint de IntersectionModel")
+    model = pickle.loads(zlib.decompress(data[len(MAGIC):]))
+    if seed is not None:
+        model.reset_randomizer(seed)
+    return model
+
+
+def write_atomic(path, data):
+    """Escribe a un archivo temporal y lo renombra, así nunca queda un checkpoint a medias."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def save_checkpoint(model, path, level=1):
+    write_atomic(path, compress(snapshot(model), level))
+
+
+def load_checkpoint(path, seed=None):
+    with open(path, "rb") as file:
+        return restore(file.read(), seed)
+
+
+# ------------------------ Escritura periódica ------------------------
+class CheckpointWriter:
+    """
+    Guarda un checkpoint cada `every` pasos en `pattern` (p. ej. "ckpt_{step:08d}.bin").
+    En el ciclo de pasos solo se serializa el modelo; la compresión y la escritura a disco se hacen en un
+    hilo aparte (zlib y la escritura liberan el GIL), de modo que el ciclo no espera al disco.
+    Con `keep`, solo se conservan los últimos `keep` archivos.
+    """
+    def __init__(self, model, pattern, every, level=1, keep=None):
+        self.model = model
+        self.pattern = pattern
+        self.every = every
+        self.level = level
+        self.keep = keep
+        self.written = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+
+    def after_step(self):
+        """Llamar después de cada model.step()."""
+        step = self.model.schedule.steps
+        if step % self.every == 0:
+            self.write(step)
+
+    def write(self, step=None):
+        step = self.model.schedule.steps if step is None else step
+        payload = snapshot(self.model)
+        self.wait()  # Como mucho una escritura pendiente
+        self._pending = self._executor.submit(self._write, self.pattern.format(step=step), payload)
+
+    def _write(self, path, payload):
+        write_atomic(path, compress(payload, self.level))
+        self.written.append(path)
+        if self.keep is not None:
+            while len(self.written) > self.keep:
+                os.remove(self.written.pop(0))
+
+    def wait(self):
+        """Espera a que termine la escritura pendiente y propaga su error, si lo hubo."""
+        if self._pending is not None:
+            self._pending.result()
+            self._pending = None
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,136 @@
+# ------------------------ Índice de pasajeros ------------------------
+class PassengerIndex:
+    """
+    Índice espacial de los pasajeros que esperan, en cubetas de `bucket` x `bucket` celdas.
+    La distancia es la de Chebyshev, que es la que recorre un microbús (avanza en x y en y a la vez).
+    Un pasajero sale del índice con claim(), que solo tiene éxito una vez: así dos microbuses nunca
+    recogen al mismo pasajero.
+    """
+    def __init__(self, width, height, bucket=8):
+        self.bucket = bucket
+        self.max_ring = max(width, height) // bucket + 1  # Más allá no hay cubetas
+        self.buckets = {}  # (bx, by) -> {pasajero: orden de llegada}
+        self.positions = {}  # pasajero -> celda
+        self.added = 0  # Pasajeros agregados desde el inicio; su orden de llegada desempata las distancias
+        self.claimed = 0
+
+    def add(self, passenger, pos):
+        x, y = pos
+        self.buckets.setdefault((x // self.bucket, y // self.bucket), {})[passenger] = self.added
+        self.positions[passenger] = pos
+        self.added += 1
+
+    def claim(self, passenger):
+        """Saca al pasajero del índice; devuelve False si ya no estaba (otro lo reclamó antes)."""
+        pos = self.positions.pop(passenger, None)
+        if pos is None:
+            return False
+        key = (pos[0] // self.bucket, pos[1] // self.bucket)
+        members = self.buckets[key]
+        del members[passenger]
+        if not members:
+            del self.buckets[key]
+        self.claimed += 1
+        return True
+
+    def __contains__(self, passenger):
+        return passenger in self.positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def nearest(self, pos, k=1, radius=None, skip=()):
+        """
+        Hasta `k` pasajeros más cercanos a `pos` (todos con k=None), a lo sumo a `radius` celdas y sin los
+        de `skip`, como (distancia, orden, pasajero) ordenados. Recorre anillos de cubetas alrededor de `pos`
+        hasta que ninguna cubeta sin revisar pueda tener uno más cercano; cuando quedan pocas cubetas
+        ocupadas, revisa directamente las que faltan.
+        """
+        x, y = pos
+        bucket = self.bucket
+        bx, by = x // bucket, y // bucket
+        found = []
+
+        def collect(members):
+            for passenger, order in members.items():
+                if passenger in skip:
+                    continue
+                px, py = self.positions[passenger]
+                distance = max(abs(px - x), abs(py - y))
+                if radius is None or distance <= radius:
+                    found.append((distance, order, passenger))
+
+        ring = 0
+        while ring <= self.max_ring:
+            if (2 * ring + 1) ** 2 >= len(self.buckets):
+                for (cx, cy), members in self.buckets.items():
+                    if max(abs(cx - bx), abs(cy - by)) >= ring:
+                        collect(members)
+                break
+            for cell in ring_cells(bx, by, ring):
+                members = self.buckets.get(cell)
+                if members:
+                    collect(members)
+            # Las cubetas del anillo siguiente están a más de ring * bucket celdas
+            if radius is not None and radius <= ring * bucket:
+                break
+            if k is not None and len(found) >= k and sorted(found)[k - 1][0] <= ring * bucket:
+                break
+            ring += 1
+        found.sort()
+        return found if k is None else found[:k]
+
+
+def ring_cells(bx, by, ring):
+    """Cubetas a distancia de Chebyshev exactamente `ring` de (bx, by)."""
+    if ring == 0:
+        yield bx, by
+        return
+    for offset in range(-ring, ring + 1):
+        yield bx + offset, by - ring
+        yield bx + offset, by + ring
+    for offset in range(-ring + 1, ring):
+        yield bx - ring, by + offset
+        yield bx + ring, by + offset
+
+
+# ------------------------ Despacho ------------------------
+class PassengerDispatcher:
+    """
+    Asigna pasajeros en espera a los microbuses libres, en un lote por paso. Cada microbús libre propone
+    sus `candidates` pasajeros sin asignar más cercanos; los pares se atienden de menor a mayor distancia,
+    así cada pasajero queda con un solo microbús y cada microbús con un solo pasajero.
+    """
+    def __init__(self, index, candidates=4):
+        self.index = index
+        self.candidates = candidates
+        self.assignments = {}  # microbús -> pasajero asignado
+        self.assigned = {}  # pasajero -> microbús
+        self.dispatched = 0
+
+    def dispatch(self, microbuses):
+        # Liberar las asignaciones de pasajeros que ya se recogieron
+        for microbus, passenger in list(self.assignments.items()):
+            if passenger not in self.index:
+                del self.assignments[microbus]
+                del self.assigned[passenger]
+
+        idle = [microbus for microbus in microbuses if microbus not in self.assignments and microbus.pos is not None]
+        if not idle or len(self.assigned) >= len(self.index):
+            return
+        pairs = []
+        for microbus_order, microbus in enumerate(idle):
+            for distance, order, passenger in self.index.nearest(microbus.pos, self.candidates, skip=self.assigned):
+                pairs.append((distance, microbus_order, order, microbus, passenger))
+        pairs.sort(key=lambda pair: pair[:3])
+        for _, _, _, microbus, passenger in pairs:
+            if microbus in self.assignments or passenger in self.assigned:
+                continue
+            self.assignments[microbus] = passenger
+            self.assigned[passenger] = microbus
+            self.dispatched += 1
+
+    def target(self, microbus):
+        """Pasajero asignado al microbús, si todavía espera."""
+        passenger = self.assignments.get(microbus)
+        return passenger if passenger is not None and passenger in self.index else None
@@ -1,22 +1,32 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
-from mesa.time import SimultaneousActivation
-import random
-from Vehicle import Vehicle
+from mesa import Agent
+import numpy as np
+from AgentStore import Column, EnumColumn, PositionColumn
 
 
 # ------------------------ Agente Ferrari F40 ------------------------
 class FerrariF40(Agent):
     """
     Este es el agente Ferrari F40, un híbrido que busca optimizar su velocidad y recorrido por la ciudad.
+    Sus atributos escalares se guardan en el AgentStore del modelo.
     """
+    __slots__ = ("_table", "_row", "path", "recent_positions")
+    memory = 8  # Celdas recientes que recuerda para saber si está dando vueltas en el mismo lugar
+    calm_after = 8  # Pasos que dura ansioso antes de calmarse
+    state = EnumColumn(counted=True)
+    anxious_steps = Column(np.int16)
+    speed = Column(np.int16)
+    current_target = PositionColumn()
+    decision = EnumColumn()
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
+        model.agent_store.attach(self)
         self.state = "normal"  # Estados: normal, ansioso/enojado
         self.speed = 2  # Más rápido que los vehículos normales
         self.path = []
         self.current_target = None
-        self.visited_positions = set()
+        self.anxious_steps = 0
+        self.recent_positions = ()  # Tupla de a lo sumo `memory` celdas, de la más vieja a la más nueva
         self.decision = None
 
     def step(self):
@@ -24,21 +34,33 @@ class FerrariF40(Agent):
         self.make_decision()
         self.act()
 
+    def advance(self):
+        self.model.settle_move(self)
+
     # Componente Reactivo
     def perceive_environment(self):
-        """Evalúa el entorno inmediato."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighbors((x, y), moore=False, include_center=False)
-
-        # Cambiar de estado si hay bloqueo o espera prolongada
-        if self.state == "normal" and self.is_waiting_too_long():
-            self.state = "ansioso/enojado"
+        """
+        Evalúa el entorno inmediato. Se pone ansioso si hay bloqueo o espera prolongada y se calma tras
+        `calm_after` pasos; ansioso no revisa sus posiciones (su ruta alternativa va y viene entre celdas
+        vecinas), así que al calmarse empieza con la memoria vacía y solo vuelve a ponerse ansioso si se
+        sigue atascando.
+        """
+        if self.state == "normal":
+            if self.is_waiting_too_long():
+                self.state = "ansioso/enojado"
+                self.recent_positions = ()
+                self.anxious_steps = 0
+        else:
+            self.anxious_steps += 1
+            if self.anxious_steps >= self.calm_after:
+                self.state = "normal"
 
     def is_waiting_too_long(self):
-        """Evalúa si el Ferrari ha estado en la misma posición demasiado tiempo."""
-        if self.pos in self.visited_positions:
+        """Evalúa si el Ferrari sigue en su celda o volvió a una de sus últimas `memory` celdas."""
+        recent = self.recent_positions
+        if self.pos in recent:
             return True
-        self.visited_positions.add(self.pos)
+        self.recent_positions = (recent + (self.pos,))[-self.memory:]
         return False
 
     # Componente Deliberativo
@@ -57,19 +79,14 @@ class FerrariF40(Agent):
 
     def plan_route(self):
         """Genera un recorrido que optimiza el tiempo para explorar toda la ciudad."""
-        grid_width, grid_height = self.model.grid.width, self.model.grid.height
-        all_positions = [(x, y) for x in range(grid_width) for y in range(grid_height)]
-        self.path = [pos for pos in all_positions if pos != self.pos]
-        self.current_target = self.path.pop(0)
+        self.path = self.model.router.route(self.pos, None, "explore")
+        self.current_target = self.path.popleft()
 
     def find_alternate_route(self):
         """Intenta buscar una ruta diferente si está bloqueado."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighborhood((x, y), moore=False, include_center=False)
-        for pos in neighbors:
-            if self.model.grid.is_cell_empty(pos):
-                self.current_target = pos
-                break
+        empty_cells = self.model.perception.at(self.pos).empty_cells
+        if empty_cells:
+            self.current_target = empty_cells[0]
 
     # Acciones
     def act(self):
@@ -95,22 +112,22 @@ class FerrariF40(Agent):
         elif y > dest_y:
             y -= self.speed
 
-        self.model.grid.move_agent(self, (x, y))
+        grid = self.model.grid
+        if not grid.torus:
+            # Con la velocidad 2 puede pasarse del borde; sin toroide se queda en él
+            x, y = min(max(x, 0), grid.width - 1), min(max(y, 0), grid.height - 1)
+        # Al llegar al destino pasa al siguiente punto del recorrido
+        self.model.move_agent(self, (x, y), self.next_target if (x, y) == destination else None)
 
-        if (x, y) == destination:
-            self.current_target = self.path.pop(0) if self.path else None
+    def next_target(self):
+        self.current_target = self.path.popleft() if self.path else None
 
     def encounter_other_vehicle(self):
         """Detecta si hay otros vehículos cerca."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighbors((x, y), moore=False, include_center=False)
-        return any(isinstance(neighbor, Vehicle) for neighbor in neighbors)
+        return self.model.perception.at(self.pos).has_vehicle
 
     def yield_to_other_vehicle(self):
         """Cede el paso a otro vehículo."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighbors((x, y), moore=False, include_center=False)
-        for neighbor in neighbors:
-            if isinstance(neighbor, Vehicle):
-                # Espera en su posición actual un paso de tiempo para ceder el paso
-                break
\ No newline at end of file
+        if self.model.perception.at(self.pos).has_vehicle:
+            # Espera en su posición actual un paso de tiempo para ceder el paso
+            pass
\ No newline at end of file
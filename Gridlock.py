@@ -0,0 +1,145 @@
+from collections import deque
+from Movement import occupies
+
+
+# ------------------------ Detector de bloqueos ------------------------
+class GridlockDetector:
+    """
+    Detecta bloqueos mutuos y agentes atascados mientras corre el modelo; se llama observe() después de cada
+    model.step(), como MetricsCollector.collect().
+
+    Progreso: un vehículo avanza cuando llega a una celda que no está entre sus últimas `window` celdas.
+    Cada vehículo lleva un contador de pasos sin avanzar, que deja de crecer al llegar a `patience`;
+    con ese valor el vehículo está atascado. Así también se detecta al que se mueve en círculos pequeños
+    (un Ferrari que oscila entre dos celdas, un microbús que cambia de carril de ida y vuelta).
+
+    Grafo de espera: con movimiento en dos fases, cada vehículo que MoveResolver no pudo mover espera a los
+    que ocupan o ganaron su celda destino. El grafo se actualiza solo en las aristas que cambiaron, y un ciclo
+    se busca solo a partir de los vehículos con aristas nuevas; un ciclo se descarta cuando alguno de sus
+    vehículos deja de esperar. Con movimiento inmediato nadie espera a nadie y el grafo queda vacío.
+
+    El modelo está bloqueado cuando todos sus vehículos están atascados; con `stop`, observe() pone
+    model.running en False en cuanto lo detecta. La memoria es O(vehículos * window).
+    """
+    def __init__(self, model, patience=20, window=4, stop=False):
+        self.model = model
+        self.patience = patience
+        self.window = window
+        self.stop = stop
+        self.recent = {}  # vehículo -> últimas `window` celdas
+        self.stalls = {}  # vehículo -> pasos sin avanzar (a lo sumo `patience`)
+        self.waits_for = {}  # vehículo bloqueado -> vehículos a los que espera
+        self.cycles = {}  # frozenset de vehículos -> ciclo, en orden de espera
+        self.starved = set()
+        self.locked = False
+        self.locked_at = None  # Primer paso en que el modelo quedó bloqueado
+
+        # Métricas acumuladas
+        self.cycles_found = 0  # Ciclos nuevos
+        self.max_starved = 0
+
+    def observe(self):
+        """Actualiza contadores y grafo con el paso recién dado; devuelve el reporte del paso."""
+        model = self.model
+        model.sync_agents()
+        self.update_stalls()
+        resolver = model.move_resolver
+        self.update_waits(resolver.blocked if resolver is not None else {})
+
+        tracked = len(self.stalls)
+        self.max_starved = max(self.max_starved, len(self.starved))
+        self.locked = tracked > 0 and len(self.starved) == tracked
+        if self.locked and self.locked_at is None:
+            self.locked_at = model.schedule.steps
+        if self.locked and self.stop:
+            model.running = False
+        return self.report()
+
+    def update_stalls(self):
+        recent, stalls, starved = self.recent, self.stalls, self.starved
+        patience = self.patience
+        seen = set()
+        for agent in self.model.schedule.agents:
+            pos = agent.pos
+            if pos is None or not occupies(agent):
+                continue
+            seen.add(agent)
+            cells = recent.get(agent)
+            if cells is None:
+                recent[agent] = deque((pos,), maxlen=self.window)
+                stalls[agent] = 0
+            elif pos in cells:
+                if stalls[agent] < patience:
+                    stalls[agent] += 1
+                    if stalls[agent] == patience:
+                        starved.add(agent)
+            else:
+                cells.append(pos)
+                stalls[agent] = 0
+                starved.discard(agent)
+        # Los vehículos que salieron de la cuadrícula dejan de contarse
+        if len(seen) != len(stalls):
+            for agent in [agent for agent in stalls if agent not in seen]:
+                del recent[agent], stalls[agent]
+                starved.discard(agent)
+
+    def update_waits(self, blocked):
+        waits_for = self.waits_for
+        changed = [agent for agent, blockers in blocked.items() if waits_for.get(agent) != blockers]
+        released = [agent for agent in waits_for if agent not in blocked]
+        if not changed and not released:
+            return
+        for agent in released:
+            del waits_for[agent]
+        for agent in changed:
+            waits_for[agent] = blocked[agent]
+
+        # Un ciclo sigue vigente mientras ninguno de sus vehículos cambie de espera
+        touched = set(changed).union(released)
+        previous = set(self.cycles)
+        for members in [members for members in self.cycles if not members.isdisjoint(touched)]:
+            del self.cycles[members]
+        for agent in changed:
+            cycle = self.find_cycle(agent)
+            if cycle is not None and frozenset(cycle) not in self.cycles:
+                self.cycles[frozenset(cycle)] = cycle
+                # Un ciclo que se rehace con los mismos vehículos no cuenta como nuevo
+                if frozenset(cycle) not in previous:
+                    self.cycles_found += 1
+
+    def find_cycle(self, start):
+        """Ciclo más corto del grafo de espera que pasa por `start`, o None."""
+        waits_for = self.waits_for
+        parents = {start: None}
+        frontier = [start]
+        while frontier:
+            following = []
+            for agent in frontier:
+                for blocker in waits_for.get(agent, ()):
+                    if blocker is start:
+                        cycle = [agent]
+                        while parents[cycle[-1]] is not None:
+                            cycle.append(parents[cycle[-1]])
+                        return cycle[::-1]
+                    if blocker not in parents:
+                        parents[blocker] = agent
+                        following.append(blocker)
+            frontier = following
+        return None
+
+    def report(self):
+        return {
+            "tick": self.model.schedule.steps,
+            "cycles": [[agent.unique_id for agent in cycle] for cycle in self.cycles.values()],
+            "starved": sorted((agent.unique_id for agent in self.starved), key=str),
+            "waiting": len(self.waits_for),
+            "locked": self.locked,
+        }
+
+    def summary(self):
+        return {
+            "cycles_found": self.cycles_found,
+            "max_starved": self.max_starved,
+            "locked": self.locked,
+            "locked_at": self.locked_at,
+        }
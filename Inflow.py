@@ -0,0 +1,106 @@
+from collections import Counter
+from Vehicle import Vehicle
+
+# Accesos a la intersección, en el orden en que se generan las llegadas de un paso
+APPROACHES = ("north", "south", "east", "west")
+# Direcciones de salida que sabe seguir Vehicle.direccion
+EXIT_DIRECTIONS = ("north", "east", "west")
+
+
+def approach_cell(approach, width, height):
+    """Celda del borde por la que entra un vehículo del acceso `approach`, alineada con el semáforo."""
+    if approach == "north":
+        return width // 2, 0
+    if approach == "south":
+        return width // 2, height - 1
+    if approach == "east":
+        return width - 1, height // 2
+    return 0, height // 2
+
+
+# ------------------------ Llegadas ------------------------
+class PoissonInflow:
+    """
+    Llegadas de Poisson independientes por acceso: `rates` da los vehículos por paso de cada acceso
+    (p. ej. {"north": 0.3, "west": 0.1}). Los tiempos entre llegadas son exponenciales y salen de
+    model.random, así que la corrida sigue siendo reproducible con la semilla del modelo.
+    """
+    def __init__(self, rates, destinations=EXIT_DIRECTIONS):
+        self.rates = {approach: rate for approach, rate in rates.items() if rate > 0}
+        self.destinations = tuple(destinations)
+        self.next_arrival = {}  # acceso -> instante de su próxima llegada
+
+    def arrivals(self, model):
+        """(acceso, destino) de los vehículos que entran en el paso actual."""
+        tick = model.schedule.steps
+        arrivals = []
+        for approach in APPROACHES:
+            rate = self.rates.get(approach)
+            if rate is None:
+                continue
+            time = self.next_arrival.get(approach)
+            if time is None:
+                time = tick + model.random.expovariate(rate)
+            while time < tick + 1:
+                arrivals.append((approach, model.random.choice(self.destinations)))
+                time += model.random.expovariate(rate)
+            self.next_arrival[approach] = time
+        return arrivals
+
+
+class TimetableInflow:
+    """
+    Llegadas a pasos fijos: `timetable` da, por acceso, la lista de pasos en que entra un vehículo
+    (un paso repetido son varios vehículos). Con `period`, el horario se repite cada `period` pasos.
+    """
+    def __init__(self, timetable, period=None, destinations=EXIT_DIRECTIONS):
+        self.timetable = {approach: Counter(ticks) for approach, ticks in timetable.items()}
+        self.period = period
+        self.destinations = tuple(destinations)
+
+    def arrivals(self, model):
+        tick = model.schedule.steps
+        if self.period:
+            tick %= self.period
+        arrivals = []
+        for approach in APPROACHES:
+            for _ in range(self.timetable.get(approach, {}).get(tick, 0)):
+                arrivals.append((approach, model.random.choice(self.destinations)))
+        return arrivals
+
+
+# ------------------------ Reserva de vehículos ------------------------
+class VehiclePool:
+    """
+    Reserva de Vehicle retirados para reutilizarlos en lugar de crear objetos nuevos.
+    Un vehículo en la reserva devuelve su fila del AgentStore y toma una libre al volver, así que ni los
+    objetos ni los arreglos crecen una vez que cubren el máximo de vehículos simultáneos, y los retirados
+    no cuentan en los conteos por estado.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, unique_id, destination, state="neutral"):
+        if self.free:
+            vehicle = self.free.pop()
+            vehicle.unique_id = unique_id
+            self.model.register_agent(vehicle)
+            self.model.agent_store.attach(vehicle)
+            vehicle.reset(destination, state)
+            self.reused += 1
+        else:
+            vehicle = Vehicle(unique_id, self.model, destination, state)
+            self.created += 1
+        return vehicle
+
+    def release(self, vehicle):
+        """Guarda un vehículo que ya salió de la cuadrícula y del planificador."""
+        vehicle.remove()  # Lo saca del registro de agentes del modelo mientras está en la reserva
+        self.model.agent_store.detach(vehicle)
+        self.free.append(vehicle)
+
+    def __len__(self):
+        return len(self.free)
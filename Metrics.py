@@ -0,0 +1,226 @@
+import math
+import numpy as np
+from Ferrari import FerrariF40
+from Microbus import Microbus
+from Toyota import ToyotaTrueno
+
+# Estados que se cuentan por clase de agente; se leen de los conteos de la columna `state` del AgentStore
+STATE_METRICS = {
+    FerrariF40: ("normal", "ansioso/enojado"),
+    ToyotaTrueno: ("feliz", "enojado"),
+    Microbus: Microbus.possible_states,
+}
+
+
+# ------------------------ Agregados en línea ------------------------
+class RingBuffer:
+    """Últimos `capacity` valores de una métrica en un arreglo preasignado; agregar es O(1)."""
+    def __init__(self, capacity, dtype=np.float64):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.count = 0  # Valores agregados desde el inicio
+
+    def append(self, value):
+        self.data[self.count % len(self.data)] = value
+        self.count += 1
+
+    def values(self):
+        """Valores guardados, del más antiguo al más reciente."""
+        if self.count <= len(self.data):
+            return self.data[:self.count].copy()
+        start = self.count % len(self.data)
+        return np.concatenate((self.data[start:], self.data[:start]))
+
+    def __len__(self):
+        return min(self.count, len(self.data))
+
+
+class RunningStats:
+    """Media y varianza con el método de Welford, más mínimo y máximo."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class P2Quantile:
+    """
+    Estimación de un cuantil con el algoritmo P² (Jain y Chlamtac, 1985): cinco marcadores que se
+    ajustan con cada observación, sin guardar la muestra. Memoria y tiempo por observación constantes.
+    """
+    def __init__(self, quantile):
+        self.quantile = quantile
+        self.heights = []  # Alturas de los marcadores (las primeras cinco observaciones, ordenadas)
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self.increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def update(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustar los marcadores intermedios que se alejaron de su posición deseada
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+               (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            # Con pocas observaciones, el cuantil exacto de la muestra
+            return self.heights[min(len(self.heights) - 1, int(self.quantile * len(self.heights)))]
+        return self.heights[2]
+
+
+class MetricSeries:
+    """Historia reciente, media/varianza y cuantiles aproximados de una métrica."""
+    def __init__(self, capacity, quantiles):
+        self.history = RingBuffer(capacity)
+        self.stats = RunningStats()
+        self.sketches = {quantile: P2Quantile(quantile) for quantile in quantiles}
+        self.last = None
+
+    def update(self, value):
+        self.last = value
+        self.history.append(value)
+        self.stats.update(value)
+        for sketch in self.sketches.values():
+            sketch.update(value)
+
+    def summary(self):
+        stats = self.stats
+        return {
+            "count": stats.count,
+            "last": self.last,
+            "mean": stats.mean,
+            "std": math.sqrt(stats.variance),
+            "min": stats.min if stats.count else None,
+            "max": stats.max if stats.count else None,
+            **{f"p{quantile * 100:g}": sketch.value() for quantile, sketch in self.sketches.items()},
+        }
+
+
+# ------------------------ Recolector ------------------------
+class MetricsCollector:
+    """
+    Métricas de una corrida mientras avanza: cola y saturación del semáforo, vehículos atendidos y su
+    espera, vehículos que salen, pasajeros recogidos y en espera, y agentes por estado. Cada `every` pasos se
+    toma una muestra; de cada métrica se guardan las últimas `capacity` muestras y agregados en línea
+    (media, varianza, cuantiles P²), así que el costo por muestra no crece con la duración de la corrida.
+
+    Una muestra es O(1): los agentes por estado se leen de los conteos que el AgentStore actualiza cuando
+    un agente cambia de estado, y los pasajeros a bordo son los que salieron del índice de pasajeros (nadie
+    baja de un microbús). Con el motor vectorizado no hace falta sincronizar los agentes.
+    """
+    def __init__(self, model, capacity=1024, quantiles=(0.5, 0.9, 0.99), every=1):
+        self.model = model
+        self.capacity = capacity
+        self.quantiles = tuple(quantiles)
+        self.every = every
+        self.ticks = RingBuffer(capacity, np.int64)
+        self.series = {}
+        light = model.traffic_light
+        self._last = {"exited": model.exited, "served": light.served, "total_wait": light.total_wait}
+
+    def sample(self):
+        """Valores de las métricas en el paso actual; los de flujo cuentan desde la muestra anterior."""
+        model = self.model
+        light = model.traffic_light
+        last = self._last
+        served = light.served - last["served"]
+        sample = {
+            "queue_length": light.queue_length,
+            "saturated": int(light.saturated),
+            "exits": model.exited - last["exited"],
+            "served": served,
+        }
+        if served:
+            # La espera solo tiene valor en las muestras en que el semáforo atendió a alguien
+            sample["wait"] = (light.total_wait - last["total_wait"]) / served
+        last.update(exited=model.exited, served=light.served, total_wait=light.total_wait)
+
+        sample["passengers"] = model.passenger_index.claimed
+        sample["waiting_passengers"] = len(model.passenger_index)
+        tables = model.agent_store.tables
+        for agent_class, states in STATE_METRICS.items():
+            table = tables.get(agent_class)
+            for state in states:
+                sample[f"{agent_class.__name__}.{state}"] = table.count("state", state) if table else 0
+        return sample
+
+    def collect(self):
+        """Llamar después de cada model.step(); devuelve la muestra tomada, o None si no tocaba."""
+        tick = self.model.schedule.steps
+        if tick % self.every:
+            return None
+        sample = self.sample()
+        self.ticks.append(tick)
+        for name, value in sample.items():
+            series = self.series.get(name)
+            if series is None:
+                series = self.series[name] = MetricSeries(self.capacity, self.quantiles)
+            series.update(value)
+        return {"tick": tick, **sample}
+
+    def stream(self, steps=None):
+        """Avanza el modelo y produce cada muestra en cuanto se toma; sin `steps`, no termina."""
+        taken = 0
+        while steps is None or taken < steps:
+            self.model.step()
+            taken += 1
+            sample = self.collect()
+            if sample is not None:
+                yield sample
+
+    def history(self, name):
+        """Últimas muestras de una métrica, de la más antigua a la más reciente."""
+        return self.series[name].history.values()
+
+    def summary(self):
+        return {name: series.summary() for name, series in self.series.items()}
@@ -1,7 +1,6 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
-from mesa.time import SimultaneousActivation
-import random
+from mesa import Agent
+import numpy as np
+from AgentStore import Column, EnumColumn, PositionColumn
 
 
 #  ------------------------ Agente Microbús ------------------------
@@ -9,9 +8,21 @@ class Microbus(Agent):
     """
     Este es el agente de microbús, un híbrido entre reactivo y deliberativo.
     Optimiza la recogida de pasajeros, utiliza estrategias deliberativas y cambia de carril rápidamente según el tráfico.
+    Sus atributos escalares se guardan en el AgentStore del modelo.
     """
+    __slots__ = ("_table", "_row", "route", "pickup_points")
+    pickup_radius = 1  # Celdas (distancia de Chebyshev) a las que alcanza a recoger pasajeros
+    possible_states = ("normal", "happy", "angry")
+    state = EnumColumn(counted=True)
+    passengers = Column(np.int32)
+    speed = Column(np.int16)
+    destination = PositionColumn()
+    at_pickup = Column(bool)
+    decision = EnumColumn()
+
     def __init__(self, unique_id, model, state="normal"):
         super().__init__(unique_id, model)
+        model.agent_store.attach(self)
         self.state = state
         self.passengers = 0
         self.speed = 1
@@ -19,7 +30,6 @@ class Microbus(Agent):
         self.route = []
         self.pickup_points = []
         self.at_pickup = False
-        self.possible_states = ["normal", "happy", "angry"]
         self.decision = None
 
     def step(self):
@@ -27,17 +37,18 @@ class Microbus(Agent):
         self.make_decision()
         self.act()
 
+    def advance(self):
+        self.model.settle_move(self)
+
     # Componente Reactivo
     def perceive_environment(self):
         """Detecta pasajeros o evalúa posibles bloqueos para cambiar de carril."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighbors((x, y), moore=False, include_center=False)
-
-        # Evalúa si hay pasajeros en la vía
-        for neighbor in neighbors:
-            if isinstance(neighbor, Passenger):
-                self.at_pickup = True
-                self.pickup_points.append(neighbor)
+        # Pasajeros al alcance según el índice del modelo; la lista se rehace en cada paso
+        self.pickup_points = [
+            passenger for _, _, passenger in
+            self.model.passenger_index.nearest(self.pos, k=None, radius=self.pickup_radius)
+        ]
+        self.at_pickup = bool(self.pickup_points)
 
         # Cambia de carril si hay bloqueo
         if self.state == "angry":
@@ -69,14 +80,26 @@ class Microbus(Agent):
 
     # Acciones
     def act(self):
-        """Efectúa movimientos y recoge pasajeros."""
+        """Efectúa movimientos y recoge pasajeros; el pasajero asignado por el despachador va antes que la ruta."""
         if self.at_pickup:
             self.pick_up_passenger()
+        elif (passenger := self.model.dispatcher.target(self)) is not None:
+            self.drive_to(passenger.pos)
         elif self.destination:
             self.move_towards(self.destination)
 
     def move_towards(self, destination):
         """Se mueve hacia un destino objetivo."""
+        self.drive_to(destination, self.next_stop)
+
+    def next_stop(self):
+        if self.route:
+            self.destination = self.route.pop(0)
+        else:
+            self.destination = None
+
+    def drive_to(self, destination, on_arrival=None):
+        """Avanza un paso hacia `destination`; si llega a él, después llama a `on_arrival`."""
         x, y = self.pos
         dest_x, dest_y = destination
 
@@ -90,30 +113,22 @@ class Microbus(Agent):
         elif y > dest_y:
             y -= self.speed
 
-        self.model.grid.move_agent(self, (x, y))
-
-        if (x, y) == destination:
-            if self.route:
-                self.destination = self.route.pop(0)
-            else:
-                self.destination = None
+        self.model.move_agent(self, (x, y), on_arrival if (x, y) == destination else None)
 
     def pick_up_passenger(self):
         """Recoge pasajeros si están presentes."""
-        for passenger in self.pickup_points:
-            self.model.grid.remove_agent(passenger)
-            self.passengers += 1
+        self.model.pick_up(self, self.pickup_points, self.board)
         self.pickup_points = []
         self.at_pickup = False
 
+    def board(self, passenger):
+        self.passengers += 1
+
     def change_lane(self):
         """Intenta cambiar de carril para avanzar."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighborhood((x, y), moore=False, include_center=False)
-        for pos in neighbors:
-            if self.model.grid.is_cell_empty(pos):
-                self.model.grid.move_agent(self, pos)
-                break
+        empty_cells = self.model.perception.at(self.pos).empty_cells
+        if empty_cells:
+            self.model.move_agent(self, empty_cells[0])
 
 
 # ------------------------ Agente Pasajero ------------------------
@@ -0,0 +1,164 @@
+def occupies(agent):
+    """Los agentes que negocian (los vehículos) ocupan su celda; el semáforo y los pasajeros no."""
+    return hasattr(agent, "decision")
+
+
+# ------------------------ Movimiento en dos fases ------------------------
+class MoveResolver:
+    """
+    Movimiento en dos fases de IntersectionModel (movement="two-phase"). Durante step() los agentes solo
+    declaran la celda a la que quieren ir; en la fase advance, el primer agente que avanza dispara resolve(),
+    que decide en un lote todas las celdas disputadas y mueve de una vez a los que pueden moverse. Después,
+    cada agente completa su movimiento en su propio advance(). El resultado no depende del orden de activación.
+
+    Una celda admite un solo vehículo que entra: si varios la quieren, la disputa se decide con
+    NegotiationManager.contest. Además, el que entra espera a que salgan los vehículos que ya están en la
+    celda; si alguno se queda, o si los agentes se esperan en ciclo (p. ej. dos que quieren intercambiar
+    celdas), ninguno de ellos se mueve. Los que no se movieron quedan en `blocked` con los agentes que esperan.
+
+    Las recogidas de pasajeros también son intenciones: un pasajero que varios microbuses quieren subir es
+    para el más cercano (a igual distancia, el de menor unique_id), y sube en el advance() del ganador.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.intents = {}  # agente -> (celda, función a llamar cuando llegue)
+        self.arrivals = {}  # agente que se movió -> función a llamar en su advance()
+        self.pickups = {}  # microbús -> (pasajeros que quiere subir, función a llamar por cada uno que sube)
+        self.boardings = {}  # microbús -> pasajeros que ganó en este paso
+        self.blocked = {}  # agente que no se movió en el último paso -> agentes a los que espera
+        self.resolved = False
+
+        # Métricas acumuladas
+        self.moves = 0
+        self.contested = 0  # Celdas disputadas
+        self.stalls = 0  # Movimientos que no se hicieron
+        self.pickup_contests = 0  # Pasajeros disputados
+
+    def propose(self, agent, pos, on_arrival=None):
+        """Intención de mover `agent` a `pos` en este paso; si el agente ya tenía una, la reemplaza."""
+        self.intents[agent] = (pos, on_arrival)
+
+    def propose_pickup(self, microbus, passengers, on_board):
+        """Intención de `microbus` de subir a `passengers` en este paso."""
+        if passengers:
+            self.pickups[microbus] = (list(passengers), on_board)
+
+    def settle(self, agent):
+        """advance() de un agente: resuelve el paso si nadie lo ha hecho y completa el movimiento del agente."""
+        if not self.resolved:
+            self.resolve()
+        on_arrival = self.arrivals.pop(agent, None)
+        if on_arrival is not None:
+            on_arrival()
+        passengers = self.boardings.pop(agent, None)
+        if passengers:
+            on_board = self.pickups[agent][1]
+            for passenger in passengers:
+                if self.model.board(passenger):
+                    on_board(passenger)
+
+    def resolve(self):
+        self.resolved = True
+        self.resolve_pickups()
+        grid = self.model.grid
+        entrants = {}  # celda -> agentes que quieren entrar
+        staying = []  # Los que se "mueven" a su misma celda: siempre pueden
+        for agent, (pos, on_arrival) in self.intents.items():
+            if agent.pos is None:
+                continue
+            pos = grid.torus_adj(pos)
+            if pos == agent.pos:
+                staying.append((agent, on_arrival))
+            else:
+                entrants.setdefault(pos, []).append(agent)
+
+        # Disputas: un solo ganador por celda, en un orden fijo de celdas y de agentes
+        winners = {}  # ganador -> celda
+        blocked = {}
+        for pos in sorted(entrants):
+            agents = sorted(entrants[pos], key=lambda agent: str(agent.unique_id))
+            if len(agents) > 1:
+                self.contested += 1
+                winner = self.model.negotiation_manager.contest(agents, self.model.random)
+                for agent in agents:
+                    if agent is not winner:
+                        blocked[agent] = (winner,)
+            else:
+                winner = agents[0]
+            winners[winner] = pos
+
+        # Cada ganador espera a los vehículos de su celda destino; se mueve cuando todos ellos se movieron
+        pending = {}  # ganador -> vehículos que todavía no salen de su celda destino
+        waiters = {}  # vehículo -> ganadores que esperan a que salga
+        ready = []
+        for agent, pos in winners.items():
+            occupants = [other for other in grid.contents_at(pos) if occupies(other)]
+            if occupants:
+                pending[agent] = len(occupants)
+                for other in occupants:
+                    waiters.setdefault(other, []).append(agent)
+            else:
+                ready.append(agent)
+        moving = set()
+        while ready:
+            agent = ready.pop()
+            moving.add(agent)
+            for waiter in waiters.get(agent, ()):
+                pending[waiter] -= 1
+                if not pending[waiter]:
+                    ready.append(waiter)
+        for agent in pending:
+            if agent not in moving:
+                blocked[agent] = tuple(other for other in grid.contents_at(winners[agent])
+                                       if occupies(other) and other not in moving)
+
+        # Confirmar todos los movimientos a la vez
+        intents = self.intents
+        for agent in sorted(moving, key=lambda agent: str(agent.unique_id)):
+            grid.move_agent(agent, winners[agent])
+            if intents[agent][1] is not None:
+                self.arrivals[agent] = intents[agent][1]
+        for agent, on_arrival in staying:
+            if on_arrival is not None:
+                self.arrivals[agent] = on_arrival
+        self.blocked = blocked
+        self.moves += len(moving) + len(staying)
+        self.stalls += len(blocked)
+
+    def resolve_pickups(self):
+        """Asigna cada pasajero pedido a un solo microbús, con las posiciones de antes de mover a nadie."""
+        claims = {}  # pasajero -> microbuses que lo quieren
+        for microbus, (passengers, _) in self.pickups.items():
+            for passenger in passengers:
+                claims.setdefault(passenger, []).append(microbus)
+
+        def distance(microbus, passenger):  # Chebyshev, como PassengerIndex
+            return max(abs(microbus.pos[0] - passenger.pos[0]), abs(microbus.pos[1] - passenger.pos[1]))
+
+        won = set()
+        for passenger, microbuses in claims.items():
+            if passenger.pos is None or passenger not in self.model.passenger_index:
+                continue
+            if len(microbuses) > 1:
+                self.pickup_contests += 1
+            won.add((passenger, min(microbuses, key=lambda microbus: (distance(microbus, passenger),
+                                                                    str(microbus.unique_id)))))
+        # Cada microbús sube a sus pasajeros en el orden en que los pidió
+        for microbus, (passengers, _) in self.pickups.items():
+            mine = [passenger for passenger in passengers if (passenger, microbus) in won]
+            if mine:
+                self.boardings[microbus] = mine
+
+    def clear(self):
+        """Descarta las intenciones del paso; el modelo lo llama al terminar cada paso."""
+        if not self.resolved:
+            self.blocked = {}  # Nadie avanzó en este paso: no hubo movimientos bloqueados
+        self.intents.clear()
+        self.arrivals.clear()
+        self.pickups.clear()
+        self.boardings.clear()
+        self.resolved = False
+
+    def summary(self):
+        return {"moves": self.moves, "contested": self.contested, "stalls": self.stalls,
+                "pickup_contests": self.pickup_contests}
@@ -1,7 +1,17 @@
+import numpy as np
+from itertools import combinations
+
+# Códigos de decisión; el 0 (None) es un agente que todavía no decide o que no negocia (semáforo)
+DECISIONS = [None, "cede", "compite"]
+DECISION_CODES = {decision: code for code, decision in enumerate(DECISIONS)}
+
+
 # ------------------------ Nuestra negociacion ----------------
 class NegotiationManager:
     """
     Maneja la negociación entre agentes utilizando teoría de juegos.
+    Una vez por paso resuelve en lote todos los pares en conflicto con las decisiones que los agentes
+    ya tomaron, sin volver a llamar a make_decision, y acumula las recompensas por agente y por tipo.
     """
     def __init__(self):
         self.reward_matrix = {
@@ -10,14 +20,58 @@ class NegotiationManager:
             ("compite", "cede"): (1, 3),
             ("compite", "compite"): (0, 0),
         }
+        # Tabla precalculada: payoffs[código a, código b] = (recompensa a, recompensa b); los pares con None valen 0
+        self.payoffs = np.zeros((len(DECISIONS), len(DECISIONS), 2))
+        for (decision_a, decision_b), rewards in self.reward_matrix.items():
+            self.payoffs[DECISION_CODES[decision_a], DECISION_CODES[decision_b]] = rewards
 
-    def negotiate(self, agent_a, agent_b):
-        decision_a = agent_a.make_decision()  # O lo que corresponda
-        decision_b = agent_b.make_decision()  # O lo que corresponda
+        # Métricas acumuladas
+        self.pairs = 0  # Pares en conflicto
+        self.resolved = 0  # Pares en los que ambos agentes ya tenían decisión
+        self.agent_payoffs = {}  # unique_id -> recompensa acumulada
+        self.type_payoffs = {}  # clase de agente -> recompensa acumulada
 
-        # Verifica que las decisiones no sean None
-        if decision_a is None or decision_b is None:
+    def negotiate(self, pairs):
+        """Resuelve los pares (agente_a, agente_b) de un paso con una sola consulta a la tabla de recompensas."""
+        if not pairs:
             return
+        agents_a, agents_b = zip(*pairs)
+        codes_a = np.array([DECISION_CODES.get(getattr(agent, "decision", None), 0) for agent in agents_a])
+        codes_b = np.array([DECISION_CODES.get(getattr(agent, "decision", None), 0) for agent in agents_b])
+        rewards = self.payoffs[codes_a, codes_b]
+        decided = np.flatnonzero((codes_a > 0) & (codes_b > 0))
+
+        self.pairs += len(pairs)
+        self.resolved += len(decided)
+        self.record([agents_a[i] for i in decided] + [agents_b[i] for i in decided],
+                    np.concatenate([rewards[decided, 0], rewards[decided, 1]]).tolist())
+
+    def contest(self, agents, rng):
+        """
+        Decide quién entra a una celda que varios agentes quieren ocupar en el mismo paso: el que compite le
+        gana al que cede o todavía no decide, y entre iguales decide `rng`. Las recompensas de todos los
+        pares de la disputa se registran como en negotiate().
+        """
+        self.negotiate(list(combinations(agents, 2)))
+        competing = [agent for agent in agents if getattr(agent, "decision", None) == "compite"]
+        return rng.choice(competing or agents)
+
+    def record(self, agents, rewards):
+        """Suma las recompensas de un lote a los totales por agente y por tipo."""
+        agent_payoffs, type_payoffs = self.agent_payoffs, self.type_payoffs
+        for agent, reward in zip(agents, rewards):
+            agent_payoffs[agent.unique_id] = agent_payoffs.get(agent.unique_id, 0.0) + reward
+            name = type(agent).__name__
+            type_payoffs[name] = type_payoffs.get(name, 0.0) + reward
+
+    def is_symmetric(self):
+        """True si la recompensa de un agente solo depende de su decisión y la del otro, no del orden del par."""
+        return np.array_equal(self.payoffs[..., 0], self.payoffs[..., 1].T)
 
-        # Ahora accede a la matriz de recompensas
-        rewards = self.reward_matrix.get((decision_a, decision_b), (0, 0))  # valor por defecto
\ No newline at end of file
+    def summary(self):
+        return {
+            "pairs": self.pairs,
+            "resolved": self.resolved,
+            "payoffs_by_type": dict(sorted(self.type_payoffs.items())),
+            "mean_payoff": sum(self.agent_payoffs.values()) / len(self.agent_payoffs) if self.agent_payoffs else 0.0,
+        }
\ No newline at end of file
@@ -0,0 +1,196 @@
+import hashlib
+import random
+from multiprocessing import Pipe, Process
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+# Vecino al que pasa un vehículo según su dirección de salida: (desplazamiento en filas, en columnas)
+HANDOFF_OFFSETS = {"north": (-1, 0), "east": (0, 1), "west": (0, -1)}
+
+
+def entry_cell(destination, exit_pos, width, height):
+    """Celda por la que entra al mosaico vecino un vehículo que salió por `exit_pos` hacia `destination`."""
+    x, y = exit_pos
+    if destination == "north":
+        return x, height - 1
+    if destination == "east":
+        return 0, y
+    return width - 1, y
+
+
+# ------------------------ Fragmento de la red ------------------------
+class Shard:
+    """
+    Grupo de mosaicos contiguos de la red, cada uno un IntersectionModel con su propio semáforo.
+    Vive en el proceso principal (corrida en serie) o en un proceso de trabajo.
+    """
+    def __init__(self, tiles, width, height, agents, scheduler="simultaneous"):
+        self.width = width
+        self.height = height
+        self.models = {
+            index: IntersectionModel(width, height, *agents, seed=seed, scheduler=scheduler, id_prefix=f"t{index}_")
+            for index, seed in tiles
+        }
+
+    def step(self, arrivals):
+        """
+        Coloca los vehículos que llegan de otros mosaicos, avanza cada mosaico un paso y devuelve las
+        salidas como (mosaico, id, destino, estado, posición de salida), en orden de mosaico y de salida.
+        """
+        departures = []
+        for index, model in self.models.items():
+            for unique_id, pos, destination, state in arrivals.get(index, ()):
+                # Los vehículos que salieron del mosaico quedaron en su reserva: se reutilizan
+                model.add_vehicle(unique_id, destination, pos, state)
+            model.step()
+            departures.extend((index, *departure) for departure in model.departures)
+        return departures
+
+    def digests(self):
+        return {index: state_digest(model) for index, model in self.models.items()}
+
+    def agent_count(self):
+        return sum(model.schedule.get_agent_count() for model in self.models.values())
+
+
+def _shard_worker(connection, *shard_args):
+    """Bucle de un proceso de trabajo: atiende ("step", llegadas), ("digests",) y ("agents",) hasta recibir None."""
+    shard = Shard(*shard_args)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        command, *args = message
+        connection.send(getattr(shard, command)(*args))
+    connection.close()
+
+
+class RemoteShard:
+    """Fragmento en otro proceso; send() y receive() separados permiten avanzar todos los fragmentos a la vez."""
+    def __init__(self, *shard_args):
+        self.connection, child = Pipe()
+        self.process = Process(target=_shard_worker, args=(child, *shard_args), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, command, *args):
+        self.connection.send((command, *args))
+
+    def receive(self):
+        return self.connection.recv()
+
+    def close(self):
+        self.connection.send(None)
+        self.process.join()
+
+
+class LocalShard(Shard):
+    """Fragmento en el proceso principal con la misma interfaz que RemoteShard."""
+    def send(self, command, *args):
+        self._result = getattr(self, command)(*args)
+
+    def receive(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+# ------------------------ Red de intersecciones ------------------------
+class IntersectionNetwork:
+    """
+    Distrito de rows x cols mosaicos de width x height, cada uno con su semáforo en el centro.
+    Los Vehicle que salen de un mosaico por el norte, este u oeste pasan al mosaico vecino en el
+    paso siguiente; los que salen por el borde del distrito lo abandonan. Los demás agentes se quedan
+    en su mosaico.
+
+    Los mosaicos se reparten en `processes` fragmentos de filas contiguas que avanzan en paralelo.
+    Entre pasos, el proceso principal reúne las salidas en orden de mosaico y las entrega como llegadas;
+    como cada mosaico tiene su propia semilla y sus llegadas no dependen del reparto, el resultado es
+    el mismo con cualquier número de procesos.
+    """
+    def __init__(self, rows, cols, width, height, num_vehicles, num_microbuses, num_ferraris, num_speedsters,
+                 seed=None, processes=1, scheduler="simultaneous"):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+        self.steps = 0
+        self.handoffs = 0  # Vehículos que pasaron de un mosaico a otro
+        self.exited = 0  # Vehículos que salieron del distrito
+
+        # Semillas de los mosaicos generadas en el proceso principal: no dependen del reparto
+        rng = random.Random(seed)
+        tiles = [(index, rng.getrandbits(64)) for index in range(rows * cols)]
+        agents = (num_vehicles, num_microbuses, num_ferraris, num_speedsters)
+        processes = max(1, min(processes, rows))
+        bands = [tiles[rows * k // processes * cols:rows * (k + 1) // processes * cols] for k in range(processes)]
+        if processes == 1:
+            self.shards = [LocalShard(tiles, width, height, agents, scheduler)]
+        else:
+            self.shards = [RemoteShard(band, width, height, agents, scheduler) for band in bands]
+        self.shard_tiles = [[index for index, _ in band] for band in bands]
+        self.arrivals = {}  # mosaico -> vehículos que entran en el próximo paso
+
+    def neighbor(self, index, destination):
+        """Mosaico al que pasa un vehículo que sale de `index` hacia `destination`, o None si sale del distrito."""
+        offset = HANDOFF_OFFSETS.get(destination)
+        if offset is None:
+            return None
+        row, col = divmod(index, self.cols)
+        row, col = row + offset[0], col + offset[1]
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return row * self.cols + col
+
+    def step(self):
+        for shard, tiles in zip(self.shards, self.shard_tiles):
+            shard.send("step", {index: self.arrivals[index] for index in tiles if index in self.arrivals})
+        departures = [departure for shard in self.shards for departure in shard.receive()]
+
+        # Intercambio determinista: las llegadas de cada mosaico quedan en orden de mosaico de origen y de salida
+        arrivals = {}
+        for index, unique_id, destination, state, exit_pos in departures:
+            target = self.neighbor(index, destination)
+            if target is None:
+                self.exited += 1
+                continue
+            pos = entry_cell(destination, exit_pos, self.width, self.height)
+            arrivals.setdefault(target, []).append((unique_id, pos, destination, state))
+            self.handoffs += 1
+        self.arrivals = arrivals
+        self.steps += 1
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+
+    def _gather(self, command):
+        for shard in self.shards:
+            shard.send(command)
+        return [shard.receive() for shard in self.shards]
+
+    def digests(self):
+        """Huella del estado de cada mosaico."""
+        digests = {}
+        for shard_digests in self._gather("digests"):
+            digests.update(shard_digests)
+        return [digests[index] for index in range(self.rows * self.cols)]
+
+    def digest(self):
+        """Huella de toda la red, incluidos los vehículos en tránsito entre mosaicos."""
+        state = (self.steps, self.handoffs, self.exited, self.digests(), sorted(self.arrivals.items()))
+        return hashlib.sha256(repr(state).encode()).hexdigest()
+
+    def agent_count(self):
+        return sum(self._gather("agent_count"))
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
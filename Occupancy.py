@@ -0,0 +1,171 @@
+from mesa.space import MultiGrid
+
+
+# ------------------------ Cuadrícula con índice de ocupación ------------------------
+class OccupancyGrid(MultiGrid):
+    """
+    MultiGrid que mantiene un índice de las celdas ocupadas y de las celdas con más de un agente.
+    El índice se actualiza cuando los agentes se colocan, se mueven o se retiran, por lo que
+    encontrar conflictos cuesta O(celdas ocupadas) en lugar de recorrer toda la cuadrícula.
+    """
+    def __init__(self, width, height, torus):
+        super().__init__(width, height, torus)
+        self.occupied_cells = set()  # Celdas con al menos un agente
+        self.crowded_cells = set()  # Celdas con dos o más agentes
+        self.listeners = []  # Objetos con cell_changed(pos), avisados cuando cambia el contenido de una celda
+        # Cambios de contenido numerados; PerceptionCache compara con ellos en lugar de escuchar cada cambio
+        self.changes = 0
+        self.changed_at = {}  # celda -> número de su último cambio desde forget_changes()
+
+    def place_agent(self, agent, pos):
+        super().place_agent(agent, pos)
+        x, y = agent.pos
+        count = len(self._grid[x][y])
+        if count == 1:
+            self.occupied_cells.add(agent.pos)
+        elif count == 2:
+            self.crowded_cells.add(agent.pos)
+        self.changed_at[agent.pos] = self.changes
+        self.changes += 1
+        for listener in self.listeners:
+            listener.cell_changed(agent.pos)
+
+    def remove_agent(self, agent):
+        pos = agent.pos
+        super().remove_agent(agent)
+        x, y = pos
+        count = len(self._grid[x][y])
+        if count == 0:
+            self.occupied_cells.discard(pos)
+        elif count == 1:
+            self.crowded_cells.discard(pos)
+        self.changed_at[pos] = self.changes
+        self.changes += 1
+        for listener in self.listeners:
+            listener.cell_changed(pos)
+
+    def forget_changes(self):
+        """Olvida en qué celdas hubo cambios (no el total); así changed_at solo crece con las celdas de un paso."""
+        self.changed_at.clear()
+
+    def iter_crowded_cells(self):
+        """Recorre, en el mismo orden que coord_iter, las celdas con más de un agente."""
+        for x, y in sorted(self.crowded_cells):
+            yield self._grid[x][y], (x, y)
+
+    def contents_at(self, pos):
+        """Agentes de la celda, sin copiar la lista."""
+        x, y = pos
+        return self._grid[x][y]
+
+
+# ------------------------ Cuadrícula dispersa ------------------------
+class SparseGrid:
+    """
+    Cuadrícula con la interfaz de OccupancyGrid que solo guarda las celdas ocupadas, en un dict celda -> agentes.
+    La memoria crece con los agentes y no con el área del mapa. Los vecindarios tienen el mismo orden que los de
+    MultiGrid; con torus=False, mover un agente fuera de los límites es un error, igual que en MultiGrid.
+    """
+    def __init__(self, width, height, torus):
+        self.width = width
+        self.height = height
+        self.torus = torus
+        self.cells = {}  # celda -> agentes; solo las celdas ocupadas
+        self.crowded_cells = set()  # Celdas con dos o más agentes
+        self.listeners = []  # Objetos con cell_changed(pos), avisados cuando cambia el contenido de una celda
+        # Cambios de contenido numerados; PerceptionCache compara con ellos en lugar de escuchar cada cambio
+        self.changes = 0
+        self.changed_at = {}  # celda -> número de su último cambio desde forget_changes()
+
+    @property
+    def occupied_cells(self):
+        return self.cells.keys()
+
+    def out_of_bounds(self, pos):
+        x, y = pos
+        return x < 0 or x >= self.width or y < 0 or y >= self.height
+
+    def torus_adj(self, pos):
+        if not self.out_of_bounds(pos):
+            return pos
+        if not self.torus:
+            raise Exception("Point out of bounds, and space non-toroidal.")
+        return pos[0] % self.width, pos[1] % self.height
+
+    def place_agent(self, agent, pos):
+        cell = self.cells.get(pos)
+        if cell is None:
+            cell = self.cells[pos] = []
+        if agent.pos is None or agent not in cell:
+            cell.append(agent)
+            agent.pos = pos
+            if len(cell) == 2:
+                self.crowded_cells.add(pos)
+        self.changed_at[pos] = self.changes
+        self.changes += 1
+        for listener in self.listeners:
+            listener.cell_changed(pos)
+
+    def remove_agent(self, agent):
+        pos = agent.pos
+        cell = self.cells[pos]
+        cell.remove(agent)
+        if not cell:
+            del self.cells[pos]
+        elif len(cell) == 1:
+            self.crowded_cells.discard(pos)
+        agent.pos = None
+        self.changed_at[pos] = self.changes
+        self.changes += 1
+        for listener in self.listeners:
+            listener.cell_changed(pos)
+
+    def move_agent(self, agent, pos):
+        pos = self.torus_adj(pos)
+        self.remove_agent(agent)
+        self.place_agent(agent, pos)
+
+    def get_neighborhood(self, pos, moore, include_center=False, radius=1):
+        """Celdas del vecindario en el orden de MultiGrid; no se guardan en caché para no crecer con el área."""
+        if self.out_of_bounds(pos):
+            raise Exception("The `pos` tuple passed is out of bounds.")
+        x, y = pos
+        neighborhood = {}  # Un dict conserva el orden y descarta las celdas repetidas por el toroide
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if not moore and abs(dx) + abs(dy) > radius:
+                    continue
+                nx, ny = x + dx, y + dy
+                if self.torus:
+                    nx, ny = nx % self.width, ny % self.height
+                elif nx < 0 or nx >= self.width or ny < 0 or ny >= self.height:
+                    continue
+                neighborhood[(nx, ny)] = True
+        if not include_center:
+            neighborhood.pop(pos, None)
+        return tuple(neighborhood)
+
+    def get_neighbors(self, pos, moore, include_center=False, radius=1):
+        return self.get_cell_list_contents(self.get_neighborhood(pos, moore, include_center, radius))
+
+    def get_cell_list_contents(self, cell_list):
+        """Agentes de las celdas de `cell_list`; acepta también una sola celda, como MultiGrid."""
+        if len(cell_list) == 2 and not isinstance(cell_list[0], tuple):
+            cell_list = [cell_list]
+        cells = self.cells
+        return [agent for pos in cell_list if pos in cells for agent in cells[pos]]
+
+    def is_cell_empty(self, pos):
+        return pos not in self.cells
+
+    def forget_changes(self):
+        """Olvida en qué celdas hubo cambios (no el total); así changed_at solo crece con las celdas de un paso."""
+        self.changed_at.clear()
+
+    def iter_crowded_cells(self):
+        """Recorre, en el mismo orden que coord_iter, las celdas con más de un agente."""
+        for pos in sorted(self.crowded_cells):
+            yield self.cells[pos], pos
+
+    def contents_at(self, pos):
+        return self.cells.get(pos, ())
@@ -0,0 +1,118 @@
+from Occupancy import SparseGrid
+from Vehicle import Vehicle
+
+
+# ------------------------ Percepción compartida ------------------------
+class CellPerception:
+    """
+    Resumen del vecindario de von Neumann de una celda. Cada campo se calcula la primera vez que se pide;
+    los que nunca se piden no cuestan nada.
+    """
+    __slots__ = ("cache", "pos", "stamp", "_has_vehicle", "_empty_cells")
+
+    def __init__(self, cache, pos, stamp):
+        self.cache = cache
+        self.pos = pos
+        self.stamp = stamp  # grid.changes al crear el resumen
+        self._has_vehicle = None
+        self._empty_cells = None
+
+    @property
+    def neighborhood(self):
+        return self.cache.neighborhood(self.pos)
+
+    @property
+    def neighbors(self):
+        contents_at = self.cache.grid.contents_at
+        return [agent for cell in self.neighborhood for agent in contents_at(cell)]
+
+    @property
+    def has_vehicle(self):
+        if self._has_vehicle is None:
+            self._has_vehicle = self.cache.find_vehicle(self.pos)
+        return self._has_vehicle
+
+    @property
+    def empty_cells(self):
+        """Celdas vecinas vacías, en el orden de get_neighborhood."""
+        if self._empty_cells is None:
+            self._empty_cells = self.cache.find_empty_cells(self.pos)
+        return self._empty_cells
+
+
+class PerceptionCache:
+    """
+    Capa de percepción del modelo: calcula una sola vez por paso el vecindario de cada celda consultada
+    y lo comparte entre todos los agentes. Las celdas vacías salen del índice de celdas ocupadas de la
+    cuadrícula, sin consultarla; solo se leen las celdas vecinas ocupadas, y solo hasta encontrar un Vehicle.
+    La cuadrícula numera los cambios de sus celdas (changes, changed_at); al volver a pedir un resumen, se
+    reutiliza si ninguna de sus celdas vecinas cambió después de crearlo, y si no se crea uno nuevo. Así un resumen
+    siempre coincide con lo que devolvería la cuadrícula, y un movimiento no paga por invalidar resúmenes
+    que casi nunca se vuelven a pedir (cada agente suele consultar solo su propia celda).
+
+    Los vecindarios de una OccupancyGrid se guardan durante toda la corrida (son a lo sumo uno por celda).
+    Con una SparseGrid se descartan en cada paso junto con los resúmenes: guardarlos haría crecer la memoria
+    con el área recorrida, que es justo lo que la cuadrícula dispersa evita.
+
+    Con `move_rules` (el RoadMap del modelo, si bloquea celdas o tiene calles de un sentido), las celdas
+    vacías de un resumen son solo aquellas a las que el mapa permite avanzar desde la celda consultada.
+    """
+    def __init__(self, grid, move_rules=None):
+        self.grid = grid
+        self.move_rules = move_rules
+        self._summaries = {}
+        self._neighborhoods = {}  # La geometría no cambia: se pide una vez a la cuadrícula por celda
+        self._keep_neighborhoods = not isinstance(grid, SparseGrid)
+        self.hits = 0
+        self.misses = 0
+
+    def at(self, pos):
+        summary = self._summaries.get(pos)
+        if summary is not None:
+            changed_at, stamp = self.grid.changed_at, summary.stamp
+            neighborhood = self._neighborhoods.get(pos) or self.neighborhood(pos)
+            if all(changed_at.get(cell, -1) < stamp for cell in neighborhood):
+                self.hits += 1
+                return summary
+        self.misses += 1
+        summary = self._summaries[pos] = CellPerception(self, pos, self.grid.changes)
+        return summary
+
+    def neighborhood(self, pos):
+        neighborhood = self._neighborhoods.get(pos)
+        if neighborhood is None:
+            neighborhood = self._neighborhoods[pos] = self.grid.get_neighborhood(pos, moore=False, include_center=False)
+        return neighborhood
+
+    def find_vehicle(self, pos):
+        """¿Hay un Vehicle en alguna celda vecina? Solo lee las ocupadas."""
+        grid = self.grid
+        occupied = grid.occupied_cells
+        for cell in self._neighborhoods.get(pos) or self.neighborhood(pos):
+            if cell in occupied:
+                for agent in grid.contents_at(cell):
+                    if isinstance(agent, Vehicle):
+                        return True
+        return False
+
+    def find_empty_cells(self, pos):
+        occupied = self.grid.occupied_cells
+        return [cell for cell in self._neighborhoods.get(pos) or self.neighborhood(pos)
+                if cell not in occupied and (self.move_rules is None or self._reachable(pos, cell))]
+
+    def _reachable(self, pos, cell):
+        """¿Permite el mapa ir de `pos` a su vecina `cell`? Deshace el ajuste del toroide para saber el sentido."""
+        width, height = self.grid.width, self.grid.height
+        dx, dy = cell[0] - pos[0], cell[1] - pos[1]
+        if abs(dx) > 1:
+            dx -= width if dx > 0 else -width
+        if abs(dy) > 1:
+            dy -= height if dy > 0 else -height
+        return self.move_rules.permits(pos, (pos[0] + dx, pos[1] + dy))
+
+    def clear(self):
+        """Descarta todos los resúmenes; el modelo lo llama al inicio de cada paso."""
+        self._summaries.clear()
+        self.grid.forget_changes()
+        if not self._keep_neighborhoods:
+            self._neighborhoods.clear()
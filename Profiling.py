@@ -0,0 +1,148 @@
+from collections import deque
+from time import perf_counter
+
+# Métodos de los agentes que se miden por clase, si la clase los tiene
+AGENT_METHODS = ("step", "perceive_environment", "make_decision", "act")
+# Operaciones de la cuadrícula que solo se cuentan; las que la cuadrícula hace dentro de otra (move_agent llama
+# a remove_agent y place_agent) no se cuentan
+GRID_OPERATIONS = ("place_agent", "move_agent", "remove_agent", "get_neighbors",
+                   "get_neighborhood", "is_cell_empty", "get_cell_list_contents")
+# Fases del motor vectorizado
+ENGINE_PHASES = ("negotiate", "step_vehicles", "step_microbuses", "step_speedsters", "step_ferraris")
+
+
+# ------------------------ Perfilador ------------------------
+class StepProfiler:
+    """
+    Instrumentación de IntersectionModel que se activa en tiempo de ejecución.
+    Mientras está activa, envuelve las fases del paso, los métodos de cada clase de agente y las
+    operaciones de la cuadrícula con contadores de tiempo y de llamadas; al desactivarla restaura los
+    métodos originales, por lo que apagada no añade ningún costo.
+    """
+    def __init__(self, model, max_records=1000):
+        self.model = model
+        self.enabled = False
+        self.records = deque(maxlen=max_records)  # Un registro por paso
+        self.totals = {}  # clave -> [tiempo, llamadas]
+        self.grid_totals = {}  # operación -> llamadas
+        self.steps = 0
+        self._current = {}
+        self._grid_current = {}
+        self._grid_depth = [0]  # Operaciones de la cuadrícula en curso
+        self._wrapped = []
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        model = self.model
+        self._time(model, "step", None)
+        self._time(model, "get_interacting_agents", "phase.get_interacting_agents")
+        self._time(model.negotiation_manager, "negotiate", "phase.negotiate")
+        self._time(model.schedule, "step", "phase.schedule")
+        if model.vector_engine is not None:
+            for name in ENGINE_PHASES:
+                self._time(model.vector_engine, name, f"phase.{name}")
+        for name in GRID_OPERATIONS:
+            self._count(model.grid, name)
+        for agent in model.schedule.agents:
+            self.instrument_agent(agent)
+
+    def disable(self):
+        """Restaura los métodos originales; los totales acumulados se conservan."""
+        for obj, name, had_attribute, previous in reversed(self._wrapped):
+            if had_attribute:
+                setattr(obj, name, previous)
+            else:
+                delattr(obj, name)
+        self._wrapped = []
+        self.enabled = False
+
+    def instrument_agent(self, agent):
+        """Mide un agente; el modelo lo llama para los agentes que se agregan con el perfilador activo."""
+        class_name = type(agent).__name__
+        for name in AGENT_METHODS:
+            # Un vehículo reutilizado de la reserva ya puede estar medido
+            if hasattr(agent, name) and name not in vars(agent):
+                self._time(agent, name, f"{class_name}.{name}")
+
+    def _replace(self, obj, name, wrapper):
+        self._wrapped.append((obj, name, name in vars(obj), vars(obj).get(name)))
+        setattr(obj, name, wrapper)
+
+    def _time(self, obj, name, key):
+        original = getattr(obj, name)
+        if key is None:
+            # El paso completo del modelo delimita los registros
+            def timed(*args, **kwargs):
+                start = perf_counter()
+                result = original(*args, **kwargs)
+                self._close_step(perf_counter() - start)
+                return result
+        else:
+            current = self._current
+
+            def timed(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    entry = current.get(key)
+                    if entry is None:
+                        entry = current[key] = [0.0, 0]
+                    entry[0] += perf_counter() - start
+                    entry[1] += 1
+        self._replace(obj, name, timed)
+
+    def _count(self, obj, name):
+        original = getattr(obj, name)
+        current, depth = self._grid_current, self._grid_depth
+
+        def counted(*args, **kwargs):
+            if depth[0]:
+                return original(*args, **kwargs)
+            current[name] = current.get(name, 0) + 1
+            depth[0] += 1
+            try:
+                return original(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+        self._replace(obj, name, counted)
+
+    def _close_step(self, elapsed):
+        self.steps += 1
+        record = {
+            "step": self.model.schedule.steps,
+            "time": elapsed,
+            "phases": {key: {"time": time, "calls": calls} for key, (time, calls) in self._current.items()},
+            "grid_operations": dict(self._grid_current),
+        }
+        self.records.append(record)
+        for key, (time, calls) in self._current.items():
+            total = self.totals.setdefault(key, [0.0, 0])
+            total[0] += time
+            total[1] += calls
+        for name, calls in self._grid_current.items():
+            self.grid_totals[name] = self.grid_totals.get(name, 0) + calls
+        self._current.clear()
+        self._grid_current.clear()
+
+    def report(self):
+        """Totales agregados por fase / clase de agente, ordenados por tiempo."""
+        phases = sorted(self.totals.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            "steps": self.steps,
+            "phases": {key: {"time": time, "calls": calls, "time_per_step": time / self.steps if self.steps else 0.0}
+                       for key, (time, calls) in phases},
+            "grid_operations": dict(sorted(self.grid_totals.items(), key=lambda item: item[1], reverse=True)),
+        }
+
+    def format_report(self):
+        report = self.report()
+        lines = [f"Pasos medidos: {report['steps']}", f"{'fase':<40}{'tiempo (s)':>12}{'llamadas':>12}{'ms/paso':>10}"]
+        for key, entry in report["phases"].items():
+            lines.append(f"{key:<40}{entry['time']:>12.4f}{entry['calls']:>12}{entry['time_per_step'] * 1000:>10.3f}")
+        lines.append("Operaciones de la cuadrícula:")
+        for name, calls in report["grid_operations"].items():
+            lines.append(f"  {name:<38}{calls:>12}")
+        return "\n".join(lines)
@@ -0,0 +1,147 @@
+import json
+import os
+import numpy as np
+
+# Columnas de la trayectoria y su tipo en disco
+COLUMNS = {
+    "tick": np.int64,
+    "agent": np.int32,
+    "type": np.int16,
+    "x": np.int32,
+    "y": np.int32,
+    "state": np.int16,
+    "decision": np.int16,
+}
+METADATA = "metadata.json"
+
+
+# ------------------------ Grabador de trayectorias ------------------------
+class TrajectoryRecorder:
+    """
+    Guarda por paso el id, tipo, posición, estado y decisión de cada agente en búferes columnares
+    de NumPy preasignados. Cuando un búfer se llena se agrega a un archivo binario por columna en
+    `path`, que TrajectoryReader abre con np.memmap sin cargarlo completo en memoria.
+    Los textos (ids, tipos, estados y decisiones) se guardan como enteros con su vocabulario en metadata.json.
+    """
+    def __init__(self, model, path, chunk_size=65536):
+        self.model = model
+        self.path = path
+        self.chunk_size = chunk_size
+        self.buffers = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.filled = 0
+        self.rows = 0
+        self.vocabularies = {"agent": {}, "type": {}, "state": {None: 0}, "decision": {None: 0}}
+        os.makedirs(path, exist_ok=True)
+        for name in COLUMNS:
+            open(os.path.join(path, f"{name}.bin"), "wb").close()
+
+    def _code(self, vocabulary, value):
+        codes = self.vocabularies[vocabulary]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def record(self):
+        """Agrega las filas del paso actual; se llama después de cada model.step()."""
+        self.model.sync_agents()
+        tick = self.model.schedule.steps
+        code = self._code
+        rows = [
+            (tick, code("agent", str(agent.unique_id)), code("type", type(agent).__name__),
+             agent.pos[0], agent.pos[1],
+             code("state", getattr(agent, "state", None)), code("decision", getattr(agent, "decision", None)))
+            for agent in self.model.schedule.agents if agent.pos is not None
+        ]
+        start = 0
+        while start < len(rows):
+            count = min(len(rows) - start, self.chunk_size - self.filled)
+            columns = zip(*rows[start:start + count])
+            for name, values in zip(COLUMNS, columns):
+                self.buffers[name][self.filled:self.filled + count] = values
+            self.filled += count
+            start += count
+            if self.filled == self.chunk_size:
+                self.flush()
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.model.step()
+            self.record()
+
+    def flush(self):
+        """Escribe las filas pendientes al final de cada archivo de columna y actualiza los metadatos."""
+        for name in COLUMNS:
+            with open(os.path.join(self.path, f"{name}.bin"), "ab") as file:
+                self.buffers[name][:self.filled].tofile(file)
+        self.rows += self.filled
+        self.filled = 0
+        metadata = {
+            "rows": self.rows,
+            "grid": [self.model.grid.width, self.model.grid.height],
+            "columns": {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+            "vocabularies": {name: [value for value, _ in sorted(codes.items(), key=lambda item: item[1])]
+                             for name, codes in self.vocabularies.items()},
+        }
+        with open(os.path.join(self.path, METADATA), "w") as file:
+            json.dump(metadata, file)
+
+    def close(self):
+        self.flush()
+
+
+# ------------------------ Lector de trayectorias ------------------------
+class TrajectoryReader:
+    """Lee una trayectoria grabada; las columnas son np.memmap y solo se leen las filas pedidas."""
+    def __init__(self, path, scan_chunk=1 << 20):
+        with open(os.path.join(path, METADATA)) as file:
+            metadata = json.load(file)
+        self.rows = metadata["rows"]
+        self.width, self.height = metadata["grid"]
+        self.vocabularies = metadata["vocabularies"]
+        self.scan_chunk = scan_chunk
+        self.columns = {
+            name: np.memmap(os.path.join(path, f"{name}.bin"), dtype=np.dtype(dtype), mode="r", shape=(self.rows,))
+            if self.rows else np.empty(0, dtype=np.dtype(dtype))
+            for name, dtype in metadata["columns"].items()
+        }
+
+    def _rows(self, start, stop):
+        return {name: np.asarray(column[start:stop]) for name, column in self.columns.items()}
+
+    def _tick_bounds(self, start=None, stop=None):
+        """Filas de los pasos [start, stop); los pasos están ordenados, así que basta una búsqueda binaria."""
+        ticks = self.columns["tick"]
+        first = 0 if start is None else int(np.searchsorted(ticks, start, side="left"))
+        last = self.rows if stop is None else int(np.searchsorted(ticks, stop, side="left"))
+        return first, last
+
+    def ticks(self, start=None, stop=None):
+        """Todas las filas de los pasos [start, stop)."""
+        return self._rows(*self._tick_bounds(start, stop))
+
+    def iter_ticks(self, start=None, stop=None):
+        """(paso, filas) de cada paso de [start, stop), leyendo un paso a la vez."""
+        ticks = self.columns["tick"]
+        first, last = self._tick_bounds(start, stop)
+        while first < last:
+            tick = int(ticks[first])
+            end = min(int(np.searchsorted(ticks, tick, side="right")), last)
+            yield tick, self._rows(first, end)
+            first = end
+
+    def agent(self, agent_id, start=None, stop=None):
+        """Filas de un agente en los pasos [start, stop), recorriendo la columna por bloques."""
+        code = self.vocabularies["agent"].index(str(agent_id))
+        first, last = self._tick_bounds(start, stop)
+        selected = []
+        for block in range(first, last, self.scan_chunk):
+            end = min(block + self.scan_chunk, last)
+            selected.append(block + np.flatnonzero(self.columns["agent"][block:end] == code))
+        rows = np.concatenate(selected) if selected else np.empty(0, dtype=np.int64)
+        return {name: np.asarray(column[rows]) for name, column in self.columns.items()}
+
+    def decode(self, name, codes):
+        """Convierte los enteros de una columna de texto (agent, type, state, decision) a sus valores."""
+        vocabulary = self.vocabularies[name]
+        return [vocabulary[code] for code in codes]
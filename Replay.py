@@ -0,0 +1,112 @@
+import hashlib
+import inspect
+import json
+from interaccion_agentes import IntersectionModel
+
+
+def state_digest(model):
+    """Huella del estado observable del modelo (agentes, posiciones, estados y semáforo)."""
+    model.sync_agents()
+    light = model.traffic_light
+    agents = sorted((str(a.unique_id), a.pos, getattr(a, "state", None)) for a in model.schedule.agents)
+    state = (model.schedule.steps, agents, light.state, light.cycle_index, light.saturated, light.wait_stats())
+    return hashlib.sha256(repr(state).encode()).hexdigest()
+
+
+def model_options(options):
+    """
+    Todas las opciones de IntersectionModel con valor por defecto (salvo engine y seed): las de `options` y,
+    para las que faltan, el valor por defecto de hoy, así un registro no cambia si cambian los valores por defecto.
+    """
+    parameters = inspect.signature(IntersectionModel.__init__).parameters
+    recorded = {name: parameter.default for name, parameter in parameters.items()
+                if parameter.default is not inspect.Parameter.empty and name not in ("engine", "seed")}
+    unknown = set(options) - set(recorded)
+    if unknown:
+        raise ValueError(f"Opciones desconocidas de IntersectionModel: {', '.join(sorted(unknown))}")
+    recorded.update(options)
+    try:
+        json.dumps(recorded)
+    except TypeError:
+        raise ValueError("ReplayLog solo registra opciones que se pueden guardar en JSON "
+                         "(road_map como ruta de archivo, sin inflow)") from None
+    return recorded
+
+
+def as_tuples(value):
+    """JSON guarda las tuplas como listas; las entradas del modelo solo reciben tuplas (celdas), así que se restauran."""
+    if isinstance(value, list):
+        return tuple(as_tuples(item) for item in value)
+    if isinstance(value, dict):
+        return {key: as_tuples(item) for key, item in value.items()}
+    return value
+
+
+# ------------------------ Registro de repetición ------------------------
+class ReplayLog:
+    """
+    Lo mínimo para regenerar una corrida: parámetros del modelo, semilla, motor, el resto de las opciones del
+    constructor (todas, con su valor), número de pasos y las entradas externas (llamadas a métodos del modelo)
+    con el paso en que se aplicaron.
+    """
+    def __init__(self, params, seed, engine="object", steps=0, inputs=None, digest=None, options=None):
+        self.params = dict(params)
+        self.seed = seed
+        self.engine = engine
+        self.options = model_options(options or {})
+        self.steps = steps
+        self.inputs = inputs or []  # [paso, método, args, kwargs]
+        self.digest = digest
+
+    def build_model(self):
+        return IntersectionModel(**self.params, engine=self.engine, seed=self.seed, **self.options)
+
+    def save(self, path):
+        with open(path, "w") as file:
+            json.dump(vars(self), file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            data = json.load(file)
+        data["inputs"] = [[step, method, list(as_tuples(args)), as_tuples(kwargs)]
+                          for step, method, args, kwargs in data.get("inputs", [])]
+        return cls(**data)
+
+
+class RecordedRun:
+    """Ejecuta un modelo registrando solo lo necesario para repetirlo; `options` van al constructor del modelo."""
+    def __init__(self, params, seed, engine="object", **options):
+        self.log = ReplayLog(params, seed, engine, options=options)
+        self.model = self.log.build_model()
+
+    def step(self):
+        self.model.step()
+        self.log.steps += 1
+
+    def apply(self, method, *args, **kwargs):
+        """Aplica una entrada externa al modelo (p. ej. cambiar un parámetro) y la registra."""
+        self.log.inputs.append([self.log.steps, method, list(args), kwargs])
+        return getattr(self.model, method)(*args, **kwargs)
+
+    def save(self, path):
+        self.log.digest = state_digest(self.model)
+        self.log.save(path)
+        return self.log
+
+
+def replay(log, verify=True):
+    """Regenera la corrida de un ReplayLog; con verify, comprueba que el estado final sea idéntico."""
+    model = log.build_model()
+    inputs = iter(log.inputs)
+    pending = next(inputs, None)
+    for step in range(log.steps + 1):
+        while pending is not None and pending[0] == step:
+            _, method, args, kwargs = pending
+            getattr(model, method)(*args, **kwargs)
+            pending = next(inputs, None)
+        if step < log.steps:
+            model.step()
+    if verify and log.digest is not None and state_digest(model) != log.digest:
+        raise ValueError("La repetición no reproduce el estado registrado")
+    return model
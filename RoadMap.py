@@ -0,0 +1,135 @@
+import numpy as np
+
+# Tipos de celda, guardados como su índice en un arreglo uint8; "open" es terreno libre y transitable
+CELL_TYPES = ("open", "lane", "intersection", "roundabout", "stop", "blocked")
+OPEN, LANE, INTERSECTION, ROUNDABOUT, STOP, BLOCKED = range(len(CELL_TYPES))
+# Direcciones permitidas por celda como bits; el norte es y - 1, igual que la salida norte de Vehicle
+DIRECTION_BITS = {"north": 1, "east": 2, "south": 4, "west": 8}
+DIRECTION_OFFSETS = {"north": (0, -1), "east": (1, 0), "south": (0, 1), "west": (-1, 0)}
+ALL_DIRECTIONS = 15
+# Caracteres del formato de texto: tipo de celda y direcciones permitidas
+TEXT_CELLS = {
+    ".": (OPEN, ALL_DIRECTIONS),
+    "#": (BLOCKED, 0),
+    "+": (INTERSECTION, ALL_DIRECTIONS),
+    "o": (ROUNDABOUT, ALL_DIRECTIONS),
+    "s": (STOP, ALL_DIRECTIONS),
+    "-": (LANE, DIRECTION_BITS["east"] | DIRECTION_BITS["west"]),
+    "|": (LANE, DIRECTION_BITS["north"] | DIRECTION_BITS["south"]),
+    "^": (LANE, DIRECTION_BITS["north"]),
+    "v": (LANE, DIRECTION_BITS["south"]),
+    ">": (LANE, DIRECTION_BITS["east"]),
+    "<": (LANE, DIRECTION_BITS["west"]),
+}
+
+
+# ------------------------ Mapa de calles ------------------------
+class RoadMap:
+    """
+    Capa estática del mapa: dos rásteres uint8 de width x height con el tipo de cada celda y las direcciones
+    en que se puede salir de ella. Las consultas son O(1) y no tocan la cuadrícula de agentes.
+
+    Se guarda en un solo archivo .npy con las dos capas; load() lo abre con np.memmap en modo de solo
+    lectura, así que todos los procesos de trabajo que cargan el mismo mapa comparten sus páginas.
+    """
+    def __init__(self, types, directions):
+        if types.shape != directions.shape:
+            raise ValueError("Las capas del mapa deben tener la misma forma")
+        self.types = types
+        self.directions = directions
+        self.width, self.height = types.shape
+
+    @classmethod
+    def open(cls, width, height):
+        """Mapa sin calles marcadas: todo es terreno libre."""
+        return cls(np.full((width, height), OPEN, dtype=np.uint8),
+                   np.full((width, height), ALL_DIRECTIONS, dtype=np.uint8))
+
+    @classmethod
+    def crossroads(cls, width, height):
+        """
+        Cruce del modelo: tres carriles horizontales y tres verticales alrededor del semáforo, con la
+        intersección donde se cruzan; el resto es terreno libre, como siempre lo ha recorrido la simulación.
+        """
+        road_map = cls.open(width, height)
+        rows = [y for y in (height // 2 - 1, height // 2, height // 2 + 1) if 0 <= y < height]
+        columns = [x for x in (width // 2 - 1, width // 2, width // 2 + 1) if 0 <= x < width]
+        road_map.types[:, rows] = LANE
+        road_map.types[columns, :] = LANE
+        road_map.types[np.ix_(columns, rows)] = INTERSECTION
+        return road_map
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Mapa dibujado con caracteres, una fila de texto por valor de y (la primera es y = 0):
+        "." libre, "#" bloqueada, "+" intersección, "o" glorieta, "s" alto, "-" y "|" carriles de doble
+        sentido, "^", "v", ">" y "<" carriles de un sentido.
+        """
+        lines = [line.rstrip("\n") for line in text.strip("\n").splitlines()]
+        width, height = max(len(line) for line in lines), len(lines)
+        road_map = cls.open(width, height)
+        for y, line in enumerate(lines):
+            for x, char in enumerate(line):
+                if char not in TEXT_CELLS:
+                    raise ValueError(f"Carácter de mapa desconocido {char!r} en ({x}, {y})")
+                road_map.types[x, y], road_map.directions[x, y] = TEXT_CELLS[char]
+        return road_map
+
+    @classmethod
+    def load(cls, path):
+        """Abre un mapa .npy (sin copiarlo a memoria) o lo lee de un archivo de texto."""
+        if path.endswith(".npy"):
+            layers = np.load(path, mmap_mode="r")
+            return cls(layers[0], layers[1])
+        with open(path) as file:
+            return cls.from_text(file.read())
+
+    def save(self, path):
+        np.save(path, np.stack([self.types, self.directions]))
+
+    def __getstate__(self):
+        # Un mapa abierto con memmap se guarda como arreglos comunes
+        return np.asarray(self.types), np.asarray(self.directions)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    # Consultas
+    def cell_type(self, pos):
+        return CELL_TYPES[self.types.item(pos)]
+
+    def is_passable(self, pos):
+        return self.types.item(pos) != BLOCKED
+
+    def is_roundabout(self, pos):
+        return self.types.item(pos) == ROUNDABOUT
+
+    def allows(self, pos, direction):
+        """¿Se puede salir de `pos` hacia `direction` ("north", "east", "south" o "west")?"""
+        return bool(self.directions.item(pos) & DIRECTION_BITS[direction])
+
+    def restricts_movement(self):
+        """¿Hay celdas bloqueadas o sentidos prohibidos? Si no, cualquier movimiento está permitido."""
+        return bool((self.types == BLOCKED).any() or (self.directions != ALL_DIRECTIONS).any())
+
+    def permits(self, origin, pos):
+        """
+        ¿Puede un agente avanzar de `origin` a `pos`? `pos` puede venir sin ajustar al toroide y el avance
+        puede ser diagonal o de varias celdas: la celda de llegada debe ser transitable y cada eje del
+        avance, una dirección permitida al salir de `origin`.
+        """
+        x, y = pos[0] % self.width, pos[1] % self.height
+        if self.types.item(x, y) == BLOCKED:
+            return False
+        allowed = self.directions.item(origin)
+        dx, dy = pos[0] - origin[0], pos[1] - origin[1]
+        if dx and not allowed & DIRECTION_BITS["east" if dx > 0 else "west"]:
+            return False
+        if dy and not allowed & DIRECTION_BITS["south" if dy > 0 else "north"]:
+            return False
+        return True
+
+    def contains(self, cell_type):
+        """¿Hay alguna celda del tipo dado?"""
+        return bool((self.types == CELL_TYPES.index(cell_type)).any())
@@ -0,0 +1,188 @@
+import heapq
+from functools import lru_cache
+from itertools import islice
+
+
+# ------------------------ Planes de ruta ------------------------
+class ExplorePlan:
+    """Recorre todas las celdas en el orden de coord_iter, excepto el origen. Se calcula bajo demanda."""
+    def __init__(self, width, height, origin):
+        self.width = width
+        self.height = height
+        self.origin_index = origin[0] * height + origin[1]
+
+    def __len__(self):
+        return self.width * self.height - 1
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def iter_from(self, start):
+        """Recorre el plan a partir de su paso `start` sin generar los anteriores."""
+        first = start if start < self.origin_index else start + 1
+        for index in range(first, self.width * self.height):
+            if index != self.origin_index:
+                yield index // self.height, index % self.height
+
+
+class MaxTurnsPlan:
+    """
+    Recorre todas las celdas de la más lejana a la más cercana al origen (distancia Manhattan);
+    las celdas a la misma distancia siguen el orden de coord_iter. Se calcula bajo demanda.
+    """
+    def __init__(self, width, height, origin):
+        self.width = width
+        self.height = height
+        self.origin = origin
+
+    def __len__(self):
+        return self.width * self.height
+
+    def __iter__(self):
+        ox, oy = self.origin
+        max_distance = max(ox, self.width - 1 - ox) + max(oy, self.height - 1 - oy)
+        for distance in range(max_distance, -1, -1):
+            for x in range(max(0, ox - distance), min(self.width - 1, ox + distance) + 1):
+                rest = distance - abs(x - ox)
+                for y in sorted({oy - rest, oy + rest}):
+                    if 0 <= y < self.height:
+                        yield x, y
+
+
+# ------------------------ Ruta de un agente ------------------------
+class Route:
+    """
+    Cursor de un agente sobre un plan compartido; se consume desde el frente en O(1).
+    Se guarda en un checkpoint como (plan, pasos pendientes) y al restaurarse vuelve a avanzar hasta el mismo punto.
+    """
+    def __init__(self, plan):
+        self._plan = plan
+        self._steps = iter(plan)
+        self._remaining = len(plan)
+
+    def __getstate__(self):
+        return self._plan, self._remaining
+
+    def __setstate__(self, state):
+        self._plan, self._remaining = state
+        consumed = len(self._plan) - self._remaining
+        if hasattr(self._plan, "iter_from"):
+            self._steps = self._plan.iter_from(consumed)
+        else:
+            self._steps = islice(self._plan, consumed, None)
+
+    def __len__(self):
+        return self._remaining
+
+    def __bool__(self):
+        return self._remaining > 0
+
+    def popleft(self):
+        self._remaining -= 1
+        return next(self._steps)
+
+
+# ------------------------ Servicio de rutas ------------------------
+# Vecinos de von Neumann en el orden de grid.get_neighborhood, con la dirección de cada paso
+NEIGHBOR_STEPS = ((-1, 0, "west"), (0, -1, "north"), (0, 1, "south"), (1, 0, "east"))
+
+
+def every_cell(pos):
+    """Mapa de calles por defecto: todas las celdas son transitables."""
+    return True
+
+
+class RoutePlanner:
+    """
+    Servicio de rutas compartido por todos los agentes del modelo.
+    Ofrece los objetivos "explore" y "max-turns" (generados bajo demanda) y "shortest" (A* sobre las calles),
+    y guarda los planes en una caché LRU indexada por (origen, destino, objetivo).
+    Con `road_map`, A* solo pasa por celdas transitables y respeta los sentidos permitidos de cada celda.
+    """
+    def __init__(self, grid, is_street=None, maxsize=1024, road_map=None):
+        self.width = grid.width
+        self.height = grid.height
+        self.torus = grid.torus
+        self.road_map = road_map
+        # Sin mapa de calles, todas las celdas son transitables
+        self.is_street = is_street or (road_map.is_passable if road_map is not None else every_cell)
+        self.maxsize = maxsize
+        self._plan = lru_cache(maxsize=maxsize)(self._build_plan)
+
+    def __getstate__(self):
+        # La caché no se guarda en un checkpoint: se vuelve a llenar bajo demanda
+        state = dict(vars(self))
+        del state["_plan"]
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._plan = lru_cache(maxsize=self.maxsize)(self._build_plan)
+
+    def route(self, origin, destination, objective):
+        """Devuelve una Route nueva para el agente sobre el plan (posiblemente en caché)."""
+        return Route(self._plan(origin, destination, objective))
+
+    def cache_info(self):
+        """Aciertos, fallos, tamaño máximo y tamaño actual de la caché."""
+        return self._plan.cache_info()
+
+    def clear_cache(self):
+        self._plan.cache_clear()
+
+    def _build_plan(self, origin, destination, objective):
+        if objective == "explore":
+            return ExplorePlan(self.width, self.height, origin)
+        if objective == "max-turns":
+            return MaxTurnsPlan(self.width, self.height, origin)
+        if objective == "shortest":
+            return self.shortest_path(origin, destination)
+        raise ValueError(f"Objetivo de ruta desconocido: {objective}")
+
+    def neighbors(self, pos):
+        """Celdas de von Neumann transitables, en el mismo orden que grid.get_neighborhood."""
+        x, y = pos
+        for dx, dy, direction in NEIGHBOR_STEPS:
+            if self.road_map is not None and not self.road_map.allows(pos, direction):
+                continue
+            nx, ny = x + dx, y + dy
+            if self.torus:
+                nx, ny = nx % self.width, ny % self.height
+            elif not (0 <= nx < self.width and 0 <= ny < self.height):
+                continue
+            if self.is_street((nx, ny)):
+                yield nx, ny
+
+    def distance(self, a, b):
+        """Distancia Manhattan, considerando el toroide si la cuadrícula lo es."""
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        if self.torus:
+            dx, dy = min(dx, self.width - dx), min(dy, self.height - dy)
+        return dx + dy
+
+    def shortest_path(self, origin, destination):
+        """A* del origen al destino; devuelve las celdas a recorrer (sin el origen) o () si no hay camino."""
+        frontier = [(self.distance(origin, destination), 0, origin)]
+        came_from = {origin: None}
+        cost = {origin: 0}
+        while frontier:
+            _, current_cost, current = heapq.heappop(frontier)
+            if current == destination:
+                break
+            if current_cost > cost[current]:
+                continue
+            for neighbor in self.neighbors(current):
+                new_cost = current_cost + 1
+                if new_cost < cost.get(neighbor, new_cost + 1):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(frontier, (new_cost + self.distance(neighbor, destination), new_cost, neighbor))
+        if destination not in came_from:
+            return ()
+
+        path = []
+        current = destination
+        while current != origin:
+            path.append(current)
+            current = came_from[current]
+        return tuple(reversed(path))
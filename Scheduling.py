@@ -0,0 +1,145 @@
+import heapq
+from mesa.time import BaseScheduler
+
+
+# ------------------------ Planificador por eventos ------------------------
+class EventScheduler(BaseScheduler):
+    """
+    Alternativa a SimultaneousActivation que solo activa a los agentes que tienen algo que hacer.
+    Mantiene una cola de eventos ordenada por (paso, orden de inserción); en cada paso se ejecuta
+    step() de los agentes vencidos en el mismo orden que SimultaneousActivation y después su advance().
+
+    Al terminar el paso, cada agente activado indica con wake_delay() cuándo vuelve a tener trabajo:
+    un número de pasos, o None si se queda dormido hasta que lo despierte un evento. Un agente dormido
+    se despierta cuando cambia el contenido de su celda (p. ej. llega un vecino) o cuando alguien llama
+    a wake(agent), como hace el semáforo al recibir un vehículo. Los agentes sin wake_delay() se activan
+    en cada paso. Para que los resultados sean los mismos que con SimultaneousActivation, un agente solo
+    debe dormirse cuando su step() no cambiaría nada.
+
+    Los agentes que vuelven en el paso siguiente (el caso común) no pasan por el montículo: van a una lista
+    que ya queda en orden de inserción, porque se arma en el orden en que se activaron, y en cada paso se
+    mezcla con las entradas vencidas del montículo (despertados y retrasos de más de un paso).
+    """
+    def __init__(self, model, agents=None):
+        self._queue = []  # (paso, orden, agente); las entradas que no coinciden con _due se descartan
+        self._next = []  # Agentes que vuelven en el paso siguiente, en orden de inserción; igual que _queue
+        self._due = {}  # agente -> paso de su próxima activación
+        self._order = {}  # agente -> orden de inserción
+        self._next_order = 0
+        self._watchers = {}  # celda -> agentes dormidos en ella
+        self._watching = {}  # agente dormido -> celda
+        self._cursor = None  # Orden del agente que se está ejecutando; None fuera de step()
+        self.activations = 0  # Llamadas a step() de agentes, acumuladas
+        super().__init__(model)
+        for agent in agents or ():
+            self.add(agent)
+
+    def add(self, agent):
+        super().add(agent)
+        if agent not in self._order:
+            self._order[agent] = self._next_order
+            self._next_order += 1
+            # Como en SimultaneousActivation, un agente agregado durante un paso empieza en el siguiente
+            self._schedule(agent, self.steps if self._cursor is None else self.steps + 1)
+
+    def remove(self, agent):
+        super().remove(agent)
+        self._order.pop(agent, None)
+        self._due.pop(agent, None)
+        self._unwatch(agent)
+
+    def wake(self, agent):
+        """
+        Programa al agente lo antes posible: en el paso en curso si todavía no le toca su turno,
+        o en el siguiente si ya pasó.
+        """
+        order = self._order.get(agent)
+        if order is None:
+            return
+        tick = self.steps if self._cursor is None or order > self._cursor else self.steps + 1
+        self._schedule(agent, tick)
+
+    def cell_changed(self, pos):
+        """Escucha de OccupancyGrid: despierta a los agentes dormidos en la celda."""
+        sleepers = self._watchers.pop(pos, None)
+        if sleepers:
+            for agent in sleepers:
+                del self._watching[agent]
+                self.wake(agent)
+
+    def _schedule(self, agent, tick):
+        current = self._due.get(agent)
+        if current is not None and current <= tick:
+            return
+        self._unwatch(agent)
+        self._due[agent] = tick
+        heapq.heappush(self._queue, (tick, self._order[agent], agent))
+
+    def _sleep(self, agent):
+        if agent.pos is None:
+            return
+        self._watching[agent] = agent.pos
+        self._watchers.setdefault(agent.pos, set()).add(agent)
+
+    def _unwatch(self, agent):
+        pos = self._watching.pop(agent, None)
+        if pos is not None:
+            sleepers = self._watchers[pos]
+            sleepers.discard(agent)
+            if not sleepers:
+                del self._watchers[pos]
+
+    @property
+    def sleeping(self):
+        """Agentes sin activación programada."""
+        return len(self._order) - len(self._due)
+
+    def step(self):
+        tick = self.steps
+        queue, due, orders = self._queue, self._due, self._order
+        following, self._next = self._next, []
+        stepped = []
+        position, pending = 0, len(following)
+        while True:
+            # El siguiente en turno: el primero de la lista o la cima del montículo, el de menor orden
+            while position < pending and due.get(following[position]) != tick:
+                position += 1
+            if queue and queue[0][0] <= tick and (
+                    position == pending or queue[0][1] < orders[following[position]]):
+                when, order, agent = heapq.heappop(queue)
+                if due.get(agent) != when:
+                    continue
+            elif position < pending:
+                agent = following[position]
+                order = orders[agent]
+                position += 1
+            else:
+                break
+            del due[agent]
+            self._cursor = order
+            agent.step()
+            stepped.append(agent)
+        self._cursor = None
+        self.activations += len(stepped)
+
+        for agent in stepped:
+            if agent in orders:
+                agent.advance()
+
+        # Programar la siguiente activación de los que siguen en el planificador y nadie despertó
+        following = self._next
+        for agent in stepped:
+            if agent not in orders or agent in due:
+                continue
+            wake_delay = getattr(agent, "wake_delay", None)
+            delay = wake_delay() if wake_delay is not None else 1
+            if delay == 1:
+                due[agent] = tick + 1
+                following.append(agent)
+            elif delay is None:
+                self._sleep(agent)
+            else:
+                self._schedule(agent, tick + delay)
+
+        self.steps += 1
+        self.time += 1
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+import time
+
+
+def dump(frame):
+    """Un cuadro por línea de JSON compacto."""
+    return json.dumps(frame, separators=(",", ":")).encode() + b"\n"
+
+
+def apply_frame(view, frame):
+    """
+    Aplica un cuadro a una vista {"tick", "agents", "light"}: un cuadro "key" la reemplaza completa y uno
+    "delta" solo cambia los agentes que trae, quita los de "removed" y cambia la luz si viene.
+    """
+    if frame["type"] == "key":
+        view["agents"] = dict(frame["agents"])
+        view["light"] = frame["light"]
+    else:
+        agents = view["agents"]
+        agents.update(frame["agents"])
+        for unique_id in frame["removed"]:
+            agents.pop(unique_id, None)
+        if "light" in frame:
+            view["light"] = frame["light"]
+    view["tick"] = frame["tick"]
+    return view
+
+
+# ------------------------ Codificador de cuadros ------------------------
+class FrameEncoder:
+    """
+    Convierte cada paso del modelo en un cuadro delta: los agentes cuya posición o estado cambió, como
+    unique_id -> [clase, x, y, estado], los que salieron de la cuadrícula y el color del semáforo si cambió.
+    El semáforo no va entre los agentes; solo se manda su color.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.agents = {}  # unique_id -> (pos, estado) del último cuadro
+        self.light = None
+
+    def encode(self):
+        model = self.model
+        model.sync_agents()
+        previous, current = self.agents, {}
+        changed = {}
+        for agent in model.schedule.agents:
+            if agent.pos is None or agent is model.traffic_light:
+                continue
+            unique_id = str(agent.unique_id)
+            entry = (agent.pos, getattr(agent, "state", None))
+            current[unique_id] = entry
+            if previous.get(unique_id) != entry:
+                changed[unique_id] = [type(agent).__name__, *entry[0], entry[1]]
+        frame = {
+            "type": "delta",
+            "tick": model.schedule.steps,
+            "agents": changed,
+            "removed": [unique_id for unique_id in previous if unique_id not in current],
+        }
+        color = model.traffic_light.color
+        if color != self.light:
+            frame["light"] = self.light = color
+        self.agents = current
+        return frame
+
+
+class ClientStream:
+    """Cola de salida de un cliente; si se llena, se descarta lo pendiente y se reemplaza por un cuadro completo."""
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue()
+        self.queue_size = queue_size
+        self.sent = 0
+        self.dropped = 0
+
+
+# ------------------------ Servidor ------------------------
+class SimulationServer:
+    """
+    Servidor local de asyncio que transmite una corrida de IntersectionModel a cualquier número de clientes
+    TCP, un cuadro JSON por línea. El modelo avanza en un hilo de trabajo y cada paso se publica en el lazo
+    de eventos sin esperar a nadie: la simulación nunca se detiene por un cliente.
+
+    Cada cliente recibe primero un cuadro "key" con el estado completo y después cuadros "delta". Si un
+    cliente lento acumula `queue_size` cuadros sin enviar, se descartan y en su lugar recibe un "key" del
+    paso actual, así su vista vuelve a ser correcta. Al terminar la corrida todos reciben un cuadro "end".
+    `interval` son los segundos mínimos entre pasos (0: tan rápido como se pueda).
+    """
+    def __init__(self, model, host="127.0.0.1", port=0, steps=None, interval=0.0, queue_size=8):
+        self.model = model
+        self.host = host
+        self.port = port
+        self.steps = steps
+        self.interval = interval
+        self.queue_size = queue_size
+        self.encoder = FrameEncoder(model)
+        self.view = {"tick": None, "agents": {}, "light": None}  # Estado reconstruido con los cuadros publicados
+        self.clients = set()
+        self.finished = False
+        self.frames = 0  # Cuadros publicados
+        self.sent = 0  # Cuadros enviados, sumando todos los clientes
+        self.dropped = 0  # Cuadros descartados por clientes lentos
+        self._stop = threading.Event()
+        self._keyframe = None  # Cuadro "key" del paso actual, codificado una sola vez
+        self._loop = None
+        self._server = None
+        self._worker = None
+
+    async def start(self):
+        """Abre el puerto (con port=0, uno libre que queda en self.port) y arranca la simulación."""
+        self._loop = asyncio.get_running_loop()
+        frame = self.encoder.encode()
+        frame["type"] = "key"
+        apply_frame(self.view, frame)
+        self._server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._worker = asyncio.ensure_future(asyncio.to_thread(self._simulate))
+
+    async def wait(self):
+        """Espera a que termine la corrida."""
+        await self._worker
+
+    async def close(self):
+        """Detiene la simulación y cierra el servidor y las conexiones."""
+        self._stop.set()
+        if self._worker is not None:
+            await self._worker
+        # Al terminar, el hilo ya mandó "end" a todos los clientes
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Hilo de trabajo
+    def _simulate(self):
+        model, loop = self.model, self._loop
+        taken = 0
+        try:
+            while not self._stop.is_set() and model.running and (self.steps is None or taken < self.steps):
+                start = time.perf_counter()
+                model.step()
+                taken += 1
+                frame = self.encoder.encode()
+                loop.call_soon_threadsafe(self._publish, frame, dump(frame))
+                if self.interval:
+                    self._stop.wait(max(0.0, self.interval - (time.perf_counter() - start)))
+        finally:
+            loop.call_soon_threadsafe(self._finish)
+
+    # Lazo de eventos
+    def _publish(self, frame, payload):
+        apply_frame(self.view, frame)
+        self.frames += 1
+        self._keyframe = None
+        for client in self.clients:
+            self._enqueue(client, payload)
+
+    def _enqueue(self, client, payload):
+        queue = client.queue
+        if queue.qsize() >= client.queue_size:
+            while not queue.empty():
+                queue.get_nowait()
+                client.dropped += 1
+                self.dropped += 1
+            payload = self.keyframe()
+        queue.put_nowait(payload)
+
+    def keyframe(self):
+        if self._keyframe is None:
+            view = self.view
+            self._keyframe = dump({"type": "key", "tick": view["tick"], "agents": view["agents"], "light": view["light"]})
+        return self._keyframe
+
+    def _finish(self):
+        self.finished = True
+        end = dump({"type": "end", "tick": self.view["tick"]})
+        for client in self.clients:
+            client.queue.put_nowait(end)
+            client.queue.put_nowait(None)
+
+    async def _serve_client(self, reader, writer):
+        client = ClientStream(self.queue_size)
+        client.queue.put_nowait(self.keyframe())
+        if self.finished:
+            client.queue.put_nowait(dump({"type": "end", "tick": self.view["tick"]}))
+            client.queue.put_nowait(None)
+        self.clients.add(client)
+        try:
+            while (payload := await client.queue.get()) is not None:
+                writer.write(payload)
+                await writer.drain()  # Un cliente lento solo frena su propia cola
+                client.sent += 1
+                self.sent += 1
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    def stats(self):
+        return {"frames": self.frames, "clients": len(self.clients), "sent": self.sent, "dropped": self.dropped}
+
+
+# ------------------------ Cliente ------------------------
+async def watch(host, port, limit=2 ** 24):
+    """
+    Se conecta a un SimulationServer y produce (cuadro, vista) por cada cuadro recibido, donde la vista es
+    el estado reconstruido con apply_frame. Termina con el cuadro "end". `limit` es el largo máximo de una
+    línea: un cuadro "key" crece con el número de agentes.
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=limit)
+    view = {"tick": None, "agents": {}, "light": None}
+    try:
+        async for line in reader:
+            frame = json.loads(line)
+            if frame["type"] == "end":
+                return
+            yield frame, apply_frame(view, frame)
+    finally:
+        writer.close()
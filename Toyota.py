@@ -1,8 +1,6 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
-from mesa.time import SimultaneousActivation
-import random
-from Vehicle import Vehicle
+from mesa import Agent
+import numpy as np
+from AgentStore import Column, EnumColumn, PositionColumn
 
 
 # ------------------------ Agente Toyota Trueno: Speedster ------------------------
@@ -10,9 +8,18 @@ class ToyotaTrueno(Agent):
     """
     Este es el agente Toyota Trueno: Speedster, diseñado para recorrer la ciudad 
     con el mayor número de giros o de forma eficiente dependiendo de su estado.
+    Sus atributos escalares se guardan en el AgentStore del modelo.
     """
+    __slots__ = ("_table", "_row", "path")
+    state = EnumColumn(counted=True)
+    speed = Column(np.int16)
+    target = PositionColumn()
+    glory_loop = Column(bool)
+    decision = EnumColumn()
+
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
+        model.agent_store.attach(self)
         self.state = "feliz"  # Estados: feliz (default), enojado
         self.speed = 1  # Velocidad base
         self.target = None
@@ -25,6 +32,19 @@ class ToyotaTrueno(Agent):
         self.make_decision()
         self.act()
 
+    def advance(self):
+        self.model.settle_move(self)
+
+    def wake_delay(self):
+        """
+        Para EventScheduler: feliz, sin objetivo, con una ruta ya planeada y fuera de una glorieta no vuelve
+        a moverse ni a planear, así que duerme hasta que cambie su celda.
+        """
+        if self.state == "feliz" and self.target is None and self.path and not self.glory_loop \
+                and not self.is_in_roundabout():
+            return None
+        return 1
+
     # Componente Reactivo
     def perceive_environment(self):
         """Evalúa el entorno inmediato y su posición."""
@@ -40,17 +60,11 @@ class ToyotaTrueno(Agent):
 
     def is_in_roundabout(self):
         """Detecta si el vehículo está en una glorieta."""
-        from interaccion_agentes import Street
-        x, y = self.pos
-        return self.model.grid.get_cell_list_contents((x, y)) and isinstance(
-            self.model.grid.get_cell_list_contents((x, y))[0], Street
-        )
+        return self.model.road_map.is_roundabout(self.pos)
 
     def is_obstructed(self):
         """Evalúa si el camino está bloqueado."""
-        x, y = self.pos
-        neighbors = self.model.grid.get_neighbors((x, y), moore=False, include_center=False)
-        return any(isinstance(neighbor, Vehicle) for neighbor in neighbors)
+        return self.model.perception.at(self.pos).has_vehicle
 
     # Componente Deliberativo
     def make_decision(self):
@@ -69,14 +83,9 @@ class ToyotaTrueno(Agent):
 
     def plan_route_with_turns(self):
         """Planea una ruta que maximice los giros."""
-        grid_width, grid_height = self.model.grid.width, self.model.grid.height
-        all_positions = [(x, y) for x in range(grid_width) for y in range(grid_height)]
-        self.path = sorted(
-            all_positions,
-            key=lambda pos: abs(pos[0] - self.pos[0]) + abs(pos[1] - self.pos[1]),
-            reverse=True,
-        )  # Ruta que incluye más cambios de dirección
-        self.target = self.path.pop(0)
+        # Ruta que incluye más cambios de dirección: de la celda más lejana a la más cercana
+        self.path = self.model.router.route(self.pos, None, "max-turns")
+        self.target = self.path.popleft()
 
     def plan_fastest_route(self):
         """Planea la ruta más rápida de un extremo al otro."""
@@ -112,10 +121,10 @@ class ToyotaTrueno(Agent):
         elif y > dest_y:
             y -= self.speed
 
-        self.model.grid.move_agent(self, (x, y))
+        self.model.move_agent(self, (x, y), self.reach_target if (x, y) == destination else None)
 
-        # Cambia de estado si llega a su destino
-        if (x, y) == destination:
-            self.target = None
-            if self.state == "enojado":
-                self.state = "feliz"
\ No newline at end of file
+    def reach_target(self):
+        """Cambia de estado si llega a su destino."""
+        self.target = None
+        if self.state == "enojado":
+            self.state = "feliz"
\ No newline at end of file
@@ -1,53 +1,128 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
-from mesa.time import SimultaneousActivation
-import random
+from mesa import Agent
+import heapq
 
 # ------------------------ Agente semaforo ------------------------
 
 class TrafficLight(Agent):
     """
     Este es nuestro agente semaforo, el cual recibe la informacion del auto mas proximo a llegar y da una secuencia de luces para que los vehiculos pasen.
+    Los vehiculos esperan en una cola de prioridad por direccion, ordenada por tiempo de arribo.
     """
-    def __init__(self, unique_id, model):
+    def __init__(self, unique_id, model, saturation_threshold=5, saturation_discharge=2):
         super().__init__(unique_id, model)
         self.state = "yellow"
         self.color = "yellow"
-        self.waiting_vehicles = []
         self.light_cycle = ["north", "south", "east", "west"]
         self.cycle_index = 0
         self.saturated = False
+        self.saturation_threshold = saturation_threshold  # Vehiculos en espera a partir de los cuales se satura
+        self.saturation_discharge = saturation_discharge  # Vehiculos que pasan en cada verde cuando esta saturado
+
+        # Un heap por direccion con entradas (arrival_time, turno, tick de llegada, vehiculo)
+        self.queues = {direction: [] for direction in self.light_cycle}
+        self.queued = {}  # vehiculo -> turno de su entrada vigente; las demas entradas se descartan al salir del heap
+        self._next_turn = 0  # Desempate de llegadas simultáneas
+
+        # Estadisticas
+        self.max_queue_length = 0
+        self.served = 0
+        self.total_wait = 0
+        self.max_wait = 0
+
+    @property
+    def queue_length(self):
+        return len(self.queued)
 
     def recibir_mensaje(self, vehicle):
-        self.waiting_vehicles.append((vehicle, vehicle.arrival_time))
-        if len(self.waiting_vehicles) > 5:
+        turn = self._next_turn
+        self._next_turn += 1
+        heapq.heappush(self.queues[vehicle.destination], (vehicle.arrival_time, turn, self.model.schedule.steps, vehicle))
+        self.queued[vehicle] = turn
+        self.model.wake(self)
+        self.max_queue_length = max(self.max_queue_length, self.queue_length)
+        if self.queue_length > self.saturation_threshold:
             self.saturated = True
 
+    def notificar_salida(self, vehicle):
+        """El vehiculo salio de la cuadricula; su entrada se descarta cuando llegue al frente de la cola."""
+        self.queued.pop(vehicle, None)
+
+    def _head(self, direction):
+        """Devuelve la primera entrada vigente de la cola de una direccion, descartando las que ya no lo son."""
+        queue = self.queues[direction]
+        while queue and self.queued.get(queue[0][3]) != queue[0][1]:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def _serve(self, direction):
+        arrival_time, turn, tick, vehicle = heapq.heappop(self.queues[direction])
+        del self.queued[vehicle]
+        wait = self.model.schedule.steps - tick
+        self.served += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return vehicle
+
     def make_decision(self):
         """
         Toma la decisión sobre el estado del semáforo según la información de los vehículos cercanos.
         """
-        if not self.waiting_vehicles:
+        heads = [(head, direction) for direction in self.light_cycle if (head := self._head(direction)) is not None]
+        if not heads:
             # Si no hay vehículos cercanos, luz amarilla
             self.state = "yellow"
             self.color = "yellow"
+            self.saturated = False
             return
 
-        # Identificar el vehículo más cercano (menor tiempo de arribo)
-        nearest_vehicle, _ = min(self.waiting_vehicles, key=lambda x: x[1])
-        
         if self.saturated:
-            # Si el semáforo está saturado, alterna entre rojo y verde
+            # Si el semáforo está saturado, alterna entre rojo y verde; en cada verde pasa un grupo
+            # acotado de vehículos de la siguiente dirección con espera, de forma rotativa
             self.state = "green" if self.state == "red" else "red"
             self.color = self.state
-            self.cycle_index = (self.cycle_index + 1) % len(self.light_cycle)
+            if self.state == "green":
+                waiting = {direction for _, direction in heads}
+                for offset in range(1, len(self.light_cycle) + 1):
+                    index = (self.cycle_index + offset) % len(self.light_cycle)
+                    if self.light_cycle[index] in waiting:
+                        self.cycle_index = index
+                        break
+                direction = self.light_cycle[self.cycle_index]
+                for _ in range(self.saturation_discharge):
+                    if self._head(direction) is None:
+                        break
+                    self._serve(direction)
+                if self.queue_length <= self.saturation_threshold:
+                    self.saturated = False
         else:
-            # Dar luz verde al vehículo más cercano y establecer el programa de luces
+            # Identificar el vehículo más cercano (menor tiempo de arribo) y darle luz verde
+            _, direction = min(heads, key=lambda head: head[0][:2])
             self.state = "green"
             self.color = "green"
-            self.cycle_index = self.light_cycle.index(nearest_vehicle.destination)
-            # Eliminar el vehículo procesado de la lista
-            self.waiting_vehicles.remove((nearest_vehicle, nearest_vehicle.arrival_time))
+            self.cycle_index = self.light_cycle.index(direction)
+            # Eliminar el vehículo procesado de la cola
+            self._serve(direction)
+
+    def wait_stats(self):
+        """Longitud de la cola y estadísticas de espera (en pasos) de los vehículos atendidos."""
+        return {
+            "queue_length": self.queue_length,
+            "max_queue_length": self.max_queue_length,
+            "queue_by_direction": {
+                direction: sum(self.queued.get(entry[3]) == entry[1] for entry in queue)
+                for direction, queue in self.queues.items()
+            },
+            "served": self.served,
+            "mean_wait": self.total_wait / self.served if self.served else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    def wake_delay(self):
+        """Para EventScheduler: en amarillo y sin vehículos en espera duerme hasta recibir un mensaje."""
+        if self.state == "yellow" and not self.saturated and not any(
+                self._head(direction) is not None for direction in self.light_cycle):
+            return None
+        return 1
 
     def step(self):
         """
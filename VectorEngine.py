@@ -0,0 +1,370 @@
+import numpy as np
+from Negotiation import DECISIONS
+from Vehicle import Vehicle
+from Microbus import Microbus
+from Toyota import ToyotaTrueno
+from Ferrari import FerrariF40
+
+
+# Vecinos de von Neumann en el mismo orden que devuelve grid.get_neighborhood
+NEIGHBOR_OFFSETS = np.array([(-1, 0), (0, -1), (0, 1), (1, 0)])
+
+# Direcciones que sigue un Vehicle después del semáforo (ver Vehicle.direccion)
+DIRECTIONS = ["north", "east", "west", "south"]
+DIRECTION_STEPS = np.array([(0, -1), (1, 0), (-1, 0), (0, 0)])  # "south" no tiene movimiento
+
+TOYOTA_STATES = ["feliz", "enojado"]
+FERRARI_STATES = ["normal", "ansioso/enojado"]
+
+
+def step_towards(pos, target, speed):
+    """Avanza cada eje un paso de `speed` hacia el objetivo, igual que move_towards (sin ajustar el toroide)."""
+    return pos + np.sign(target - pos) * speed[:, None]
+
+
+# ------------------------ Motor vectorizado ------------------------
+class VectorEngine:
+    """
+    Motor alternativo de IntersectionModel que guarda posiciones, velocidades, objetivos y estados
+    como arreglos de NumPy agrupados por tipo de agente y avanza a todos en una actualización por tipo.
+    Reproduce el orden del motor de objetos (negociación, vehículos, microbuses, speedsters, Ferraris
+    y semáforo), por lo que con la misma semilla genera trayectorias idénticas.
+    Se construye a partir de los agentes recién creados por el modelo; la cuadrícula y los objetos
+    solo se actualizan al llamar a sync(). La excepción son los estados, que se escriben en los objetos en
+    cuanto cambian para que los conteos por estado del AgentStore estén siempre al día.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.width, self.height = model.grid.width, model.grid.height
+        self.size = np.array([self.width, self.height])
+        self.cells = self.width * self.height
+        self.traffic_light = model.traffic_light
+        self.negotiation_manager = model.negotiation_manager
+        if not self.negotiation_manager.is_symmetric():
+            raise ValueError("El motor vectorizado requiere una matriz de recompensas simétrica")
+        self.light_cell = self.encode(np.array(self.traffic_light.pos))
+
+        agents = list(model.schedule.agents)
+        self.vehicles = [a for a in agents if isinstance(a, Vehicle)]
+        self.microbuses = [a for a in agents if isinstance(a, Microbus)]
+        self.speedsters = [a for a in agents if isinstance(a, ToyotaTrueno)]
+        self.ferraris = [a for a in agents if isinstance(a, FerrariF40)]
+
+        # Vehículos base
+        self.v_pos = self.positions(self.vehicles)
+        self.v_speed = np.array([a.speed for a in self.vehicles], dtype=np.int64)
+        self.v_target = np.array([(a.sem_x, a.sem_y) for a in self.vehicles], dtype=np.int64).reshape(-1, 2)
+        self.v_turning = np.array([a.at_turning_point for a in self.vehicles], dtype=bool)
+        self.v_direction = np.array([DIRECTIONS.index(a.destination) for a in self.vehicles], dtype=np.int64)
+        self.v_alive = np.ones(len(self.vehicles), dtype=bool)
+        self.v_decision = np.array([DECISIONS.index(a.decision) for a in self.vehicles], dtype=np.int64)
+
+        # Microbuses: el índice de la parada actual sustituye a la lista `route`
+        self.m_pos = self.positions(self.microbuses)
+        self.m_speed = np.array([a.speed for a in self.microbuses], dtype=np.int64)
+        self.m_stop = np.full(len(self.microbuses), -1, dtype=np.int64)  # -1: sin destino
+        self.m_decision = np.array([DECISIONS.index(a.decision) for a in self.microbuses], dtype=np.int64)
+        self.stops = np.array([(self.width // 2, self.height - 1), (0, self.height // 2), (self.width - 1, 0)])
+
+        # Speedsters: solo importa cuántas posiciones quedan en `path`
+        self.t_pos = self.positions(self.speedsters)
+        self.t_speed = np.array([a.speed for a in self.speedsters], dtype=np.int64)
+        self.t_target = np.zeros((len(self.speedsters), 2), dtype=np.int64)
+        self.t_has_target = np.zeros(len(self.speedsters), dtype=bool)
+        self.t_path_len = np.zeros(len(self.speedsters), dtype=np.int64)
+        self.t_state = np.array([TOYOTA_STATES.index(a.state) for a in self.speedsters], dtype=np.int64)
+        self.t_decision = np.array([DECISIONS.index(a.decision) for a in self.speedsters], dtype=np.int64)
+
+        # Ferraris: la ruta es el recorrido de todas las celdas menos la inicial, guardado como un cursor
+        self.f_pos = self.positions(self.ferraris)
+        self.f_speed = np.array([a.speed for a in self.ferraris], dtype=np.int64)
+        self.f_target = np.zeros((len(self.ferraris), 2), dtype=np.int64)
+        self.f_has_target = np.zeros(len(self.ferraris), dtype=bool)
+        self.f_path_start = np.zeros(len(self.ferraris), dtype=np.int64)
+        self.f_path_next = np.full(len(self.ferraris), self.cells, dtype=np.int64)  # cells: ruta vacía
+        self.f_state = np.array([FERRARI_STATES.index(a.state) for a in self.ferraris], dtype=np.int64)
+        self.f_decision = np.array([DECISIONS.index(a.decision) for a in self.ferraris], dtype=np.int64)
+        # Últimas celdas de cada Ferrari, como recent_positions: un anillo de FerrariF40.memory códigos (-1: vacío)
+        self.f_recent = np.full((len(self.ferraris), FerrariF40.memory), -1, dtype=np.int64)
+        self.f_recent_count = np.zeros(len(self.ferraris), dtype=np.int64)
+        self.f_anxious_steps = np.array([a.anxious_steps for a in self.ferraris], dtype=np.int64)
+
+    @staticmethod
+    def positions(agents):
+        return np.array([a.pos for a in agents], dtype=np.int64).reshape(-1, 2)
+
+    def encode(self, pos):
+        """Convierte posiciones (x, y) al índice de celda en el orden de coord_iter."""
+        return pos[..., 0] * self.height + pos[..., 1]
+
+    def decode(self, cell):
+        return np.stack([cell // self.height, cell % self.height], axis=-1)
+
+    def wrap(self, pos):
+        return pos % self.size
+
+    @staticmethod
+    def set_state(agents, states, names, idx, value):
+        """Pone el estado `value` a los agentes `idx` y lo copia a los objetos de los que cambiaron."""
+        changed = idx[states[idx] != value]
+        states[changed] = value
+        for i in changed.tolist():
+            agents[i].state = names[value]
+
+    def occupancy(self, ferraris_pos):
+        """Cuenta los agentes de cada celda (el semáforo incluido)."""
+        cells = np.concatenate([
+            self.encode(self.v_pos[self.v_alive]),
+            self.encode(self.m_pos),
+            self.encode(self.t_pos),
+            self.encode(ferraris_pos),
+            [self.light_cell],
+        ])
+        return np.bincount(cells, minlength=self.cells)
+
+    def step(self):
+        self.negotiate()
+        self.step_vehicles()
+        self.step_microbuses()
+        self.step_speedsters()
+        self.step_ferraris()
+        self.traffic_light.step()
+        self.model.schedule.steps += 1
+        self.model.schedule.time += 1
+        self.model._advance_time()
+
+    # Negociación
+    def negotiate(self):
+        """
+        Mismo resultado que NegotiationManager.negotiate sobre los agentes que comparten celda, sin formar
+        los pares: con una matriz simétrica, lo que gana un agente solo depende de cuántos agentes de su
+        celda tomaron cada decisión, así que basta contar las decisiones por celda.
+        """
+        alive = np.flatnonzero(self.v_alive)
+        groups = [  # (agentes, índice de cada fila en la lista de agentes, celdas, decisiones)
+            (self.vehicles, alive, self.encode(self.v_pos[alive]), self.v_decision[alive]),
+            (self.microbuses, None, self.encode(self.m_pos), self.m_decision),
+            (self.speedsters, None, self.encode(self.t_pos), self.t_decision),
+            (self.ferraris, None, self.encode(self.f_pos), self.f_decision),
+        ]
+        # El semáforo ocupa su celda sin decisión
+        cells = np.concatenate([cells for _, _, cells, _ in groups] + [[self.light_cell]])
+        codes = np.concatenate([codes for _, _, _, codes in groups] + [[0]])
+        counts = np.bincount(cells, minlength=self.cells)
+        crowded = counts[counts >= 2]
+        manager = self.negotiation_manager
+        manager.pairs += int((crowded * (crowded - 1) // 2).sum())
+
+        # Solo los agentes con decisión se resuelven; suelen ser pocos, así que se agrupan por celda con unique
+        with_decision = np.flatnonzero(codes > 0)
+        decided_cells, cell_of, decided = np.unique(cells[with_decision], return_inverse=True, return_counts=True)
+        manager.resolved += int((decided * (decided - 1) // 2).sum())
+        selected = with_decision[decided[cell_of] >= 2]
+        if not len(selected):
+            return
+
+        # Lo que gana un agente con decisión d contra los demás agentes de su celda que decidieron
+        table = manager.payoffs[..., 0]
+        by_decision = np.zeros((len(decided_cells), len(DECISIONS)))
+        np.add.at(by_decision, (cell_of, codes[with_decision]), 1)
+        rewards = by_decision @ table.T - np.diag(table)
+        rewards = rewards[cell_of, codes[with_decision]][decided[cell_of] >= 2]
+
+        start = 0
+        for agents, index, group_cells, _ in groups:
+            end = start + len(group_cells)
+            in_group = (selected >= start) & (selected < end)
+            members = selected[in_group] - start
+            if index is not None:
+                members = index[members]
+            manager.record([agents[i] for i in members], rewards[in_group].tolist())
+            start = end
+
+    # Vehículos base
+    def step_vehicles(self):
+        moving = np.flatnonzero(self.v_alive & ~self.v_turning)
+        turning = np.flatnonzero(self.v_alive & self.v_turning)
+
+        new_pos = step_towards(self.v_pos[moving], self.v_target[moving], self.v_speed[moving])
+        arrived = moving[(new_pos == self.v_target[moving]).all(axis=1)]
+        self.v_pos[moving] = self.wrap(new_pos)
+
+        steps = DIRECTION_STEPS[self.v_direction[turning]] * self.v_speed[turning][:, None]
+        self.v_pos[turning] = self.wrap(self.v_pos[turning] + steps)
+
+        self.v_turning[arrived] = True
+        x, y = self.v_pos[:, 0], self.v_pos[:, 1]
+        leaving = ((self.v_direction == 0) & (y == 0)) | \
+                  ((self.v_direction == 1) & (x == self.width - 1)) | \
+                  ((self.v_direction == 2) & (x == 0))
+        leaving &= self.v_alive
+
+        # Avisos al semáforo en el orden de los agentes, como en Vehicle.step (la cola máxima depende del orden)
+        is_arrival = np.zeros(len(self.vehicles), dtype=bool)
+        is_arrival[arrived] = True
+        for i in np.flatnonzero(is_arrival | leaving):
+            vehicle = self.vehicles[i]
+            if is_arrival[i]:
+                # Igual que Vehicle.move: al llegar al semáforo la distancia es 0
+                vehicle.at_turning_point = True
+                vehicle.arrival_time = 0
+                self.traffic_light.recibir_mensaje(vehicle)
+                vehicle.make_decision()
+                self.v_decision[i] = DECISIONS.index(vehicle.decision)
+            if leaving[i]:
+                self.traffic_light.notificar_salida(vehicle)
+        self.v_alive &= ~leaving
+        self.model.exited += int(np.count_nonzero(leaving))
+
+    # Microbuses
+    def step_microbuses(self):
+        # Sin ruta pendiente se vuelve a planear (Microbus.plan_route)
+        self.m_stop[(self.m_stop == -1) | (self.m_stop == 2)] = 0
+        self.m_decision[:] = 1
+
+        moving = np.flatnonzero(self.m_stop >= 0)
+        target = self.stops[self.m_stop[moving]]
+        new_pos = step_towards(self.m_pos[moving], target, self.m_speed[moving])
+        arrived = moving[(new_pos == target).all(axis=1)]
+        self.m_pos[moving] = self.wrap(new_pos)
+        self.m_stop[arrived] = np.where(self.m_stop[arrived] < 2, self.m_stop[arrived] + 1, -1)
+
+    # Speedsters
+    def plan_speedsters(self, idx):
+        happy = idx[self.t_state[idx] == 0]
+        angry = idx[self.t_state[idx] == 1]
+
+        # plan_route_with_turns: la celda más lejana es siempre una esquina y el orden estable
+        # de sorted desempata por el orden de coord_iter
+        corners = np.array([(0, 0), (0, self.height - 1), (self.width - 1, 0), (self.width - 1, self.height - 1)])
+        distance = np.abs(corners[None, :, :] - self.t_pos[happy][:, None, :]).sum(axis=2)
+        self.t_target[happy] = corners[distance.argmax(axis=1)]
+        self.t_has_target[happy] = True
+        self.t_decision[happy] = 1
+        self.t_path_len[happy] = self.cells - 1
+
+        # plan_fastest_route
+        x = self.t_pos[angry, 0]
+        self.t_target[angry, 0] = np.where(x < self.width // 2, self.width - 1, 0)
+        self.t_target[angry, 1] = self.t_pos[angry, 1]
+        self.t_has_target[angry] = True
+        self.t_decision[angry] = 2
+
+    def step_speedsters(self):
+        angry = np.flatnonzero(self.t_state == 1)
+        if len(angry):
+            vehicles = np.zeros(self.cells, dtype=bool)
+            vehicles[self.encode(self.v_pos[self.v_alive])] = True
+            neighbors = self.wrap(self.t_pos[angry][:, None, :] + NEIGHBOR_OFFSETS)
+            obstructed = vehicles[self.encode(neighbors)].any(axis=1)
+            self.set_state(self.speedsters, self.t_state, TOYOTA_STATES, angry[~obstructed], 0)
+
+        self.plan_speedsters(np.flatnonzero(self.t_path_len == 0))
+
+        moving = np.flatnonzero(self.t_has_target)
+        new_pos = step_towards(self.t_pos[moving], self.t_target[moving], self.t_speed[moving])
+        arrived = moving[(new_pos == self.t_target[moving]).all(axis=1)]
+        self.t_pos[moving] = self.wrap(new_pos)
+        self.t_has_target[arrived] = False
+        self.set_state(self.speedsters, self.t_state, TOYOTA_STATES, arrived, 0)
+
+    # Ferraris
+    def pop_path(self, idx):
+        """Toma la siguiente celda de la ruta como objetivo, como path.pop(0)."""
+        has_next = self.f_path_next[idx] < self.cells
+        popping, ending = idx[has_next], idx[~has_next]
+        self.f_target[popping] = self.decode(self.f_path_next[popping])
+        self.f_has_target[popping] = True
+        self.f_has_target[ending] = False
+        following = self.f_path_next[popping] + 1
+        following += following == self.f_path_start[popping]
+        self.f_path_next[popping] = following
+
+    def plan_ferraris(self, idx):
+        """FerrariF40.plan_route: todas las celdas menos la actual, en el orden de coord_iter."""
+        start = self.encode(self.f_pos[idx])
+        self.f_path_start[idx] = start
+        self.f_path_next[idx] = (start == 0).astype(np.int64)
+        self.pop_path(idx)
+
+    def find_alternate_route(self, i, counts):
+        """Elige la primera celda vecina vacía como nuevo objetivo."""
+        for pos in self.wrap(self.f_pos[i] + NEIGHBOR_OFFSETS):
+            if counts[self.encode(pos)] == 0:
+                self.f_target[i] = pos
+                self.f_has_target[i] = True
+                break
+
+    def step_ferraris(self):
+        # FerrariF40.perceive_environment: los ansiosos se calman tras calm_after pasos, los normales
+        # se ponen ansiosos al volver a una celda reciente
+        anxious = np.flatnonzero(self.f_state == 1)
+        self.f_anxious_steps[anxious] += 1
+        calmed = anxious[self.f_anxious_steps[anxious] >= FerrariF40.calm_after]
+        normal = np.flatnonzero(self.f_state == 0)
+        cells = self.encode(self.f_pos[normal])
+        revisited = (self.f_recent[normal] == cells[:, None]).any(axis=1)
+        fresh = normal[~revisited]
+        self.f_recent[fresh, self.f_recent_count[fresh] % FerrariF40.memory] = cells[~revisited]
+        self.f_recent_count[fresh] += 1
+        self.set_state(self.ferraris, self.f_state, FERRARI_STATES, normal[revisited], 1)
+        self.f_recent[normal[revisited]] = -1
+        self.f_anxious_steps[normal[revisited]] = 0
+        self.set_state(self.ferraris, self.f_state, FERRARI_STATES, calmed, 0)
+
+        self.plan_ferraris(np.flatnonzero(self.f_path_next >= self.cells))
+        self.f_decision[:] = np.where(self.f_state == 1, 2, 1)
+
+        anxious = np.flatnonzero(self.f_state == 1)
+        moving = np.flatnonzero(self.f_has_target)
+        old_pos = self.f_pos.copy()
+        if len(anxious):
+            # Las rutas alternativas dependen de quién ya se movió en este paso, así que
+            # los Ferraris se mueven en orden y se actualiza la ocupación entre uno y otro
+            counts = self.occupancy(old_pos)
+            anxious_set = set(anxious.tolist())
+            for i in range(len(self.ferraris)):
+                if i in anxious_set:
+                    self.find_alternate_route(i, counts)
+                if self.f_has_target[i]:
+                    new = self.f_pos[i] + np.sign(self.f_target[i] - self.f_pos[i]) * self.f_speed[i]
+                    counts[self.encode(self.f_pos[i])] -= 1
+                    counts[self.encode(self.wrap(new))] += 1
+            moving = np.flatnonzero(self.f_has_target)
+
+        new_pos = step_towards(old_pos[moving], self.f_target[moving], self.f_speed[moving])
+        arrived = moving[(new_pos == self.f_target[moving]).all(axis=1)]
+        self.f_pos[moving] = self.wrap(new_pos)
+        self.pop_path(arrived)
+
+    # Sincronización con los objetos
+    def sync(self):
+        """Copia posiciones y estados a los agentes y a la cuadrícula; retira los vehículos que salieron."""
+        grid, schedule = self.model.grid, self.model.schedule
+        for agents, positions in ((self.vehicles, self.v_pos), (self.microbuses, self.m_pos),
+                                  (self.speedsters, self.t_pos), (self.ferraris, self.f_pos)):
+            for agent, pos in zip(agents, positions.tolist()):
+                pos = tuple(pos)
+                if agent.pos is not None and agent.pos != pos:
+                    grid.move_agent(agent, pos)
+
+        for i in np.flatnonzero(~self.v_alive):
+            vehicle = self.vehicles[i]
+            if vehicle.pos is not None:
+                grid.remove_agent(vehicle)
+                schedule.remove(vehicle)
+                self.model.agent_store.detach(vehicle)
+
+        for agent, state, decision, has_target, target in zip(
+                self.speedsters, self.t_state, self.t_decision, self.t_has_target, self.t_target):
+            agent.state = TOYOTA_STATES[state]
+            agent.decision = DECISIONS[decision]
+            agent.target = tuple(target.tolist()) if has_target else None
+        for agent, state, decision, has_target, target in zip(
+                self.ferraris, self.f_state, self.f_decision, self.f_has_target, self.f_target):
+            agent.state = FERRARI_STATES[state]
+            agent.decision = DECISIONS[decision]
+            agent.current_target = tuple(target.tolist()) if has_target else None
+        for agent, stop, decision in zip(self.microbuses, self.m_stop, self.m_decision):
+            agent.destination = tuple(self.stops[stop].tolist()) if stop >= 0 else None
+            agent.decision = DECISIONS[decision]
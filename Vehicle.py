@@ -1,15 +1,31 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
-from mesa.time import SimultaneousActivation
-import random
+from mesa import Agent
+import numpy as np
+from AgentStore import Column, EnumColumn, OptionalIntColumn
 
 # ------------------------ Agente base ------------------------
 class Vehicle(Agent):
     """
     Este es nuestro agente de vehiculo base, el cual comienza en posiciones aleatorias entre el norte, sur, este y oeste. Se dirige hacia el semaforo y le avisa si esta proximo a llegar.
+    Sus atributos se guardan en el AgentStore del modelo.
     """
+    __slots__ = ("_table", "_row")
+    destination = EnumColumn()
+    state = EnumColumn(counted=True)
+    arrival_time = OptionalIntColumn()
+    speed = Column(np.int16)
+    at_turning_point = Column(bool)
+    sem_x = Column(np.int32)
+    sem_y = Column(np.int32)
+    decision = EnumColumn()
+
     def __init__(self, unique_id, model, destination, state="neutral"):
         super().__init__(unique_id, model)
+        model.agent_store.attach(self)
+        self.reset(destination, state)
+
+    def reset(self, destination, state="neutral"):
+        """Deja el vehículo como recién creado; VehiclePool lo usa al reutilizarlo."""
+        model = self.model
         self.destination = destination
         self.state = state
         self.arrival_time = None
@@ -20,11 +36,20 @@ class Vehicle(Agent):
         self.decision = None
 
     def step(self):
+        # Después de moverse revisa si llegó al semáforo o a su salida (arrive y destino)
         if not self.at_turning_point:
             self.move()
         else:
             self.direccion()
-        self.destino()
+
+    def advance(self):
+        self.model.settle_move(self)
+
+    def wake_delay(self):
+        """Para EventScheduler: None si ya no se puede mover (destino sin dirección de salida), 1 si sigue activo."""
+        if self.at_turning_point and self.destination not in ("north", "east", "west"):
+            return None
+        return 1
 
     def move(self):
         x, y = self.pos
@@ -38,23 +63,24 @@ class Vehicle(Agent):
         elif y > self.sem_y:
             y -= self.speed
 
-        self.model.grid.move_agent(self, (x, y))
+        self.model.move_agent(self, (x, y), self.arrive)
 
-        if (x, y) == (self.sem_x, self.sem_y):
+    def arrive(self):
+        if self.pos == (self.sem_x, self.sem_y):
             self.at_turning_point = True
             self.avisar_aproximacion()
             self.model.traffic_light.recibir_mensaje(self)
 
             self.make_decision()
-
+        self.destino()
 
     def direccion(self):
         if self.destination == "north":
-            self.model.grid.move_agent(self, (self.pos[0], self.pos[1] - self.speed))
+            self.model.move_agent(self, (self.pos[0], self.pos[1] - self.speed), self.destino)
         elif self.destination == "east":
-            self.model.grid.move_agent(self, (self.pos[0] + self.speed, self.pos[1]))
+            self.model.move_agent(self, (self.pos[0] + self.speed, self.pos[1]), self.destino)
         elif self.destination == "west":
-            self.model.grid.move_agent(self, (self.pos[0] - self.speed, self.pos[1]))
+            self.model.move_agent(self, (self.pos[0] - self.speed, self.pos[1]), self.destino)
 
     def avisar_aproximacion(self):
         distance = abs(self.pos[1] - self.sem_y) + abs(self.pos[0] - self.sem_x)
@@ -64,8 +90,10 @@ class Vehicle(Agent):
         if (self.destination == "north" and self.pos[1] == 0) or \
            (self.destination == "east" and self.pos[0] == self.model.grid.width - 1) or \
            (self.destination == "west" and self.pos[0] == 0):
-            self.model.grid.remove_agent(self)
-            self.model.schedule.remove(self)
+            exit_pos = self.pos
+            self.model.traffic_light.notificar_salida(self)
+            self.model.retire(self)
+            self.model.departures.append((self.unique_id, self.destination, self.state, exit_pos))
     
     def make_decision(self):
         if self.state == "calmado":
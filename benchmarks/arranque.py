@@ -0,0 +1,89 @@
+"""
+Benchmark de arranque: tiempo de importación en frío del núcleo de la simulación en un intérprete nuevo,
+desglosado por paquete con -X importtime, y tiempo hasta que un trabajador "spawn" tiene el núcleo cargado.
+También comprueba que el núcleo sin interfaz no carga bibliotecas de gráficas.
+
+    python -m benchmarks.arranque --repetitions 5
+"""
+import argparse
+import importlib
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Módulos que importa un trabajador sin interfaz
+HEADLESS_MODULES = ("interaccion_agentes", "interaccion_batch_agentes", "Network")
+# Paquetes de gráficas que el núcleo no debe cargar
+PLOTTING_PACKAGES = ("matplotlib", "PIL", "solara")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_MODULES = {name[:-3] for name in os.listdir(ROOT) if name.endswith(".py")}
+
+
+def import_profile(module):
+    """Importa `module` en un intérprete nuevo; devuelve (segundos de pared, microsegundos por paquete, gráficas cargadas)."""
+    code = (f"import sys, {module}; "
+            f"print(','.join(p for p in {PLOTTING_PACKAGES!r} if p in sys.modules))")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    by_package = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        root = name.strip().split(".")[0]
+        group = "proyecto" if root in PROJECT_MODULES else root
+        by_package[group] = by_package.get(group, 0) + int(own)
+    plotting = [name for name in result.stdout.strip().split(",") if name]
+    return elapsed, by_package, plotting
+
+
+def interpreter_startup():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def load_core():
+    """Tarea del trabajador: importa el núcleo como lo haría run_simulation."""
+    importlib.import_module("interaccion_batch_agentes")
+    return os.getpid()
+
+
+def spawn_worker():
+    """Segundos desde crear un pool "spawn" de un proceso hasta que su trabajador tiene el núcleo importado."""
+    start = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        pool.apply(load_core)
+        return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Paquetes a mostrar en el desglose")
+    args = parser.parse_args(argv)
+
+    startup = statistics.median(interpreter_startup() for _ in range(args.repetitions))
+    print(f"Intérprete vacío: {startup * 1000:.1f} ms")
+    for module in HEADLESS_MODULES:
+        runs = [import_profile(module) for _ in range(args.repetitions)]
+        wall = statistics.median(elapsed for elapsed, _, _ in runs)
+        packages = {name: statistics.median(run[1].get(name, 0) for run in runs) for name in runs[0][1]}
+        total = sum(packages.values())
+        plotting = sorted({name for _, _, loaded in runs for name in loaded})
+        print(f"\nimport {module}: {wall * 1000:.1f} ms de pared, {total / 1000:.1f} ms importando; "
+              f"gráficas cargadas: {', '.join(plotting) or 'ninguna'}")
+        for name, own in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {name:<24}{own / 1000:>8.1f} ms {own / total:>6.1%}")
+
+    spawn = statistics.median(spawn_worker() for _ in range(args.repetitions))
+    print(f"\nTrabajador spawn con el núcleo cargado: {spawn * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark de escalado de IntersectionModel: pasos por segundo, percentiles de la latencia por paso,
+memoria máxima y tiempo en get_interacting_agents frente al planificador, por tamaño de cuadrícula
+y mezcla de agentes. Los resultados se guardan en JSON y se pueden comparar con una línea base.
+
+    python -m benchmarks.escalado --output escalado.json
+    python -m benchmarks.escalado --sizes 20,100 --baseline escalado.json --threshold 0.15
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from interaccion_agentes import IntersectionModel
+
+# Fracción de cada tipo de agente (vehículos, microbuses, ferraris, toyotas) y pasajeros por microbús
+MIXES = {
+    "vehiculos": ((0.7, 0.1, 0.1, 0.1), 0),
+    "microbuses": ((0.1, 0.6, 0.15, 0.15), 2),
+    "deportivos": ((0.1, 0.1, 0.4, 0.4), 0),
+}
+DEFAULT_SIZES = (20, 100, 300, 1000)
+# Métrica -> True si un valor mayor es mejor; son las que se comparan con la línea base
+COMPARED_METRICS = {"ticks_per_second": True, "latency_p90_ms": False, "peak_memory_mb": False}
+
+
+def agent_counts(size, mix, density):
+    fractions, passengers_per_microbus = MIXES[mix]
+    total = max(8, round(density * size * size))
+    counts = [round(total * fraction) for fraction in fractions]
+    return counts, counts[1] * passengers_per_microbus
+
+
+def build(size, mix, args):
+    counts, passengers = agent_counts(size, mix, args.density)
+    model = IntersectionModel(size, size, *counts, seed=args.seed, scheduler=args.scheduler,
+                              num_passengers=passengers, grid=args.grid, movement=args.movement)
+    return model, sum(counts) + passengers
+
+
+def timed(obj, name, totals):
+    """Reemplaza el método por uno que acumula su tiempo en totals[name]."""
+    original = getattr(obj, name)
+    totals[name] = 0.0
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            totals[name] += time.perf_counter() - start
+    setattr(obj, name, wrapper)
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_case(size, mix, args):
+    model, agents = build(size, mix, args)
+    for _ in range(args.warmup):
+        model.step()
+    phases = {}
+    timed(model, "get_interacting_agents", phases)
+    timed(model.schedule, "step", phases)
+    latencies = []
+    for _ in range(args.steps):
+        start = time.perf_counter()
+        model.step()
+        latencies.append(time.perf_counter() - start)
+    elapsed = sum(latencies)
+    latencies.sort()
+
+    # La memoria se mide en una corrida aparte: tracemalloc haría más lentos los pasos medidos
+    tracemalloc.start()
+    model, _ = build(size, mix, args)
+    for _ in range(args.memory_steps):
+        model.step()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "size": size,
+        "mix": mix,
+        "agents": agents,
+        "ticks_per_second": args.steps / elapsed,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p90_ms": percentile(latencies, 0.90) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_memory_mb": peak / 2 ** 20,
+        "interacting_ms_per_tick": phases["get_interacting_agents"] / args.steps * 1000,
+        "schedule_ms_per_tick": phases["step"] / args.steps * 1000,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Regresiones de `results` frente a `baseline`: (caso, métrica, valor base, valor actual)."""
+    previous = {(case["size"], case["mix"]): case for case in baseline["cases"]}
+    regressions = []
+    for case in results["cases"]:
+        base = previous.get((case["size"], case["mix"]))
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base[metric], case[metric]
+            worse = new < old * (1 - threshold) if higher_is_better else new > old * (1 + threshold)
+            if worse:
+                regressions.append((f"{case['size']}x{case['size']}/{case['mix']}", metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Lados de la cuadrícula, separados por comas")
+    parser.add_argument("--mixes", default=",".join(MIXES), help=f"Mezclas de agentes: {', '.join(MIXES)}")
+    parser.add_argument("--density", type=float, default=0.005, help="Agentes por celda (al menos 8 por caso)")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10, help="Pasos previos sin medir")
+    parser.add_argument("--memory-steps", type=int, default=5, help="Pasos de la corrida que mide la memoria")
+    parser.add_argument("--scheduler", choices=("simultaneous", "event"), default="simultaneous")
+    parser.add_argument("--grid", choices=("dense", "sparse"), default="dense")
+    parser.add_argument("--movement", choices=("immediate", "two-phase"), default="immediate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Resultados JSON previos con los que comparar")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Empeoramiento relativo tolerado")
+    args = parser.parse_args(argv)
+
+    mixes = args.mixes.split(",")
+    for mix in mixes:
+        if mix not in MIXES:
+            parser.error(f"Mezcla desconocida: {mix}")
+
+    results = {"settings": {key: value for key, value in vars(args).items()
+                            if key not in ("output", "baseline", "threshold")},
+               "cases": []}
+    print(f"{'caso':>20}{'agentes':>9}{'pasos/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+          f"{'MB':>8}{'interacc. ms':>14}{'planif. ms':>12}")
+    for size in map(int, args.sizes.split(",")):
+        for mix in mixes:
+            case = run_case(size, mix, args)
+            results["cases"].append(case)
+            print(f"{f'{size}x{size}/{mix}':>20}{case['agents']:>9}{case['ticks_per_second']:>10.1f}"
+                  f"{case['latency_p50_ms']:>9.2f}{case['latency_p90_ms']:>9.2f}{case['latency_p99_ms']:>9.2f}"
+                  f"{case['peak_memory_mb']:>8.1f}{case['interacting_ms_per_tick']:>14.3f}"
+                  f"{case['schedule_ms_per_tick']:>12.3f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"Regresión en {name}: {metric} pasó de {old:.3f} a {new:.3f}")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones mayores a {args.threshold:.0%} respecto a {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
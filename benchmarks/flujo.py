@@ -0,0 +1,45 @@
+"""
+Benchmark de flujo abierto: corrida larga con llegadas de Poisson por los cuatro accesos, que reporta
+vehículos activos, salidas por paso, objetos Vehicle creados y memoria asignada (tracemalloc).
+
+    python -m benchmarks.flujo --steps 200000 --rate 0.2 --every 20000
+"""
+import argparse
+import time
+import tracemalloc
+from Inflow import APPROACHES, PoissonInflow
+from Vehicle import Vehicle
+from interaccion_agentes import IntersectionModel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--rate", type=float, default=0.2, help="Vehículos por paso en cada acceso")
+    parser.add_argument("--steps", type=int, default=200000)
+    parser.add_argument("--every", type=int, default=20000, help="Pasos entre reportes")
+    parser.add_argument("--scheduler", choices=["simultaneous", "event"], default="simultaneous")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    inflow = PoissonInflow({approach: args.rate for approach in APPROACHES})
+    model = IntersectionModel(args.width, args.height, 0, 0, 0, 0, seed=args.seed, scheduler=args.scheduler,
+                              inflow=inflow)
+    tracemalloc.start()
+    exited = 0
+    start = time.perf_counter()
+    for tick in range(1, args.steps + 1):
+        model.step()
+        exited += len(model.departures)
+        if tick % args.every == 0:
+            active = sum(isinstance(agent, Vehicle) for agent in model.schedule.agents)
+            current, _ = tracemalloc.get_traced_memory()
+            print(f"paso {tick:>9}: {active:>5} activos, {exited / tick:.3f} salidas/paso, "
+                  f"{model.vehicle_pool.created} creados, {model.vehicle_pool.reused} reutilizados, "
+                  f"{current / 1024:.0f} KiB, {tick / (time.perf_counter() - start):.0f} pasos/s")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de memoria por agente: compara los agentes con sus atributos en el AgentStore
+contra la disposición anterior, con cada atributo en el __dict__ de la instancia. Los dos lados incluyen
+el objeto y su registro en el modelo de Mesa (una entrada de WeakKeyDictionary, unos 200 B por agente),
+que el AgentStore no toca; la diferencia entre columnas es lo que ahorra el almacén.
+
+Después corre el modelo con llegadas por los cuatro accesos (`--rate` por paso y acceso) y compara el
+máximo de vehículos simultáneos con las filas de la tabla de Vehicle: con las filas liberadas por
+VehiclePool y reutilizadas, la tabla no crece con los vehículos que salen.
+
+    python -m benchmarks.memoria --agents 10000
+    python -m benchmarks.memoria --steps 2000 --rate 0.3
+"""
+import argparse
+import tracemalloc
+from AgentStore import Column
+from Ferrari import FerrariF40
+from Inflow import APPROACHES, PoissonInflow
+from Microbus import Microbus
+from Toyota import ToyotaTrueno
+from Vehicle import Vehicle
+from interaccion_agentes import IntersectionModel
+
+AGENT_CLASSES = (Vehicle, Microbus, ToyotaTrueno, FerrariF40)
+
+
+def dict_backed(agent_class):
+    """Subclase que tapa las columnas con atributos de clase comunes, de modo que los valores vuelven al __dict__."""
+    shadowed = {
+        name: None
+        for klass in agent_class.__mro__
+        for name, attribute in vars(klass).items() if isinstance(attribute, Column)
+    }
+    return type(f"{agent_class.__name__}Dict", (agent_class,), shadowed)
+
+
+def create(agent_class, model, count):
+    if agent_class.__init__ is Vehicle.__init__:
+        return [agent_class(f"a{i}", model, "north") for i in range(count)]
+    return [agent_class(f"a{i}", model) for i in range(count)]
+
+
+def measure(agent_class, count):
+    """Bytes por agente asignados al crear `count` agentes en un modelo vacío."""
+    model = IntersectionModel(20, 20, 0, 0, 0, 0, seed=0)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    agents = create(agent_class, model, count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count, model.agent_store.nbytes() / count, len(agents)
+
+
+def churn(steps, rate, seed):
+    """Vehículos creados, máximo simultáneo en la cuadrícula y filas de la tabla de Vehicle tras `steps` pasos."""
+    model = IntersectionModel(40, 40, 0, 0, 0, 0, seed=seed,
+                              inflow=PoissonInflow({approach: rate for approach in APPROACHES}))
+    peak = 0
+    for _ in range(steps):
+        model.step()
+        peak = max(peak, sum(isinstance(agent, Vehicle) for agent in model.schedule.agents))
+    table = model.agent_store.tables[Vehicle]
+    return model.spawned, peak, table.size, table.rows()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--agents", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=1000, help="Pasos de la corrida con llegadas")
+    parser.add_argument("--rate", type=float, default=0.3, help="Llegadas por paso y acceso")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'clase':<14}{'__dict__ (B)':>14}{'store (B)':>12}{'arreglos (B)':>14}")
+    for agent_class in AGENT_CLASSES:
+        before, _, _ = measure(dict_backed(agent_class), args.agents)
+        after, arrays, _ = measure(agent_class, args.agents)
+        print(f"{agent_class.__name__:<14}{before:>14.1f}{after:>12.1f}{arrays:>14.1f}")
+
+    spawned, peak, size, rows = churn(args.steps, args.rate, args.seed)
+    print(f"\nllegadas: {spawned} vehículos, {peak} a la vez como máximo; "
+          f"tabla de Vehicle: {size} filas, {rows} en uso")
+
+
+if __name__ == "__main__":
+    main()
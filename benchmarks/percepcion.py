@@ -0,0 +1,112 @@
+"""
+Benchmark de la capa de percepción: cuenta las llamadas a la cuadrícula por paso con los
+vecindarios compartidos y sin ellos (cada agente consulta la cuadrícula como antes de la capa).
+
+Las llamadas cuentan igual en las dos variantes; el tiempo es el del paso completo, el mejor de `--repeat`
+corridas. La capa compartida no pide a la cuadrícula las celdas vacías (usa su índice de celdas ocupadas)
+y solo lee las vecinas ocupadas hasta encontrar un Vehicle.
+
+    python -m benchmarks.percepcion --width 30 --height 30 --agents 40 --steps 100
+    python -m benchmarks.percepcion --width 200 --height 200 --agents 500 --steps 40
+"""
+import argparse
+import time
+from collections import Counter
+from interaccion_agentes import IntersectionModel
+from Vehicle import Vehicle
+
+GRID_QUERIES = ("get_neighbors", "get_neighborhood", "is_cell_empty", "get_cell_list_contents", "contents_at")
+
+
+def count_grid_calls(grid, counter):
+    """Envuelve los métodos de consulta de la cuadrícula para contar sus llamadas."""
+    for name in GRID_QUERIES:
+        method = getattr(grid, name)
+
+        def counted(*args, _method=method, _name=name, **kwargs):
+            counter[_name] += 1
+            return _method(*args, **kwargs)
+
+        setattr(grid, name, counted)
+
+
+class DirectCell:
+    """Respuesta de DirectPerception: cada atributo repite las llamadas que hacía el agente."""
+    def __init__(self, grid, pos):
+        self.grid = grid
+        self.pos = pos
+
+    @property
+    def has_vehicle(self):
+        neighbors = self.grid.get_neighbors(self.pos, moore=False, include_center=False)
+        return any(isinstance(neighbor, Vehicle) for neighbor in neighbors)
+
+    @property
+    def empty_cells(self):
+        # Los agentes solo usan la primera celda vacía y dejaban de buscar al encontrarla
+        for pos in self.grid.get_neighborhood(self.pos, moore=False, include_center=False):
+            if self.grid.is_cell_empty(pos):
+                return [pos]
+        return []
+
+
+class DirectPerception:
+    """Sin compartir: cada consulta de cada agente va directo a la cuadrícula, como antes de PerceptionCache."""
+    def __init__(self, grid):
+        self.grid = grid
+        self.queries = 0
+
+    def at(self, pos):
+        self.queries += 1
+        return DirectCell(self.grid, pos)
+
+    def clear(self):
+        pass
+
+
+def run(args, shared):
+    n = args.agents
+    model = IntersectionModel(args.width, args.height, n, n, n, n, seed=args.seed)
+    if not shared:
+        model.perception = DirectPerception(model.grid)
+    calls = Counter()
+    count_grid_calls(model.grid, calls)
+
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        model.step()
+    elapsed = time.perf_counter() - start
+    perception = model.perception
+    if shared:
+        return calls, perception.hits + perception.misses, perception.misses, elapsed
+    return calls, perception.queries, perception.queries, elapsed
+
+
+def best_of(args, shared):
+    """Las corridas son idénticas salvo el tiempo: devuelve la primera con el menor tiempo de todas."""
+    runs = [run(args, shared) for _ in range(args.repeat)]
+    return (*runs[0][:3], min(elapsed for *_, elapsed in runs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, default=30)
+    parser.add_argument("--height", type=int, default=30)
+    parser.add_argument("--agents", type=int, default=40, help="Agentes de cada tipo")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas por variante; se toma la más rápida")
+    args = parser.parse_args(argv)
+
+    for label, shared in (("sin compartir", False), ("compartida", True)):
+        calls, queries, computed, elapsed = best_of(args, shared)
+        total = sum(calls.values())
+        detail = ", ".join(f"{name}={calls[name] / args.steps:.1f}" for name in GRID_QUERIES)
+        print(f"{label:>14}: {queries / args.steps:.1f} consultas/paso, "
+              f"{computed / args.steps:.1f} resúmenes nuevos/paso, "
+              f"{total / args.steps:.1f} llamadas a la cuadrícula/paso ({detail}), "
+              f"{elapsed / args.steps * 1000:.2f} ms/paso")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark del planificador: tiempo por paso y agentes activados por paso con SimultaneousActivation
+y con EventScheduler, que no activa a los agentes sin trabajo pendiente. Además del paso completo se mide
+la fase del planificador (schedule.step: los agentes y la cola de eventos), la única que cambia entre uno
+y otro; el resto del paso (negociación, llegadas) cuesta lo mismo con ambos.
+
+Escenarios:
+    mixto     `--agents` agentes de cada tipo; casi todos tienen trabajo en cada paso.
+    disperso  `--parked` speedsters que terminan su recorrido y se quedan quietos, más un goteo de
+              vehículos que llegan por los cuatro accesos (`--rate` por paso y acceso).
+
+    python -m benchmarks.planificador --width 200 --height 200 --agents 60 --steps 300
+    python -m benchmarks.planificador --scenario disperso --parked 400 --rate 0.1
+"""
+import argparse
+import time
+from interaccion_agentes import IntersectionModel
+from Inflow import APPROACHES, PoissonInflow
+
+SCENARIOS = ("mixto", "disperso")
+
+
+def build(args, scenario, scheduler):
+    n = args.agents
+    if scenario == "mixto":
+        return IntersectionModel(args.width, args.height, n, n, n, n, seed=args.seed, scheduler=scheduler)
+    inflow = PoissonInflow({approach: args.rate for approach in APPROACHES})
+    return IntersectionModel(args.width, args.height, 0, 0, 0, args.parked, seed=args.seed, scheduler=scheduler,
+                             inflow=inflow)
+
+
+def time_schedule(model):
+    """Envuelve schedule.step para acumular su tiempo; devuelve la lista con el total."""
+    step, spent = model.schedule.step, [0.0]
+
+    def timed():
+        start = time.perf_counter()
+        step()
+        spent[0] += time.perf_counter() - start
+
+    model.schedule.step = timed
+    return spent
+
+
+def run(args, scenario, scheduler):
+    """
+    Mejores tiempos de `--repeat` corridas (paso completo y fase del planificador) y activaciones por paso,
+    que son iguales en todas las corridas.
+    """
+    warmup = args.warmup
+    if warmup is None:
+        # En "disperso" los speedsters tardan hasta el ancho o el alto del mapa en llegar a su esquina
+        warmup = 50 if scenario == "mixto" else max(args.width, args.height) + 50
+    best = best_schedule = None
+    for _ in range(args.repeat):
+        model = build(args, scenario, scheduler)
+        for _ in range(warmup):
+            model.step()
+        activations = -model.schedule.activations if scheduler == "event" else 0
+        spent = time_schedule(model)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            if scheduler == "simultaneous":
+                activations += model.schedule.get_agent_count()
+            model.step()
+        elapsed = time.perf_counter() - start
+        if scheduler == "event":
+            activations += model.schedule.activations
+        best = elapsed if best is None else min(best, elapsed)
+        best_schedule = spent[0] if best_schedule is None else min(best_schedule, spent[0])
+    return best, best_schedule, activations, model.schedule.get_agent_count()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS + ("todos",), default="todos")
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--height", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=60, help="Agentes de cada tipo en el escenario mixto")
+    parser.add_argument("--parked", type=int, default=400, help="Speedsters quietos en el escenario disperso")
+    parser.add_argument("--rate", type=float, default=0.1, help="Llegadas por paso y acceso en el escenario disperso")
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=None,
+                        help="Pasos previos sin medir; por defecto 50 (mixto) o el lado del mapa + 50 (disperso)")
+    parser.add_argument("--repeat", type=int, default=3, help="Corridas por planificador; se toma la más rápida")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for scenario in SCENARIOS if args.scenario == "todos" else (args.scenario,):
+        results = {scheduler: run(args, scenario, scheduler) for scheduler in ("simultaneous", "event")}
+        print(f"{scenario}:")
+        for scheduler, (elapsed, schedule, activations, agents) in results.items():
+            print(f"  {scheduler:>12}: {elapsed / args.steps * 1000:.3f} ms/paso "
+                  f"({schedule / args.steps * 1000:.3f} en el planificador), "
+                  f"{activations / args.steps:.1f} activaciones/paso, {agents} agentes al final")
+        (baseline, baseline_schedule, *_), (event, event_schedule, *_) = results["simultaneous"], results["event"]
+        print(f"  {'ahorro':>12}: {(baseline - event) / args.steps * 1000:.3f} ms/paso "
+              f"({(baseline - event) / baseline:.0%}), "
+              f"{(baseline_schedule - event_schedule) / args.steps * 1000:.3f} en el planificador "
+              f"({(baseline_schedule - event_schedule) / baseline_schedule:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark de la red de intersecciones: pasos por segundo con distinto número de procesos y
+comprobación de que todas las corridas terminan en el mismo estado que la corrida en serie.
+
+La aceleración con varios procesos no está verificada: las mediciones del repositorio se tomaron en una
+máquina de un solo núcleo, donde los procesos solo se turnan. Lo que sí se comprueba en cada corrida es
+que el resultado sea idéntico; para medir la aceleración hay que correrlo en una máquina con varios núcleos.
+
+    python -m benchmarks.red --rows 16 --cols 16 --steps 100 --processes 1 2 4 8
+"""
+import argparse
+import os
+import time
+from Network import IntersectionNetwork
+
+
+def run(args, processes):
+    with IntersectionNetwork(args.rows, args.cols, args.width, args.height, args.vehicles, args.agents,
+                             args.agents, args.agents, seed=args.seed, processes=processes) as network:
+        start = time.perf_counter()
+        network.run(args.steps)
+        elapsed = time.perf_counter() - start
+        return elapsed, network.handoffs, network.digest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--cols", type=int, default=16)
+    parser.add_argument("--width", type=int, default=20, help="Ancho de cada mosaico")
+    parser.add_argument("--height", type=int, default=20, help="Alto de cada mosaico")
+    parser.add_argument("--vehicles", type=int, default=10, help="Vehículos por mosaico")
+    parser.add_argument("--agents", type=int, default=2, help="Microbuses, Ferraris y speedsters por mosaico")
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    if cores < max(args.processes):
+        print(f"Aviso: solo hay {cores} núcleo(s); la aceleración con más procesos no se puede verificar aquí")
+    serial = first = None
+    for processes in args.processes:
+        elapsed, handoffs, digest = run(args, processes)
+        serial = serial or digest
+        first = first or elapsed
+        print(f"{processes:>3} procesos: {args.steps / elapsed:.1f} pasos/s ({first / elapsed:.2f}x), "
+              f"{handoffs} traspasos, {'igual' if digest == serial else 'DISTINTO'} a la primera corrida")
+
+
+if __name__ == "__main__":
+    main()
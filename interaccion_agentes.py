@@ -1,71 +1,268 @@
-from mesa import Agent, Model
-from mesa.space import MultiGrid
+from mesa import Model
 from mesa.time import SimultaneousActivation
-import random
+from itertools import combinations
 from Negotiation import NegotiationManager
 from Toyota import ToyotaTrueno
 from Ferrari import FerrariF40
-from Microbus import Microbus
+from Microbus import Microbus, Passenger
 from TrafficLight import TrafficLight
 from Vehicle import Vehicle
+from Occupancy import OccupancyGrid, SparseGrid
+from Routing import RoutePlanner
+from Perception import PerceptionCache
+from Profiling import StepProfiler
+from AgentStore import AgentStore
+from Scheduling import EventScheduler
+from Inflow import VehiclePool, approach_cell
+from Dispatch import PassengerIndex, PassengerDispatcher
+from RoadMap import RoadMap
+from Movement import MoveResolver
 
 
-# ------------------------ La calle ------------------------
-class Street(Agent):
-    def __init__(self, unique_id, model):
-        super().__init__(unique_id, model)
-
 # ------------------------ Modelo ------------------------
 class IntersectionModel(Model):
-    def __init__(self, width, height, num_vehicles, num_microbuses, num_ferraris, num_speedsters):
+    def __init__(self, width, height, num_vehicles, num_microbuses, num_ferraris, num_speedsters, engine="object",
+                 seed=None, scheduler="simultaneous", id_prefix="", inflow=None, num_passengers=0, grid="dense",
+                 torus=True, road_map=None, movement="immediate"):
         super().__init__()
-        self.grid = MultiGrid(width, height, True)
-        self.schedule = SimultaneousActivation(self)
+        # Toda la aleatoriedad del modelo y de los agentes sale de self.random
+        self.reset_randomizer(seed)
+        self.agent_store = AgentStore()  # Atributos de los vehículos en arreglos tipados
+        if engine not in ("object", "vector"):
+            raise ValueError(f"Motor desconocido: {engine}")
+        if scheduler not in ("simultaneous", "event"):
+            raise ValueError(f"Planificador desconocido: {scheduler}")
+        if inflow is not None and engine == "vector":
+            raise ValueError("El motor vectorizado no admite llegadas de vehículos")
+        if num_passengers and engine == "vector":
+            raise ValueError("El motor vectorizado no admite pasajeros")
+        if grid not in ("dense", "sparse"):
+            raise ValueError(f"Cuadrícula desconocida: {grid}")
+        if not torus and engine == "vector":
+            raise ValueError("El motor vectorizado requiere una cuadrícula toroidal")
+        if movement not in ("immediate", "two-phase"):
+            raise ValueError(f"Movimiento desconocido: {movement}")
+        if movement == "two-phase" and engine == "vector":
+            raise ValueError("El motor vectorizado solo admite movimiento inmediato")
+        # "sparse" solo guarda las celdas ocupadas: para mapas grandes casi vacíos
+        self.grid = (SparseGrid if grid == "sparse" else OccupancyGrid)(width, height, torus)
+        # "event" solo activa a los agentes con trabajo pendiente; los resultados son los mismos
+        self.scheduler = scheduler
+        if scheduler == "event":
+            self.schedule = EventScheduler(self)
+            self.grid.listeners.append(self.schedule)
+        else:
+            self.schedule = SimultaneousActivation(self)
         self.negotiation_manager = NegotiationManager()
+        # "two-phase": los agentes declaran su movimiento en step() y se resuelven todos juntos en advance()
+        self.movement = movement
+        self.move_resolver = MoveResolver(self) if movement == "two-phase" else None
+        # Mapa estático de calles (tipo de celda y sentidos permitidos); por defecto, el cruce del visualizador
+        if road_map is None:
+            road_map = RoadMap.crossroads(width, height)
+        elif isinstance(road_map, str):
+            road_map = RoadMap.load(road_map)
+        if (road_map.width, road_map.height) != (width, height):
+            raise ValueError(f"El mapa mide {road_map.width}x{road_map.height} y la cuadrícula {width}x{height}")
+        if engine == "vector" and road_map.contains("roundabout"):
+            raise ValueError("El motor vectorizado no admite glorietas")
+        # Con celdas bloqueadas o calles de un sentido, cada movimiento se revisa contra el mapa
+        self.move_rules = road_map if road_map.restricts_movement() else None
+        if engine == "vector" and self.move_rules is not None:
+            raise ValueError("El motor vectorizado no admite celdas bloqueadas ni calles de un sentido")
+        self.road_map = road_map
+        self.router = RoutePlanner(self.grid, road_map=road_map)  # Rutas compartidas por todos los agentes
+        # Vecindarios compartidos por todos los agentes
+        self.perception = PerceptionCache(self.grid, move_rules=self.move_rules)
         self.running = True
+        # (id, destino, estado, celda de salida) de los vehículos que salieron de la cuadrícula en el último paso;
+        # se copian al salir porque al final del paso el vehículo vuelve a la reserva sin su fila del AgentStore
+        self.departures = []
+        self.retired = []  # Vehículos que salieron en este paso; dejan el planificador al terminar el paso
+        self.exited = 0  # Vehículos que salieron de la cuadrícula desde el inicio
+
+        # Llegadas por los accesos (PoissonInflow o TimetableInflow); los vehículos se reutilizan con la reserva
+        self.id_prefix = id_prefix
+        self.inflow = inflow
+        self.vehicle_pool = VehiclePool(self)
+        self.spawned = 0
+
+        # Pasajeros en espera: índice espacial y despacho por lotes a los microbuses
+        self.passenger_index = PassengerIndex(width, height)
+        self.dispatcher = PassengerDispatcher(self.passenger_index)
+        self.microbuses = []
+
 
         # Inicializar agentes
         for i in range(num_vehicles):
-            vehicle = Vehicle(f"vehicle_{i}", self, destination="north")
-            self.grid.place_agent(vehicle, (random.randint(0, width - 1), random.randint(0, height - 1)))
+            vehicle = Vehicle(f"{id_prefix}vehicle_{i}", self, destination="north")
+            self.grid.place_agent(vehicle, self.random_cell())
             self.schedule.add(vehicle)
         
         for i in range(num_microbuses):
-            microbus = Microbus(f"microbus_{i}", self)
-            initial_position = (random.randint(0, width - 1), random.randint(0, height - 1))
+            microbus = Microbus(f"{id_prefix}microbus_{i}", self)
+            initial_position = self.random_cell()
             self.grid.place_agent(microbus, initial_position)
             self.schedule.add(microbus)
+            self.microbuses.append(microbus)
 
 
         for i in range(num_speedsters):
-            speedster = ToyotaTrueno(f"speedster_{i}", self)
-            self.grid.place_agent(speedster, (random.randint(0, width - 1), random.randint(0, height - 1)))
+            speedster = ToyotaTrueno(f"{id_prefix}speedster_{i}", self)
+            self.grid.place_agent(speedster, self.random_cell())
             self.schedule.add(speedster)
 
         for i in range(num_ferraris):
-            ferrari = FerrariF40(f"ferrari_{i}", self)
-            self.grid.place_agent(ferrari, (random.randint(0, width - 1), random.randint(0, height - 1)))
+            ferrari = FerrariF40(f"{id_prefix}ferrari_{i}", self)
+            self.grid.place_agent(ferrari, self.random_cell())
             self.schedule.add(ferrari)
         
         # Crear semáforo
-        self.traffic_light = TrafficLight("traffic_light", self)
+        self.traffic_light = TrafficLight(f"{id_prefix}traffic_light", self)
         center = (width // 2, height // 2)
         self.grid.place_agent(self.traffic_light, center)
         self.schedule.add(self.traffic_light)
 
+        for _ in range(num_passengers):
+            self.add_passenger(self.random_cell())
+
+        # Motor vectorizado opcional: toma el estado de los agentes recién creados
+        self.engine = engine
+        self.vector_engine = None
+        if engine == "vector":
+            from VectorEngine import VectorEngine  # Solo se carga si se usa
+            self.vector_engine = VectorEngine(self)
+
+        # Instrumentación por fases; se activa con self.profiler.enable()
+        self.profiler = StepProfiler(self)
+
     def step(self):
-        # Gestionar interacciones entre agentes
-        for agent_a, agent_b in self.get_interacting_agents():
-            self.negotiation_manager.negotiate(agent_a, agent_b)
+        if self.vector_engine is not None:
+            self.vector_engine.step()
+            return
+
+        self.perception.clear()
+        self.departures.clear()
+        if self.inflow is not None:
+            self.spawn_arrivals()
+
+        # Gestionar interacciones entre agentes: un lote por paso con las decisiones del paso anterior.
+        # Con movimiento en dos fases, las interacciones son las disputas por celdas que resuelve MoveResolver
+        if self.move_resolver is None:
+            self.negotiation_manager.negotiate(self.get_interacting_agents())
+        if self.passenger_index:
+            self.dispatcher.dispatch(self.microbuses)
         
         # Avanzar la simulación
         self.schedule.step()
+        self.flush_retired()
+        if self.move_resolver is not None:
+            self.move_resolver.clear()
+
+    def spawn_arrivals(self):
+        """Coloca en su acceso los vehículos que llegan en este paso."""
+        for approach, destination in self.inflow.arrivals(self):
+            self.add_vehicle(f"{self.id_prefix}inflow_{self.spawned}", destination,
+                             approach_cell(approach, self.grid.width, self.grid.height))
+            self.spawned += 1
+
+    def add_vehicle(self, unique_id, destination, pos, state="neutral"):
+        """Pone en `pos` un vehículo que entra a la simulación, reutilizando uno de la reserva si hay."""
+        vehicle = self.vehicle_pool.acquire(unique_id, destination, state)
+        self.grid.place_agent(vehicle, pos)
+        self.schedule.add(vehicle)
+        if self.profiler.enabled:
+            self.profiler.instrument_agent(vehicle)
+        return vehicle
+
+    def random_cell(self):
+        """Celda al azar para colocar un agente; si el mapa bloquea celdas, solo entre las transitables."""
+        width, height = self.grid.width, self.grid.height
+        while True:
+            pos = (self.random.randint(0, width - 1), self.random.randint(0, height - 1))
+            if self.move_rules is None or self.move_rules.is_passable(pos):
+                return pos
+
+    def add_passenger(self, pos):
+        """Coloca un pasajero que espera en `pos`; no entra al planificador porque no actúa."""
+        passenger = Passenger(f"{self.id_prefix}passenger_{self.passenger_index.added}", self)
+        self.grid.place_agent(passenger, pos)
+        self.passenger_index.add(passenger, pos)
+        return passenger
+
+    def move_agent(self, agent, pos, on_arrival=None):
+        """
+        Mueve un agente a `pos` y después llama a `on_arrival`. Con movimiento en dos fases solo registra la
+        intención: el movimiento se resuelve en la fase advance y `on_arrival` se llama si el agente llegó.
+        Si el mapa no permite el avance (celda bloqueada o sentido prohibido), el agente se queda en su celda.
+        """
+        if self.move_rules is not None and not self.move_rules.permits(agent.pos, pos):
+            return
+        if self.move_resolver is not None:
+            self.move_resolver.propose(agent, pos, on_arrival)
+            return
+        self.grid.move_agent(agent, pos)
+        if on_arrival is not None:
+            on_arrival()
+
+    def pick_up(self, microbus, passengers, on_board):
+        """
+        Sube a `passengers` al microbús y llama a `on_board` por cada uno que subió. Con movimiento en dos
+        fases solo registra la intención: MoveResolver decide qué microbús se lleva cada pasajero disputado.
+        """
+        if self.move_resolver is not None:
+            self.move_resolver.propose_pickup(microbus, passengers, on_board)
+            return
+        for passenger in passengers:
+            if self.board(passenger):
+                on_board(passenger)
+
+    def board(self, passenger):
+        """Saca de la simulación a un pasajero recogido; False si otro microbús ya lo recogió."""
+        # claim falla si el pasajero ya salió del índice: nunca se retira dos veces
+        if not self.passenger_index.claim(passenger):
+            return False
+        self.grid.remove_agent(passenger)
+        passenger.remove()
+        return True
+
+    def settle_move(self, agent):
+        """advance() de los vehículos: con movimiento en dos fases, completa el movimiento resuelto del agente."""
+        if self.move_resolver is not None:
+            self.move_resolver.settle(agent)
+
+    def retire(self, vehicle):
+        """
+        Saca de la cuadrícula a un vehículo que llegó a su salida. Su baja del planificador se aplaza
+        hasta el final del paso para no modificar la colección de agentes mientras se recorre.
+        """
+        self.grid.remove_agent(vehicle)
+        self.retired.append(vehicle)
+        self.exited += 1
+
+    def flush_retired(self):
+        for vehicle in self.retired:
+            self.schedule.remove(vehicle)
+            self.vehicle_pool.release(vehicle)
+        self.retired.clear()
 
     def get_interacting_agents(self):
-        """Encuentra pares de agentes que interactúan en la misma celda."""
+        """
+        Encuentra pares de agentes que interactúan en la misma celda.
+        Solo revisa las celdas con más de un agente según el índice de ocupación
+        y devuelve cada par no ordenado una sola vez.
+        """
         interactions = []
-        for cell in self.grid.coord_iter():
-            agents_in_cell = cell[0]
-            if len(agents_in_cell) > 1:
-                interactions.extend([(a, b) for a in agents_in_cell for b in agents_in_cell if a != b])
-        return interactions
\ No newline at end of file
+        for agents_in_cell, _ in self.grid.iter_crowded_cells():
+            interactions.extend(combinations(agents_in_cell, 2))
+        return interactions
+
+    def wake(self, agent):
+        """Avisa al planificador por eventos que el agente puede tener trabajo; con SimultaneousActivation no hace nada."""
+        if self.scheduler == "event":
+            self.schedule.wake(agent)
+
+    def sync_agents(self):
+        """Con el motor vectorizado, actualiza los agentes y la cuadrícula con el estado de los arreglos."""
+        if self.vector_engine is not None:
+            self.vector_engine.sync()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import argparse
+import itertools
+import json
+import os
+import time
+from multiprocessing import Pool
+from interaccion_agentes import IntersectionModel, Vehicle, Microbus, FerrariF40, ToyotaTrueno
+
+# Parámetros de IntersectionModel que se pueden barrer
+MODEL_PARAMETERS = ("width", "height", "num_vehicles", "num_microbuses", "num_ferraris", "num_speedsters",
+                    "num_passengers")
+# Opciones del constructor que se fijan para todo el barrido
+MODEL_OPTIONS = ("engine", "scheduler", "grid", "torus", "movement")
+
+
+def parameter_grid(**values):
+    """Genera todas las combinaciones de parámetros, p. ej. parameter_grid(width=[20, 40], height=[20], ...)."""
+    names = list(values)
+    for combination in itertools.product(*(values[name] for name in names)):
+        yield dict(zip(names, combination))
+
+
+def run_simulation(run):
+    """
+    Ejecuta una corrida sin interfaz gráfica y devuelve sus métricas de resumen.
+    `run` es un diccionario con los parámetros del modelo más `steps`, `seed`, `engine`, `scheduler`, `grid`,
+    `torus`, `movement` y `run_id`.
+    Con `checkpoint`, la corrida parte del modelo guardado (resembrado con `seed`) en lugar de uno nuevo; el
+    modelo guardado trae sus propios parámetros, así que `run` no puede traer ninguno (ValueError).
+    Con `metrics`, se agregan los agregados del MetricsCollector tomados en cada paso.
+    Con `gridlock` (pasos de paciencia), un GridlockDetector termina la corrida en cuanto el modelo se bloquea.
+    """
+    start = time.perf_counter()
+    if run.get("checkpoint"):
+        given = [name for name in MODEL_PARAMETERS + MODEL_OPTIONS if name in run]
+        if given:
+            raise ValueError(f"La corrida parte de un checkpoint; no admite {', '.join(given)}")
+        from Checkpoint import load_checkpoint
+        model = load_checkpoint(run["checkpoint"], seed=run["seed"])
+        run = {**run, "width": model.grid.width, "height": model.grid.height}
+    else:
+        params = {name: run[name] for name in MODEL_PARAMETERS}
+        model = IntersectionModel(**params, engine=run.get("engine", "object"), seed=run["seed"],
+                                  scheduler=run.get("scheduler", "simultaneous"), grid=run.get("grid", "dense"),
+                                  torus=run.get("torus", True), movement=run.get("movement", "immediate"))
+    initial_exited = model.exited  # Un checkpoint trae las salidas de antes de guardarse
+    if run.get("profile"):
+        model.profiler.enable()
+    collector = None
+    if run.get("metrics"):
+        from Metrics import MetricsCollector
+        collector = MetricsCollector(model)
+    detector = None
+    if run.get("gridlock"):
+        from Gridlock import GridlockDetector
+        detector = GridlockDetector(model, patience=run["gridlock"], stop=True)
+    steps_run = 0
+    while steps_run < run["steps"] and model.running:
+        model.step()
+        steps_run += 1
+        if collector is not None:
+            collector.collect()
+        if detector is not None:
+            detector.observe()
+    elapsed = time.perf_counter() - start
+    model.sync_agents()
+
+    agents = list(model.schedule.agents)
+    ferraris = [a for a in agents if isinstance(a, FerrariF40)]
+    speedsters = [a for a in agents if isinstance(a, ToyotaTrueno)]
+    microbuses = [a for a in agents if isinstance(a, Microbus)]
+    remaining_vehicles = sum(isinstance(a, Vehicle) for a in agents)
+    return {
+        **run,
+        "elapsed": elapsed,
+        "steps_run": steps_run,
+        "ticks_per_second": steps_run / elapsed if elapsed else None,
+        "vehicles_remaining": remaining_vehicles,
+        "vehicles_exited": model.exited - initial_exited,
+        "ferraris_anxious": sum(a.state == "ansioso/enojado" for a in ferraris),
+        "speedsters_angry": sum(a.state == "enojado" for a in speedsters),
+        "microbus_passengers": sum(a.passengers for a in microbuses),
+        "traffic_light_saturated": model.traffic_light.saturated,
+        **{f"traffic_light_{name}": value for name, value in model.traffic_light.wait_stats().items()},
+        **{f"negotiation_{name}": value for name, value in model.negotiation_manager.summary().items()},
+        **({f"movement_{name}": value for name, value in model.move_resolver.summary().items()}
+           if model.move_resolver is not None else {}),
+        **({"profile": model.profiler.report()} if run.get("profile") else {}),
+        **({"metrics": collector.summary()} if collector is not None else {}),
+        **({f"gridlock_{name}": value for name, value in detector.summary().items()} if detector is not None else {}),
+    }
+
+
+def build_runs(configs, steps, repetitions=1, base_seed=0, engine="object", profile=False,
+               scheduler="simultaneous", checkpoint=None, metrics=False, grid="dense", torus=True,
+               movement="immediate", gridlock=None):
+    """
+    Expande cada configuración en `repetitions` corridas, cada una con su propia semilla. Con `checkpoint`,
+    las opciones del constructor no se incluyen: las corridas usan las del modelo guardado.
+    """
+    options = {} if checkpoint else {"engine": engine, "scheduler": scheduler, "grid": grid, "torus": torus,
+                                     "movement": movement}
+    runs = []
+    for config in configs:
+        for _ in range(repetitions):
+            run_id = len(runs)
+            runs.append({**config, **options, "steps": steps, "seed": base_seed + run_id, "run_id": run_id,
+                         "profile": profile, "checkpoint": checkpoint, "metrics": metrics, "gridlock": gridlock})
+    return runs
+
+
+def run_sweep(runs, output, processes=None):
+    """
+    Reparte las corridas entre un pool de procesos y escribe una línea JSON por corrida
+    en `output` a medida que terminan. Devuelve el número de corridas completadas.
+    """
+    completed = 0
+    with open(output, "w") as results, Pool(processes or os.cpu_count()) as pool:
+        for summary in pool.imap_unordered(run_simulation, runs):
+            results.write(json.dumps(summary) + "\n")
+            results.flush()
+            completed += 1
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barridos de parámetros de IntersectionModel sin interfaz gráfica.")
+    parser.add_argument("--width", type=int, nargs="+")
+    parser.add_argument("--height", type=int, nargs="+")
+    parser.add_argument("--vehicles", type=int, nargs="+")
+    parser.add_argument("--microbuses", type=int, nargs="+")
+    parser.add_argument("--ferraris", type=int, nargs="+")
+    parser.add_argument("--speedsters", type=int, nargs="+")
+    parser.add_argument("--passengers", type=int, nargs="+", help="Pasajeros en espera al inicio")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--repetitions", type=int, default=1, help="Corridas por configuración")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla base; cada corrida usa seed + run_id")
+    parser.add_argument("--engine", choices=["object", "vector"])
+    parser.add_argument("--scheduler", choices=["simultaneous", "event"],
+                        help="event solo activa a los agentes con trabajo pendiente")
+    parser.add_argument("--grid", choices=["dense", "sparse"],
+                        help="sparse solo guarda las celdas ocupadas (mapas grandes casi vacíos)")
+    parser.add_argument("--no-torus", action="store_true", help="Cuadrícula con bordes en lugar de toroidal")
+    parser.add_argument("--movement", choices=["immediate", "two-phase"],
+                        help="two-phase resuelve todos los movimientos juntos, sin depender del orden de los agentes")
+    parser.add_argument("--checkpoint",
+                        help="Checkpoint del que parten todas las corridas, con sus parámetros (ver Checkpoint.py)")
+    parser.add_argument("--profile", action="store_true", help="Incluye el perfil por fases en cada resultado")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Incluye media, desviación y cuantiles de las métricas por paso (ver Metrics.py)")
+    parser.add_argument("--gridlock", type=int, metavar="PACIENCIA",
+                        help="Termina cada corrida cuando sus vehículos llevan PACIENCIA pasos sin avanzar (ver Gridlock.py)")
+    parser.add_argument("--processes", type=int, default=None, help="Por defecto, todos los núcleos")
+    parser.add_argument("--output", default="resultados.jsonl")
+    args = parser.parse_args(argv)
+
+    # Un checkpoint ya trae el modelo: sus parámetros no se pueden cambiar desde aquí
+    defaults = {"width": [20], "height": [20], "vehicles": [2], "microbuses": [2], "ferraris": [2],
+                "speedsters": [2], "passengers": [0], "engine": "object", "scheduler": "simultaneous",
+                "grid": "dense", "movement": "immediate"}
+    given = [name for name in defaults if getattr(args, name) is not None] + (["no_torus"] if args.no_torus else [])
+    if args.checkpoint and given:
+        parser.error("--checkpoint usa los parámetros del modelo guardado; no se puede combinar con "
+                     + ", ".join(f"--{name.replace('_', '-')}" for name in given))
+    for name, default in defaults.items():
+        if getattr(args, name) is None:
+            setattr(args, name, default)
+
+    configs = [{}] if args.checkpoint else parameter_grid(
+        width=args.width, height=args.height, num_vehicles=args.vehicles, num_microbuses=args.microbuses,
+        num_ferraris=args.ferraris, num_speedsters=args.speedsters, num_passengers=args.passengers,
+    )
+    runs = build_runs(configs, args.steps, args.repetitions, args.seed, args.engine, args.profile, args.scheduler,
+                      args.checkpoint, args.metrics, args.grid, not args.no_torus, args.movement, args.gridlock)
+    completed = run_sweep(runs, args.output, args.processes)
+    print(f"{completed} corridas escritas en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
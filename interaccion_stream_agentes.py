@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+from interaccion_agentes import IntersectionModel
+from Streaming import SimulationServer, watch
+
+
+async def serve(args):
+    model = IntersectionModel(args.width, args.height, args.vehicles, args.microbuses, args.ferraris, args.speedsters,
+                              engine=args.engine, seed=args.seed, scheduler=args.scheduler, movement=args.movement)
+    async with SimulationServer(model, args.host, args.port, steps=args.steps, interval=args.interval,
+                                queue_size=args.queue_size) as server:
+        print(f"Transmitiendo en {server.host}:{server.port}")
+        await server.wait()
+        print(f"{server.frames} cuadros publicados")
+
+
+async def show(args):
+    """Cliente de texto: una línea por cuadro recibido."""
+    async for frame, view in watch(args.host, args.port):
+        print(f"paso {view['tick']:>6} {frame['type']:<5} cambios: {len(frame['agents']):>5} "
+              f"agentes: {len(view['agents']):>5} semáforo: {view['light']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transmisión en vivo de IntersectionModel por TCP local.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--watch", action="store_true", help="Se conecta como cliente en lugar de simular")
+    parser.add_argument("--width", type=int, default=20)
+    parser.add_argument("--height", type=int, default=20)
+    parser.add_argument("--vehicles", type=int, default=2)
+    parser.add_argument("--microbuses", type=int, default=2)
+    parser.add_argument("--ferraris", type=int, default=2)
+    parser.add_argument("--speedsters", type=int, default=2)
+    parser.add_argument("--steps", type=int, default=None, help="Por defecto, sin límite")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", choices=["object", "vector"], default="object")
+    parser.add_argument("--scheduler", choices=["simultaneous", "event"], default="simultaneous")
+    parser.add_argument("--movement", choices=["immediate", "two-phase"], default="immediate")
+    parser.add_argument("--interval", type=float, default=0.0, help="Segundos mínimos entre pasos")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="Cuadros pendientes por cliente antes de descartarlos y mandar uno completo")
+    args = parser.parse_args(argv)
+    asyncio.run(show(args) if args.watch else serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import argparse
+import os
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib import animation
+from matplotlib.colors import to_rgba
 from matplotlib.animation import FuncAnimation
-from interaccion_agentes import IntersectionModel, Vehicle, TrafficLight, Microbus, FerrariF40, ToyotaTrueno
+from interaccion_agentes import IntersectionModel
+from RoadMap import CELL_TYPES, RoadMap
 
 # Configuración de la simulación
 width = 20  # Ancho de la cuadrícula
@@ -11,84 +16,172 @@ num_microbuses = 2  # Número de microbuses
 num_ferraris = 2  # Número de Ferraris
 num_speedsters = 2  # Número de Speedsters
 
-# Crear el modelo de intersección
-model = IntersectionModel(width, height, num_vehicles, num_microbuses, num_ferraris, num_speedsters)
-
-# Crear el gráfico
-fig, ax = plt.subplots(figsize=(8, 8))
-
 # Colores para representar el estado del semáforo
 semaforo_colors = {"yellow": "yellow", "green": "green", "red": "red"}
 
-# Función para dibujar los carriles usando rectángulos
-def draw_lanes():
-    lane_color = "lightgray"
-    
-    # Dibujar carriles horizontales (en el eje y)
-    for y in range(height):
-        if y == height // 2 - 1 or y == height // 2 or y == height // 2 + 1:
-            ax.add_patch(plt.Rectangle((0, y), width, 0.1, color=lane_color, zorder=1))
-
-    # Dibujar carriles verticales (en el eje x)
-    for x in range(width):
-        if x == width // 2 - 1 or x == width // 2 or x == width // 2 + 1:
-            ax.add_patch(plt.Rectangle((x, 0), 0.1, height, color=lane_color, zorder=1))
-
-# Función para actualizar la visualización
-def update(frame):
-    # Realizar un paso de simulación
-    model.step()
-
-    # Limpiar la gráfica
-    ax.clear()
-
-    # Dibujar los carriles
-    draw_lanes()
-
-    # Dibujar las posiciones de los agentes
-    vehicle_positions = [vehicle.pos for vehicle in model.schedule.agents if isinstance(vehicle, Vehicle)]
-    microbus_positions = [microbus.pos for microbus in model.schedule.agents if isinstance(microbus, Microbus)]
-    ferrari_positions = [ferrari.pos for ferrari in model.schedule.agents if isinstance(ferrari, FerrariF40)]
-    speedster_positions = [speedster.pos for speedster in model.schedule.agents if isinstance(speedster, ToyotaTrueno)]
-    traffic_light_position = model.traffic_light.pos
-
-    # Dibujar los vehículos
-    if vehicle_positions:
-        vehicle_x, vehicle_y = zip(*vehicle_positions)
-        ax.scatter(vehicle_x, vehicle_y, c="red", label="Vehículos", zorder=5)
-
-    # Dibujar microbuses
-    if microbus_positions:
-        microbus_x, microbus_y = zip(*microbus_positions)
-        ax.scatter(microbus_x, microbus_y, c="blue", label="Microbuses", zorder=5)
-
-    # Dibujar Ferraris
-    if ferrari_positions:
-        ferrari_x, ferrari_y = zip(*ferrari_positions)
-        ax.scatter(ferrari_x, ferrari_y, c="green", label="Ferraris", zorder=5)
-
-    # Dibujar Speedsters
-    if speedster_positions:
-        speedster_x, speedster_y = zip(*speedster_positions)
-        ax.scatter(speedster_x, speedster_y, c="purple", label="Speedsters", zorder=5)
-
-    # Dibujar semáforo
-    semaforo_state = model.traffic_light.state
-    ax.add_patch(plt.Rectangle((traffic_light_position[0] - 0.5, traffic_light_position[1] - 0.5), 
-                                1, 1, color=semaforo_colors[semaforo_state], label="Semáforo", zorder=10))
-
-    # Título y leyenda
-    ax.set_title(f"Paso {frame}")
-    ax.legend(loc="upper left")
-
-    # Limitar el rango para que no se mueva la vista
-    ax.set_xlim(-1, width)
-    ax.set_ylim(-1, height)
-
-    ax.set_aspect('equal', adjustable='box')
-
-# Crear la animación
-ani = FuncAnimation(fig, update, frames=50, interval=500)
-
-# Mostrar la animación
-plt.show()
+# Color y etiqueta de cada tipo de agente (por nombre de clase, igual que en las trayectorias grabadas)
+agent_styles = {
+    "Vehicle": ("red", "Vehículos"),
+    "Microbus": ("blue", "Microbuses"),
+    "FerrariF40": ("green", "Ferraris"),
+    "ToyotaTrueno": ("purple", "Speedsters"),
+}
+
+# Color de cada tipo de celda del mapa de calles; el terreno libre no se pinta
+cell_colors = {
+    "open": (0, 0, 0, 0),
+    "lane": "lightgray",
+    "intersection": "darkgray",
+    "roundabout": "khaki",
+    "stop": "salmon",
+    "blocked": "black",
+}
+
+
+# ------------------------ Fuentes de cuadros ------------------------
+def model_frames(model, steps):
+    """Avanza el modelo y produce (paso, posiciones por tipo, estado y posición del semáforo) en cada cuadro."""
+    for _ in range(steps):
+        model.step()
+        model.sync_agents()
+        positions = {name: [] for name in agent_styles}
+        for agent in model.schedule.agents:
+            group = positions.get(type(agent).__name__)
+            if group is not None:
+                group.append(agent.pos)
+        yield model.schedule.steps, positions, model.traffic_light.state, model.traffic_light.pos
+
+
+def recording_frames(reader, start=None, stop=None):
+    """
+    Produce los mismos cuadros a partir de una trayectoria grabada con TrajectoryRecorder; lee del disco
+    un paso por cuadro, así que la memoria no crece con la duración de la grabación.
+    """
+    types = reader.vocabularies["type"]
+    states = reader.vocabularies["state"]
+    light_type = types.index("TrafficLight") if "TrafficLight" in types else -1
+    for frame, rows in reader.iter_ticks(start, stop):
+        positions = {name: [] for name in agent_styles}
+        light_state, light_pos = "yellow", None
+        for row in range(len(rows["tick"])):
+            x, y, kind = int(rows["x"][row]), int(rows["y"][row]), rows["type"][row]
+            if kind == light_type:
+                light_state, light_pos = states[rows["state"][row]], (x, y)
+            elif types[kind] in positions:
+                positions[types[kind]].append((x, y))
+        yield frame, positions, light_state, light_pos
+
+
+# ------------------------ Renderizador ------------------------
+class SimulationRenderer:
+    """
+    Dibuja el mapa de calles una sola vez y en cada cuadro solo actualiza los offsets de un scatter por tipo
+    de agente y el semáforo, de modo que la animación puede usar blitting.
+    """
+    def __init__(self, width, height, ax=None, road_map=None):
+        self.width = width
+        self.height = height
+        self.road_map = road_map if road_map is not None else RoadMap.crossroads(width, height)
+        if ax is None:
+            self.fig, self.ax = plt.subplots(figsize=(8, 8))
+        else:
+            self.fig, self.ax = ax.figure, ax
+        ax = self.ax
+        ax.set_xlim(-1, width)
+        ax.set_ylim(-1, height)
+        ax.set_aspect('equal', adjustable='box')
+        self.draw_map()
+
+        empty = np.empty((0, 2))
+        self.scatters = {
+            name: ax.scatter(empty[:, 0], empty[:, 1], c=color, label=label, zorder=5)
+            for name, (color, label) in agent_styles.items()
+        }
+        self.traffic_light = plt.Rectangle((0, 0), 1, 1, color=semaforo_colors["yellow"], label="Semáforo",
+                                           zorder=10, visible=False)
+        ax.add_patch(self.traffic_light)
+        self.title = ax.text(0.5, 0.98, "", transform=ax.transAxes, ha="center", va="top", zorder=11)
+        ax.legend(loc="upper left")
+        self.artists = [*self.scatters.values(), self.traffic_light, self.title]
+
+    def draw_map(self):
+        """Pinta cada celda con el color de su tipo, directamente desde el ráster del mapa."""
+        colors = np.array([to_rgba(cell_colors[name]) for name in CELL_TYPES])
+        image = colors[np.asarray(self.road_map.types).T]  # Filas de la imagen: y
+        self.ax.imshow(image, origin="lower", extent=(-0.5, self.width - 0.5, -0.5, self.height - 0.5),
+                       interpolation="nearest", zorder=1)
+
+    def update(self, frame_data):
+        frame, positions, light_state, light_pos = frame_data
+        for name, scatter in self.scatters.items():
+            scatter.set_offsets(np.array(positions[name], dtype=float).reshape(-1, 2))
+        if light_pos is not None:
+            self.traffic_light.set_xy((light_pos[0] - 0.5, light_pos[1] - 0.5))
+            self.traffic_light.set_color(semaforo_colors[light_state])
+            self.traffic_light.set_visible(True)
+        self.title.set_text(f"Paso {frame}")
+        return self.artists
+
+    def animate(self, frames, interval=500):
+        """Animación en pantalla con blitting."""
+        return FuncAnimation(self.fig, self.update, frames=frames, interval=interval, blit=True,
+                             cache_frame_data=False)
+
+    def export(self, frames, output, fps=2, dpi=100):
+        """
+        Escribe los cuadros sin abrir una ventana: .mp4/.avi/.mkv con ffmpeg, .gif con Pillow;
+        cualquier otra ruta se trata como un directorio de imágenes PNG numeradas.
+        """
+        extension = os.path.splitext(output)[1].lower()
+        if extension in (".mp4", ".avi", ".mkv", ".gif"):
+            writer = animation.PillowWriter(fps=fps) if extension == ".gif" else animation.FFMpegWriter(fps=fps)
+            with writer.saving(self.fig, output, dpi):
+                for frame_data in frames:
+                    self.update(frame_data)
+                    writer.grab_frame()
+        else:
+            os.makedirs(output, exist_ok=True)
+            for frame_data in frames:
+                self.update(frame_data)
+                self.fig.savefig(os.path.join(output, f"paso_{frame_data[0]:06d}.png"), dpi=dpi)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visualización de IntersectionModel.")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", choices=["object", "vector"], default="object")
+    parser.add_argument("--interval", type=int, default=500, help="Milisegundos por cuadro en pantalla")
+    parser.add_argument("--replay", help="Directorio de una trayectoria grabada con TrajectoryRecorder")
+    parser.add_argument("--output", help="Exporta sin ventana a un video (.mp4, .gif, ...) o a un directorio de PNG")
+    parser.add_argument("--fps", type=int, default=2)
+    parser.add_argument("--map", help="Mapa de calles (.npy o texto, ver RoadMap.py); por defecto, el cruce")
+    args = parser.parse_args(argv)
+    road_map = RoadMap.load(args.map) if args.map else None
+
+    if args.output:
+        plt.switch_backend("Agg")
+
+    if args.replay:
+        from Recorder import TrajectoryReader
+        reader = TrajectoryReader(args.replay)
+        renderer = SimulationRenderer(reader.width, reader.height, road_map=road_map)
+        frames = recording_frames(reader)
+    else:
+        # Crear el modelo de intersección
+        map_width, map_height = (road_map.width, road_map.height) if road_map else (width, height)
+        model = IntersectionModel(map_width, map_height, num_vehicles, num_microbuses, num_ferraris, num_speedsters,
+                                  engine=args.engine, seed=args.seed, road_map=road_map)
+        renderer = SimulationRenderer(map_width, map_height, road_map=model.road_map)
+        frames = model_frames(model, args.steps)
+
+    if args.output:
+        renderer.export(frames, args.output, fps=args.fps)
+    else:
+        # Crear la animación y mostrarla
+        ani = renderer.animate(frames, interval=args.interval)
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
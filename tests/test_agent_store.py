@@ -0,0 +1,32 @@
+from interaccion_agentes import IntersectionModel
+from Inflow import APPROACHES, PoissonInflow
+from Vehicle import Vehicle
+
+
+def test_retired_vehicles_return_their_rows():
+    model = IntersectionModel(20, 20, 0, 0, 0, 0, seed=1,
+                              inflow=PoissonInflow({approach: 0.4 for approach in APPROACHES}))
+    peak = 0
+    for _ in range(400):
+        model.step()
+        vehicles = [agent for agent in model.schedule.agents if isinstance(agent, Vehicle)]
+        peak = max(peak, len(vehicles))
+        table = model.agent_store.tables[Vehicle]
+        assert table.rows() == len(vehicles)
+        assert len({vehicle._row for vehicle in vehicles}) == len(vehicles)
+        assert sum(table.counts["state"].values()) == len(vehicles)
+    assert model.spawned > 2 * peak
+    assert model.agent_store.tables[Vehicle].size <= peak + len(APPROACHES)
+
+
+def test_vector_engine_releases_exited_vehicles():
+    model = IntersectionModel(20, 20, 12, 0, 0, 0, seed=2, engine="vector")
+    table = model.agent_store.tables[Vehicle]
+    for _ in range(60):
+        model.step()
+    model.sync_agents()
+    assert model.exited > 0
+    assert table.rows() == table.size - model.exited
+    replacement = Vehicle("nuevo", model, "north")
+    assert replacement._row < table.size and table.rows() == table.size - model.exited + 1
+    assert replacement.state == "neutral" and replacement.arrival_time is None
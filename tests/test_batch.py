@@ -0,0 +1,35 @@
+import pytest
+
+from Checkpoint import save_checkpoint
+from interaccion_agentes import IntersectionModel
+from interaccion_batch_agentes import build_runs, main, run_simulation
+
+
+def test_exits_come_from_the_model():
+    run = build_runs([{"width": 20, "height": 20, "num_vehicles": 10, "num_microbuses": 0, "num_ferraris": 0,
+                       "num_speedsters": 0, "num_passengers": 0}], steps=40)[0]
+    summary = run_simulation(run)
+    model = IntersectionModel(20, 20, 10, 0, 0, 0, seed=run["seed"])
+    for _ in range(40):
+        model.step()
+    assert summary["vehicles_exited"] == model.exited > 0
+
+
+def test_checkpoint_runs_keep_the_saved_parameters(tmp_path):
+    model = IntersectionModel(30, 24, 10, 2, 2, 2, seed=1)
+    for _ in range(20):
+        model.step()
+    path = tmp_path / "modelo.ckpt"
+    save_checkpoint(model, path)
+    exited = model.exited
+
+    summary = run_simulation(build_runs([{}], steps=30, checkpoint=str(path))[0])
+    assert (summary["width"], summary["height"]) == (30, 24)
+    for _ in range(30):
+        model.step()
+    assert summary["vehicles_exited"] == model.exited - exited
+
+    with pytest.raises(ValueError):
+        run_simulation({"checkpoint": str(path), "seed": 0, "steps": 1, "width": 40})
+    with pytest.raises(SystemExit):
+        main(["--checkpoint", str(path), "--width", "40", "--output", str(tmp_path / "salida.jsonl")])
@@ -0,0 +1,28 @@
+import pytest
+
+from Checkpoint import load_checkpoint, save_checkpoint
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"engine": "vector"},
+    {"scheduler": "event"},
+    {"grid": "sparse"},
+    {"movement": "two-phase", "num_passengers": 15},
+    {"grid": "sparse", "torus": False, "scheduler": "event", "movement": "two-phase"},
+], ids=["object", "vector", "event", "sparse", "two-phase", "combined"])
+def test_checkpoint_round_trip_continues_like_uninterrupted_run(tmp_path, options):
+    path = tmp_path / "checkpoint.bin"
+    uninterrupted = IntersectionModel(20, 20, 12, 4, 5, 5, seed=4, **options)
+    model = IntersectionModel(20, 20, 12, 4, 5, 5, seed=4, **options)
+    for _ in range(25):
+        uninterrupted.step()
+        model.step()
+    save_checkpoint(model, path)
+    restored = load_checkpoint(path)
+    for _ in range(40):
+        uninterrupted.step()
+        restored.step()
+        assert state_digest(restored) == state_digest(uninterrupted)
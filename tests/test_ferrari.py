@@ -0,0 +1,23 @@
+import pytest
+
+from Ferrari import FerrariF40
+from interaccion_agentes import IntersectionModel
+
+
+@pytest.mark.parametrize("engine", ["object", "vector"])
+def test_anxious_ferraris_calm_down(engine):
+    model = IntersectionModel(6, 6, 5, 2, 8, 2, seed=2, engine=engine)
+    anxious_for = {}
+    calmed = 0
+    for _ in range(200):
+        model.step()
+        model.sync_agents()
+        for agent in model.schedule.agents:
+            if not isinstance(agent, FerrariF40):
+                continue
+            if agent.state == "normal":
+                calmed += anxious_for.pop(agent, 0) > 0
+            else:
+                anxious_for[agent] = anxious_for.get(agent, 0) + 1
+                assert anxious_for[agent] <= FerrariF40.calm_after
+    assert calmed > 0
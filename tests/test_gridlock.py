@@ -0,0 +1,39 @@
+from Gridlock import GridlockDetector
+from interaccion_agentes import IntersectionModel
+
+
+def test_wait_for_cycles_are_reported():
+    model = IntersectionModel(6, 6, 4, 2, 2, 2, seed=0, movement="two-phase")
+    detector = GridlockDetector(model, patience=10)
+    reported = 0
+    for _ in range(20):
+        model.step()
+        cycles = detector.observe()["cycles"]
+        reported += len(cycles)
+        # Cada vehículo del ciclo espera al siguiente, y el último al primero
+        waits_for = {agent.unique_id: {blocker.unique_id for blocker in blockers}
+                     for agent, blockers in model.move_resolver.blocked.items()}
+        for cycle in cycles:
+            for agent, blocker in zip(cycle, cycle[1:] + cycle[:1]):
+                assert blocker in waits_for[agent]
+    assert reported > 0
+    assert detector.summary()["cycles_found"] > 0
+
+
+def test_stop_ends_a_locked_run():
+    patience = 10
+    model = IntersectionModel(6, 6, 4, 2, 2, 2, seed=2, movement="two-phase")
+    detector = GridlockDetector(model, patience=patience, stop=True)
+    least_stalled = []
+    steps = 0
+    while model.running and steps < 200:
+        model.step()
+        detector.observe()
+        least_stalled.append(min(detector.stalls.values()))
+        steps += 1
+    assert not model.running
+    assert detector.locked and detector.locked_at == steps == model.schedule.steps
+    # La corrida termina en el paso en que el último vehículo cumple `patience` pasos sin avanzar
+    assert least_stalled[-1] == patience and least_stalled[-2] == patience - 1
+    assert set(detector.stalls.values()) == {patience}
+    assert detector.report()["starved"] == sorted((agent.unique_id for agent in detector.stalls), key=str)
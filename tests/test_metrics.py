@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Metrics import STATE_METRICS, MetricsCollector
+from Microbus import Microbus
+
+
+def scanned_counts(model):
+    """Agentes por estado y pasajeros a bordo recorriendo las columnas, como antes de los conteos."""
+    model.sync_agents()
+    store = model.agent_store
+    counts = {}
+    for agent_class, states in STATE_METRICS.items():
+        table = store.tables[agent_class]
+        values = [store.values[code] for code in table.columns["state"][:table.size]]
+        for state in states:
+            counts[f"{agent_class.__name__}.{state}"] = values.count(state)
+    microbuses = store.tables[Microbus]
+    counts["passengers"] = int(np.sum(microbuses.columns["passengers"][:microbuses.size]))
+    return counts
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"engine": "vector"},
+    {"num_passengers": 30, "movement": "two-phase"},
+], ids=["object", "vector", "passengers"])
+def test_state_counters_match_column_scan(options):
+    model = IntersectionModel(20, 20, 10, 5, 6, 6, seed=3, **options)
+    collector = MetricsCollector(model)
+    for _ in range(100):
+        model.step()
+        sample = collector.collect()
+        assert {name: sample[name] for name in scanned_counts(model)} == scanned_counts(model)
@@ -0,0 +1,41 @@
+import random
+import weakref
+
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+
+def run(config, seed, steps, shuffle=None, **options):
+    """Digests de cada paso; con `shuffle`, el planificador activa a los agentes en otro orden."""
+    model = IntersectionModel(*config, seed=seed, movement="two-phase", **options)
+    if shuffle is not None:
+        agents = list(model.schedule._agents)
+        random.Random(shuffle).shuffle(agents)
+        model.schedule._agents._agents = weakref.WeakKeyDictionary({agent: None for agent in agents})
+    digests = []
+    for _ in range(steps):
+        model.step()
+        digests.append(state_digest(model))
+    return digests
+
+
+@pytest.mark.parametrize("config, seed, passengers", [
+    ((20, 20, 3, 3, 3, 3), 0, 0),
+    ((9, 9, 20, 5, 6, 6), 2, 8),
+    ((12, 12, 10, 8, 4, 4), 2, 30),
+])
+def test_two_phase_does_not_depend_on_activation_order(config, seed, passengers):
+    expected = run(config, seed, 40, num_passengers=passengers)
+    for shuffle in range(3):
+        assert run(config, seed, 40, shuffle=shuffle, num_passengers=passengers) == expected
+
+
+def test_contested_passenger_boards_one_microbus():
+    model = IntersectionModel(12, 12, 10, 8, 4, 4, seed=2, movement="two-phase", num_passengers=30)
+    for _ in range(40):
+        model.step()
+    boarded = sum(agent.passengers for agent in model.microbuses)
+    assert model.move_resolver.pickup_contests > 0
+    assert boarded == model.passenger_index.claimed
@@ -0,0 +1,15 @@
+from Network import IntersectionNetwork
+
+
+def run(processes):
+    with IntersectionNetwork(3, 3, 12, 12, 6, 1, 1, 1, seed=4, processes=processes) as network:
+        network.run(40)
+        return network.handoffs, network.exited, network.digests(), network.digest()
+
+
+def test_sharded_runs_match_the_serial_run():
+    serial = run(1)
+    handoffs, exited, _, _ = serial
+    assert handoffs > 0 and exited > 0  # Hubo vehículos que pasaron de un mosaico a otro
+    assert run(2) == serial
+    assert run(3) == serial
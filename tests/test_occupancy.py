@@ -0,0 +1,40 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+
+
+def legacy_interacting_agents(grid):
+    """El recorrido anterior: todas las celdas de la cuadrícula y los pares ordenados de cada una."""
+    interactions = []
+    for agents_in_cell, _ in grid.coord_iter():
+        if len(agents_in_cell) > 1:
+            interactions.extend([(a, b) for a in agents_in_cell for b in agents_in_cell if a != b])
+    return interactions
+
+
+def unordered_once(pairs):
+    """Cada par no ordenado una vez, en el orden en que aparece por primera vez."""
+    seen, unique = set(), []
+    for a, b in pairs:
+        key = frozenset((a, b))
+        if key not in seen:
+            seen.add(key)
+            unique.append((a, b))
+    return unique
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("config, passengers", [
+    ((8, 8, 10, 5, 5, 5), 0),
+    ((20, 20, 3, 4, 3, 3), 20),
+])
+def test_crowded_cells_match_full_grid_scan(config, passengers, seed):
+    model = IntersectionModel(*config, seed=seed, num_passengers=passengers)
+    for _ in range(30):
+        legacy = legacy_interacting_agents(model.grid)
+        pairs = model.get_interacting_agents()
+        assert pairs == unordered_once(legacy)
+        assert len(pairs) * 2 == len(legacy)
+        assert [pos for _, pos in model.grid.iter_crowded_cells()] == [
+            pos for agents, pos in model.grid.coord_iter() if len(agents) > 1]
+        model.step()
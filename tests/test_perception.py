@@ -0,0 +1,39 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Vehicle import Vehicle
+from test_road_map import restricted_map
+
+
+def check_every_query(model):
+    """Compara cada respuesta de la capa de percepción con la cuadrícula en el momento de la consulta."""
+    perception, grid = model.perception, model.grid
+    at = perception.at
+    checked = []
+
+    def checked_at(pos):
+        summary = at(pos)
+        neighborhood = grid.get_neighborhood(pos, moore=False, include_center=False)
+        assert summary.has_vehicle == any(isinstance(agent, Vehicle)
+                                          for agent in grid.get_neighbors(pos, moore=False, include_center=False))
+        assert summary.empty_cells == [cell for cell in neighborhood if grid.is_cell_empty(cell) and (
+            perception.move_rules is None or perception._reachable(pos, cell))]
+        checked.append(pos)
+        return summary
+    perception.at = checked_at
+    return checked
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"grid": "sparse"},
+    {"movement": "two-phase", "num_passengers": 10},
+    {"road_map": restricted_map(20, 20)},
+], ids=["dense", "sparse", "two-phase", "restricted"])
+def test_summaries_match_the_grid(options):
+    model = IntersectionModel(20, 20, 10, 5, 8, 8, seed=4, **options)
+    checked = check_every_query(model)
+    for _ in range(80):
+        model.step()
+    assert checked
+    assert model.perception.hits > 0
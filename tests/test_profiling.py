@@ -0,0 +1,23 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+
+
+@pytest.mark.parametrize("grid", ["dense", "sparse"])
+def test_moves_are_counted_once(grid):
+    model = IntersectionModel(20, 20, 10, 5, 5, 5, seed=1, grid=grid)
+    moves = []
+    move_agent = model.grid.move_agent
+
+    def recorded(agent, pos):
+        moves.append(agent)
+        return move_agent(agent, pos)
+    model.grid.move_agent = recorded
+    model.profiler.enable()
+    for _ in range(30):
+        model.step()
+    operations = model.profiler.report()["grid_operations"]
+    assert operations["move_agent"] == len(moves)
+    # Solo salen de la cuadrícula los vehículos que llegaron a su salida; nadie entra
+    assert operations["remove_agent"] == model.exited
+    assert "place_agent" not in operations
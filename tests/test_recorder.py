@@ -0,0 +1,42 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Recorder import TrajectoryReader, TrajectoryRecorder
+
+
+def snapshot(model):
+    """Filas que el grabador debería guardar para el paso actual del modelo vivo."""
+    model.sync_agents()
+    return sorted((str(agent.unique_id), type(agent).__name__, *agent.pos, getattr(agent, "state", None),
+                   getattr(agent, "decision", None)) for agent in model.schedule.agents if agent.pos is not None)
+
+
+def decoded(reader, rows):
+    return sorted(zip(reader.decode("agent", rows["agent"]), reader.decode("type", rows["type"]),
+                      rows["x"].tolist(), rows["y"].tolist(),
+                      reader.decode("state", rows["state"]), reader.decode("decision", rows["decision"])))
+
+
+@pytest.mark.parametrize("engine", ["object", "vector"])
+def test_recorded_steps_match_the_live_model(tmp_path, engine):
+    model = IntersectionModel(16, 16, 8, 2, 4, 4, seed=6, engine=engine)
+    recorder = TrajectoryRecorder(model, str(tmp_path / "trayectoria"), chunk_size=50)  # Varios búferes por corrida
+    live = {}
+    for _ in range(30):
+        model.step()
+        recorder.record()
+        live[model.schedule.steps] = snapshot(model)
+    recorder.close()
+
+    reader = TrajectoryReader(str(tmp_path / "trayectoria"), scan_chunk=64)
+    assert reader.rows == sum(len(rows) for rows in live.values())
+    assert (reader.width, reader.height) == (16, 16)
+    sliced = list(reader.iter_ticks(10, 20))
+    assert [tick for tick, _ in sliced] == list(range(10, 20))
+    for tick, rows in sliced:
+        assert decoded(reader, rows) == live[tick]
+    assert decoded(reader, reader.ticks(10, 20)) == sorted(row for tick in range(10, 20) for row in live[tick])
+
+    agent_id = live[15][0][0]
+    rows = reader.agent(agent_id, 10, 20)
+    assert decoded(reader, rows) == sorted(row for tick in range(10, 20) for row in live[tick] if row[0] == agent_id)
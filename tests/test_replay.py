@@ -0,0 +1,44 @@
+import pytest
+
+from Inflow import PoissonInflow
+from Replay import RecordedRun, ReplayLog, replay, state_digest
+from RoadMap import BLOCKED, RoadMap
+
+PARAMS = {"width": 16, "height": 12, "num_vehicles": 6, "num_microbuses": 2, "num_ferraris": 3, "num_speedsters": 3}
+
+
+def test_replay_uses_every_recorded_option(tmp_path):
+    road_map = RoadMap.crossroads(16, 12)
+    road_map.types[2:4, 2:4] = BLOCKED  # Con el mapa por defecto la corrida sería otra
+    road_map.directions[2:4, 2:4] = 0
+    road_map.save(str(tmp_path / "mapa.npy"))
+    options = {"scheduler": "event", "movement": "two-phase", "num_passengers": 8, "grid": "sparse",
+               "torus": False, "id_prefix": "r_", "road_map": str(tmp_path / "mapa.npy")}
+    run = RecordedRun(PARAMS, seed=5, **options)
+    for _ in range(40):
+        run.step()
+    run.save(tmp_path / "corrida.json")
+
+    log = ReplayLog.load(tmp_path / "corrida.json")
+    assert {name: log.options[name] for name in options} == options
+    assert "inflow" in log.options  # También las que quedaron con su valor por defecto
+    assert state_digest(replay(log)) == log.digest
+
+
+def test_options_that_cannot_be_saved_are_rejected():
+    with pytest.raises(ValueError):
+        RecordedRun(PARAMS, seed=0, inflow=PoissonInflow({"north": 0.2}))
+    with pytest.raises(ValueError):
+        ReplayLog(PARAMS, seed=0, options={"speed": 3})
+
+
+def test_saved_inputs_replay(tmp_path):
+    run = RecordedRun(PARAMS, seed=2, num_passengers=4)
+    for step in range(30):
+        if step == 5:
+            run.apply("add_passenger", (3, 4))
+        if step == 12:
+            run.apply("add_vehicle", "extra", "east", pos=(0, 6), state="calmado")
+        run.step()
+    run.save(tmp_path / "corrida.json")
+    assert state_digest(replay(ReplayLog.load(tmp_path / "corrida.json"))) == run.log.digest
@@ -0,0 +1,54 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Movement import occupies
+from RoadMap import BLOCKED, DIRECTION_BITS, RoadMap
+
+
+def restricted_map(width, height):
+    """Cruce con un bloque de celdas bloqueadas y dos calles de un sentido."""
+    road_map = RoadMap.crossroads(width, height)
+    road_map.types[2:6, 2:6] = BLOCKED
+    road_map.directions[2:6, 2:6] = 0
+    road_map.directions[:, height - 3] = DIRECTION_BITS["east"]  # Solo se sale hacia el este
+    road_map.directions[width - 3, :] = DIRECTION_BITS["south"]
+    return road_map
+
+
+def step_direction(delta, size):
+    """Avance en un eje deshaciendo el ajuste del toroide."""
+    if abs(delta) > size // 2:
+        delta -= size if delta > 0 else -size
+    return delta
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"movement": "two-phase", "num_passengers": 10},
+    {"torus": False, "scheduler": "event"},
+], ids=["immediate", "two-phase", "bounded"])
+def test_agents_respect_blocked_cells_and_one_way_streets(options):
+    width = height = 20
+    road_map = restricted_map(width, height)
+    model = IntersectionModel(width, height, 10, 4, 5, 5, seed=1, road_map=road_map, **options)
+    moved = 0
+    for _ in range(60):
+        before = {agent: agent.pos for agent in model.schedule.agents if occupies(agent) and agent.pos is not None}
+        model.step()
+        for agent, origin in before.items():
+            if agent.pos is None or agent.pos == origin:
+                continue
+            moved += 1
+            assert road_map.is_passable(agent.pos)
+            dx = step_direction(agent.pos[0] - origin[0], width)
+            dy = step_direction(agent.pos[1] - origin[1], height)
+            if dx:
+                assert road_map.allows(origin, "east" if dx > 0 else "west")
+            if dy:
+                assert road_map.allows(origin, "south" if dy > 0 else "north")
+    assert moved > 0
+
+
+def test_vector_engine_rejects_restricted_maps():
+    with pytest.raises(ValueError):
+        IntersectionModel(20, 20, 2, 2, 2, 2, engine="vector", road_map=restricted_map(20, 20))
@@ -0,0 +1,28 @@
+import pytest
+
+from Inflow import APPROACHES, PoissonInflow
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+
+def digests(scheduler, config, steps, **options):
+    model = IntersectionModel(*config, seed=5, scheduler=scheduler, **options)
+    result = []
+    for _ in range(steps):
+        model.step()
+        result.append(state_digest(model))
+    return result
+
+
+def trickle():
+    # Cada corrida necesita su propio PoissonInflow: guarda el instante de la próxima llegada
+    return {"inflow": PoissonInflow({approach: 0.2 for approach in APPROACHES})}
+
+
+@pytest.mark.parametrize("config, options", [
+    ((8, 8, 10, 5, 5, 5), dict),
+    ((30, 30, 0, 0, 0, 40), trickle),
+    ((15, 11, 30, 3, 6, 4), lambda: {"movement": "two-phase", "num_passengers": 10}),
+], ids=["mixed", "idle", "two-phase"])
+def test_event_scheduler_matches_simultaneous_activation(config, options):
+    assert digests("event", config, 80, **options()) == digests("simultaneous", config, 80, **options())
@@ -0,0 +1,32 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+
+def digests(grid, config, seed, steps, **options):
+    model = IntersectionModel(*config, grid=grid, seed=seed, **options)
+    result = []
+    for _ in range(steps):
+        model.step()
+        result.append(state_digest(model))
+    return result
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("config, options", [
+    ((8, 8, 10, 5, 5, 5), {}),
+    ((30, 30, 20, 5, 5, 5), {"torus": False}),
+    ((20, 20, 6, 4, 4, 4), {"num_passengers": 20, "scheduler": "event"}),
+    ((15, 11, 30, 3, 6, 4), {"movement": "two-phase", "num_passengers": 10}),
+])
+def test_sparse_grid_matches_dense_grid(config, options, seed):
+    assert digests("sparse", config, seed, 50, **options) == digests("dense", config, seed, 50, **options)
+
+
+def test_sparse_grid_perception_does_not_keep_neighborhoods():
+    model = IntersectionModel(200, 200, 40, 10, 10, 10, grid="sparse", seed=1)
+    for _ in range(50):
+        model.step()
+    # Solo los vecindarios consultados en el último paso, no todos los recorridos
+    assert len(model.perception._neighborhoods) <= 5 * 70
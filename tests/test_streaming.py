@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+from Streaming import SimulationServer, watch
+
+
+def new_model():
+    return IntersectionModel(16, 16, 8, 2, 4, 4, seed=3)
+
+
+def observed(model):
+    """Lo que un cliente debería ver del modelo, en el formato de los cuadros."""
+    model.sync_agents()
+    agents = {str(agent.unique_id): [type(agent).__name__, *agent.pos, getattr(agent, "state", None)]
+              for agent in model.schedule.agents if agent.pos is not None and agent is not model.traffic_light}
+    return {"tick": model.schedule.steps, "agents": agents, "light": model.traffic_light.color}
+
+
+def stream(steps, queue_size, pause=0.0):
+    """
+    Transmite `steps` pasos y compara la vista del cliente, cuadro por cuadro, con un modelo gemelo avanzado
+    hasta el mismo paso. Con `pause`, el cliente bloquea el lazo de eventos después del primer cuadro, así los
+    cuadros publicados se acumulan en su cola como con un cliente lento.
+    """
+    twin = new_model()
+
+    async def run():
+        received = []
+        async with SimulationServer(new_model(), steps=steps, interval=0.005, queue_size=queue_size) as server:
+            async for frame, view in watch(server.host, server.port):
+                if pause and not received:
+                    time.sleep(pause)
+                while twin.schedule.steps < view["tick"]:
+                    twin.step()
+                assert view == observed(twin)
+                received.append(frame["type"])
+            await server.wait()
+            assert state_digest(server.model) == state_digest(twin)
+            return received, server.stats()
+    return asyncio.run(run())
+
+
+def test_client_rebuilds_the_model_from_keyframe_and_deltas():
+    received, stats = stream(40, queue_size=1000)
+    assert received[0] == "key" and "delta" in received
+    assert stats["dropped"] == 0
+
+
+def test_slow_client_resyncs_from_keyframe():
+    received, stats = stream(60, queue_size=4, pause=0.2)
+    assert stats["dropped"] > 0
+    assert received.count("key") > 1  # Después de descartar, la vista se rehízo con un cuadro completo
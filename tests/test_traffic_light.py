@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from mesa import Model
+
+from TrafficLight import TrafficLight
+
+
+class Junction(Model):
+    """Modelo mínimo: el semáforo solo usa el paso actual y wake."""
+    def __init__(self):
+        super().__init__()
+        self.schedule = SimpleNamespace(steps=0)
+
+    def wake(self, agent):
+        pass
+
+
+class Car:
+    def __init__(self, name, destination, arrival_time):
+        self.name = name
+        self.destination = destination
+        self.arrival_time = arrival_time
+
+
+def new_light(**options):
+    return TrafficLight("light", Junction(), **options)
+
+
+def served_in_order(light, steps):
+    """Avanza el semáforo y devuelve los vehículos atendidos, en orden."""
+    served = []
+    for _ in range(steps):
+        light.model.schedule.steps += 1
+        before = light.served
+        queued = set(light.queued)
+        light.step()
+        served.extend(car.name for car in queued - set(light.queued))
+        assert light.served - before == len(queued - set(light.queued))
+    return served
+
+
+def test_each_direction_is_served_by_arrival_order():
+    light = new_light(saturation_threshold=100)
+    for name, destination, arrival_time in [("n3", "north", 3), ("e2", "east", 2), ("n1", "north", 1),
+                                            ("e5", "east", 5), ("n1b", "north", 1)]:
+        light.recibir_mensaje(Car(name, destination, arrival_time))
+    served = served_in_order(light, 5)
+    # Con el mismo tiempo de arribo gana el que avisó primero
+    assert [name for name in served if name.startswith("n")] == ["n1", "n1b", "n3"]
+    assert [name for name in served if name.startswith("e")] == ["e2", "e5"]
+    assert light.queue_length == 0
+
+
+def test_stale_entries_are_discarded():
+    light = new_light(saturation_threshold=100)
+    gone, waiting = Car("gone", "south", 1), Car("waiting", "south", 4)
+    light.recibir_mensaje(gone)
+    light.recibir_mensaje(waiting)
+    light.notificar_salida(gone)
+    assert light.queue_length == 1
+    assert light.wait_stats()["queue_by_direction"]["south"] == 1
+    assert served_in_order(light, 1) == ["waiting"]
+    assert light.served == 1
+    assert light.queues["south"] == []  # La entrada vieja salió del heap al llegar al frente
+    # Un vehículo que vuelve a avisar deja vigente solo su última entrada
+    again = Car("again", "west", 7)
+    light.recibir_mensaje(again)
+    again.arrival_time = 2
+    light.recibir_mensaje(again)
+    assert served_in_order(light, 2) == ["again"]
+    assert light.served == 2 and light.queues["west"] == []
+
+
+def test_saturated_light_drains():
+    light = new_light(saturation_threshold=3, saturation_discharge=2)
+    for index in range(8):
+        light.recibir_mensaje(Car(f"c{index}", light.light_cycle[index % 4], index))
+    assert light.saturated
+    served = []
+    for _ in range(10):
+        served += served_in_order(light, 1)
+        if not light.saturated:
+            break
+    assert not light.saturated
+    assert light.queue_length <= light.saturation_threshold
+    served += served_in_order(light, light.queue_length + 1)
+    assert sorted(served) == sorted(f"c{index}" for index in range(8))
+    assert light.state == "yellow" and light.queue_length == 0
@@ -0,0 +1,30 @@
+import pytest
+
+from interaccion_agentes import IntersectionModel
+from Replay import state_digest
+
+
+def digests(engine, config, seed, steps, **options):
+    model = IntersectionModel(*config, engine=engine, seed=seed, **options)
+    result = []
+    for _ in range(steps):
+        model.step()
+        result.append(state_digest(model))
+    return result
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("config", [
+    (20, 20, 2, 2, 2, 2),
+    (8, 8, 10, 5, 5, 5),
+    (15, 11, 30, 3, 6, 4),
+    (30, 30, 50, 10, 10, 10),
+])
+def test_vector_engine_matches_object_engine(config, seed):
+    assert digests("vector", config, seed, 60) == digests("object", config, seed, 60)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_vector_engine_matches_object_engine_on_sparse_grid(seed):
+    config = (40, 40, 12, 4, 6, 6)
+    assert digests("vector", config, seed, 60, grid="sparse") == digests("object", config, seed, 60, grid="sparse")